@@ -31,3 +31,13 @@ api_router.include_router(
     prefix="/sync",
     tags=["Synchronization"]
 )
+
+# Import des endpoints Metrics
+from app.api.v1.endpoints import metrics
+
+# Inclusion du router Metrics
+api_router.include_router(
+    metrics.router,
+    prefix="/metrics",
+    tags=["Metrics"]
+)
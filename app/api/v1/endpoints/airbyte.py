@@ -9,6 +9,7 @@ from app.models.user import User
 from app.services.airbyte_service import AirbyteService
 from app.crud import airbyte as crud_airbyte
 from app.crud import hubspot as crud_hubspot
+from app.crud import sync_job as crud_sync_job
 from app.schemas.airbyte import (
     AirbyteConnectionResponse,
     SyncTriggerResponse,
@@ -98,28 +99,20 @@ async def trigger_sync(
     try:
         logger.info(f"Triggering sync for user {current_user.id}...")
         airbyte_service = AirbyteService(db, current_user.id)
-        job = await airbyte_service.trigger_sync(connection.connection_id)
+        job_id = await airbyte_service.trigger_sync(connection.connection_id)
         
-        if not job:
+        if not job_id:
             raise HTTPException(
                 status_code=500,
                 detail="Failed to trigger sync. Check API logs for details."
             )
         
-        # Mettre à jour le statut dans la DB
-        crud_airbyte.update_sync_status(
-            db,
-            current_user.id,
-            status="running",
-            job_id=job.get("jobId")
-        )
-        
-        logger.info(f"✅ Sync triggered for user {current_user.id}, job_id: {job.get('jobId')}")
+        logger.info(f"✅ Sync triggered for user {current_user.id}, job_id: {job_id}")
         
         return {
             "message": "Sync triggered successfully",
-            "job_id": job.get("jobId"),
-            "status": job.get("status", "running"),
+            "job_id": job_id,
+            "status": "running",
             "connection_id": connection.connection_id
         }
     
@@ -132,7 +125,7 @@ async def trigger_sync(
 
 
 @router.get("/status", response_model=SyncStatusResponse)
-async def get_sync_status(
+def get_sync_status(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ) -> Any:
@@ -152,44 +145,25 @@ async def get_sync_status(
             detail="No Airbyte connection found. Please setup Airbyte first using /setup."
         )
     
-    try:
-        logger.info(f"Fetching sync status for user {current_user.id}...")
-        airbyte_service = AirbyteService(db, current_user.id)
-        status = await airbyte_service.get_sync_status(connection.connection_id)
-        
-        if not status:
-            # Retourner les infos de la DB si l'API Airbyte ne répond pas
-            return {
-                "connection_id": connection.connection_id,
-                "status": connection.last_sync_status or "unknown",
-                "last_sync_at": connection.last_sync_at,
-                "message": "Status retrieved from database (Airbyte API unavailable)"
-            }
-        
-        # Mettre à jour le statut dans la DB
-        if status.get("status"):
-            crud_airbyte.update_sync_status(
-                db,
-                current_user.id,
-                status=status.get("status")
-            )
-        
+    # Dernier job suivi par le tracker (table sync_jobs) : aucun appel à Airbyte
+    job = crud_sync_job.get_latest_job(db, current_user.id)
+    if not job:
+        # Aucun job suivi (syncs antérieures au tracker) : état de la connexion
         return {
-            "connection_id": connection.connection_id,
-            "status": status.get("status", "unknown"),
-            "last_sync_at": connection.last_sync_at,
-            "job_id": status.get("jobId"),
-            "records_synced": status.get("recordsSynced"),
-            "bytes_synced": status.get("bytesSynced"),
-            "message": status.get("message", "Sync status retrieved successfully")
+            "status": connection.last_sync_status or "unknown",
+            "last_sync_at": connection.last_sync_at
         }
     
-    except Exception as e:
-        logger.error(f"❌ Error fetching sync status for user {current_user.id}: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to fetch sync status: {str(e)}"
-        )
+    return {
+        "job_id": job.job_id,
+        "status": job.status,
+        "last_sync_at": connection.last_sync_at,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "completed_at": job.completed_at,
+        "records_synced": job.rows_synced,
+        "bytes_synced": job.bytes_synced
+    }
 
 
 @router.get("/connection", response_model=AirbyteConnectionResponse)
@@ -1,9 +1,9 @@
 from typing import Any
-import requests
 import logging
 from fastapi.responses import RedirectResponse, HTMLResponse
 from datetime import datetime, timedelta, timezone
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
 
 from sqlalchemy.orm import Session
 from app.api.deps import get_db, get_current_active_user
@@ -12,6 +12,8 @@ from app.models.user import User
 from app.core.config import settings
 from app.schemas.hubspot import HubspotTokenCreate, HubspotToken, HubspotAuthResponse
 from app.services.airbyte_service import AirbyteService  # ✅ AJOUT
+from app.services.hubspot_oauth import HubspotOAuthError, hubspot_oauth_client
+from app.services.hubspot_token_service import refresh_user_token
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -74,8 +76,9 @@ async def hubspot_callback(
         )
 
     # Vérifier que l'utilisateur existe
+    # (endpoint async : les accès psycopg2 passent par le threadpool)
     from app import crud
-    user = crud.user.get(db, user_id)
+    user = await run_in_threadpool(crud.user.get, db, user_id)
     if not user:
         raise HTTPException(
             status_code=404,
@@ -88,24 +91,15 @@ async def hubspot_callback(
             detail="HubSpot integration not configured"
         )
 
-    # Exchange code for token
-    token_url = "https://api.hubapi.com/oauth/v1/token"
-    data = {
-        "grant_type": "authorization_code",
-        "client_id": settings.HUBSPOT_CLIENT_ID,
-        "client_secret": settings.HUBSPOT_CLIENT_SECRET,
-        "redirect_uri": settings.HUBSPOT_REDIRECT_URI,
-        "code": code
-    }
-
-    response = requests.post(token_url, data=data)
-    if response.status_code != 200:
+    # Exchange code for token (async, avec retries)
+    try:
+        token_data = await hubspot_oauth_client.exchange_code(code)
+    except HubspotOAuthError as e:
         raise HTTPException(
-            status_code=400,
-            detail=f"Failed to get token: {response.text}"
+            status_code=503 if e.retryable else 400,
+            detail=f"Failed to get token: {e}"
         )
 
-    token_data = response.json()
     expires_in = token_data.get("expires_in", 21600)  # Default 6 hours
     expires_at = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
 
@@ -116,7 +110,7 @@ async def hubspot_callback(
         is_active=True
     )
 
-    crud_hubspot.create_token(db, token_obj, user_id)
+    await run_in_threadpool(crud_hubspot.create_token, db, token_obj, user_id)
 
     # ✅ AJOUT : Configurer Airbyte en arrière-plan
     background_tasks.add_task(
@@ -151,14 +145,16 @@ async def hubspot_callback(
 """)
 
 @router.get("/token", response_model=HubspotToken)
-def get_hubspot_token(
+async def get_hubspot_token(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ) -> Any:
     """
     Get current HubSpot token
     """
-    token = crud_hubspot.get_active_token(db, current_user.id)
+    # Endpoint async (refresh HubSpot non bloquant) : les accès psycopg2
+    # passent par le threadpool
+    token = await run_in_threadpool(crud_hubspot.get_active_token, db, current_user.id)
     if not token:
         raise HTTPException(
             status_code=404,
@@ -174,35 +170,27 @@ def get_hubspot_token(
                 detail="HubSpot integration not configured"
             )
 
-        refresh_url = "https://api.hubapi.com/oauth/v1/token"
-        data = {
-            "grant_type": "refresh_token",
-            "client_id": settings.HUBSPOT_CLIENT_ID,
-            "client_secret": settings.HUBSPOT_CLIENT_SECRET,
-            "refresh_token": token.refresh_token
-        }
-
-        response = requests.post(refresh_url, data=data)
-        if response.status_code != 200:
-            # Deactivate token as it can't be refreshed
-            crud_hubspot.deactivate_token(db, current_user.id)
+        # Un seul appel à HubSpot par utilisateur, même si plusieurs
+        # requêtes constatent l'expiration en même temps
+        try:
+            token = await refresh_user_token(db, current_user.id)
+        except HubspotOAuthError as e:
+            if e.retryable:
+                # HubSpot indisponible : le token reste actif pour un prochain essai
+                raise HTTPException(
+                    status_code=503,
+                    detail="HubSpot is temporarily unavailable, please retry"
+                )
             raise HTTPException(
                 status_code=401,
                 detail="HubSpot token expired and could not be refreshed"
             )
 
-        token_data = response.json()
-        expires_in = token_data.get("expires_in", 21600)  # Default 6 hours
-        expires_at = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
-
-        token_update = HubspotTokenCreate(
-            access_token=token_data["refresh_token"],
-            refresh_token=token_data["refresh_token"],
-            expires_at=expires_at,
-            is_active=True
-        )
-
-        token = crud_hubspot.create_token(db, token_update, current_user.id)
+        if not token:
+            raise HTTPException(
+                status_code=404,
+                detail="No active HubSpot integration found"
+            )
 
     return token
 
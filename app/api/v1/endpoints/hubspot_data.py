@@ -1,13 +1,28 @@
 """
 Endpoints API pour accéder aux données HubSpot synchronisées via Airbyte
 """
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, Path
+from datetime import datetime
+from typing import Dict, List, Optional, Type
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_async_db, get_current_user, get_current_user_async, get_db
+from app.core.etag import etag_matches, make_etag
 from app.models.user import User
 from app.services.hubspot_data_service import HubspotDataService
+from app.services.hubspot_data_service_async import AsyncHubspotDataService
+from app.services.hubspot_index_service import HubspotIndexService
+from app.services.hubspot_export_service import (
+    ExportEngine,
+    ExportFormat,
+    EXPORT_MEDIA_TYPES,
+    iter_csv,
+    iter_gzip,
+    iter_ndjson,
+)
 from app.schemas.hubspot_data import (
     HubspotContactBase,
     HubspotContactDetail,
@@ -19,28 +34,242 @@ from app.schemas.hubspot_data import (
     ContactFilters,
     CompanyFilters,
     DealFilters,
+    HubspotStatsResponse,
     PaginatedResponse,
+    SearchMode,
+    TenantIndexesResponse,
+    build_projection_model,
 )
 
 router = APIRouter()
 
+# Modèle de filtres par type d'objet
+FILTER_MODELS = {
+    "contacts": ContactFilters,
+    "companies": CompanyFilters,
+    "deals": DealFilters,
+}
+
+
+def parse_fields(
+    table_columns: List[str],
+    object_type: str,
+    fields: Optional[str]
+) -> Optional[List[str]]:
+    """
+    Valide une liste de colonnes `a,b,c` contre les colonnes de la table
+    
+    Raises:
+        HTTPException 400 si une colonne n'existe pas
+    """
+    if not fields:
+        return None
+    
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in table_columns]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields for {object_type}: {', '.join(unknown)}"
+        )
+    # Dédoublonne en conservant l'ordre demandé
+    return list(dict.fromkeys(requested))
+
+
+def projection_model(
+    column_types: Dict[str, str],
+    object_type: str,
+    columns: List[str]
+) -> Type[BaseModel]:
+    """Modèle des items limité aux colonnes demandées via `fields=`"""
+    return build_projection_model(
+        object_type,
+        tuple((column, column_types.get(column, "text")) for column in columns)
+    )
+
+
+def page_response(
+    item_model: Type[BaseModel],
+    page: PaginatedResponse,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    Sérialise une page directement en JSON via pydantic-core
+    
+    Les items sont validés par `item_model` (modèle de l'objet ou modèle
+    de projection) puis la page est encodée en une passe, sans la
+    re-validation par response_model ni le dict intermédiaire de FastAPI.
+    """
+    typed_page = PaginatedResponse[item_model](
+        **page.model_dump(exclude={"items"}),
+        items=page.items
+    )
+    return Response(
+        content=typed_page.model_dump_json(by_alias=True),
+        media_type="application/json",
+        headers=headers
+    )
+
+
+def etag_headers(etag: str) -> Dict[str, str]:
+    """En-têtes de cache d'une lecture : toujours revalider via l'ETag"""
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def conditional_read(include_stats_snapshot: bool = False):
+    """
+    Dépendance de requête conditionnelle (ETag / If-None-Match)
+    
+    L'ETag combine l'utilisateur, le chemin, les paramètres de requête
+    triés et le marqueur de fraîcheur des données (dernière sync). Si le
+    client possède déjà cette version, un 304 est renvoyé avant toute
+    lecture des tables HubSpot.
+    """
+    async def check_etag(
+        request: Request,
+        response: Response,
+        db: AsyncSession = Depends(get_async_db),
+        current_user: User = Depends(get_current_user_async),
+    ) -> str:
+        service = AsyncHubspotDataService(db, user_id=current_user.id)
+        marker = await service.get_data_marker(include_stats_snapshot)
+        etag = make_etag(
+            current_user.id,
+            request.url.path,
+            sorted(request.query_params.multi_items()),
+            marker
+        )
+        
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=304, headers=etag_headers(etag))
+        
+        response.headers.update(etag_headers(etag))
+        return etag
+    
+    return check_etag
+
+
+check_etag = conditional_read()
+check_stats_etag = conditional_read(include_stats_snapshot=True)
+
+
+# ═══════════════════════════════════════════════════════════════
+# ENDPOINT EXPORT
+# ═══════════════════════════════════════════════════════════════
+
+@router.get("/{object_type}/export")
+def export_objects(
+    object_type: str = Path(..., regex="^(contacts|companies|deals)$", description="Type d'objet HubSpot"),
+    format: ExportFormat = Query(ExportFormat.CSV, description="Export format: csv or ndjson"),
+    engine: ExportEngine = Query(ExportEngine.COPY, description="CSV engine: copy (Postgres COPY) or cursor"),
+    compress: bool = Query(False, description="Gzip-compress the export stream"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to export (default columns if omitted)"),
+    search: Optional[str] = Query(None, description="Full-text search"),
+    search_mode: SearchMode = Query(SearchMode.ILIKE),
+    lifecyclestage: Optional[str] = Query(None, description="Contacts only"),
+    industry: Optional[str] = Query(None, description="Companies only"),
+    dealstage: Optional[str] = Query(None, description="Deals only"),
+    pipeline: Optional[str] = Query(None, description="Deals only"),
+    country: Optional[str] = Query(None),
+    city: Optional[str] = Query(None),
+    hubspot_owner_id: Optional[str] = Query(None),
+    min_amount: Optional[float] = Query(None, description="Deals only"),
+    max_amount: Optional[float] = Query(None, description="Deals only"),
+    created_after: Optional[datetime] = Query(None),
+    created_before: Optional[datetime] = Query(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Exporter tous les contacts, companies ou deals en flux (CSV ou NDJSON).
+    
+    Les lignes sont lues via un curseur serveur et envoyées au fur et à
+    mesure : la mémoire reste constante, même pour des centaines de
+    milliers de lignes.
+    
+    **CSV:** produit par défaut par Postgres (`COPY ... TO STDOUT`), sans
+    sérialisation ligne à ligne en Python (`engine=cursor` pour l'ancien moteur).
+    
+    **Compression:** le flux est compressé automatiquement (brotli ou gzip)
+    selon `Accept-Encoding` ; `compress=true` force gzip pour les clients
+    qui n'envoient pas cet en-tête.
+    
+    **Filtres et colonnes:** identiques aux endpoints de liste
+    (les filtres non applicables au type d'objet sont ignorés).
+    """
+    service = HubspotDataService(db, user_id=current_user.id)
+    
+    if not service.schema_exists():
+        raise HTTPException(
+            status_code=404,
+            detail=f"No HubSpot data found for user {current_user.id}."
+        )
+    
+    filter_model = FILTER_MODELS[object_type]
+    filter_values = {
+        "search": search,
+        "search_mode": search_mode,
+        "lifecyclestage": lifecyclestage,
+        "industry": industry,
+        "dealstage": dealstage,
+        "pipeline": pipeline,
+        "country": country,
+        "city": city,
+        "hubspot_owner_id": hubspot_owner_id,
+        "min_amount": min_amount,
+        "max_amount": max_amount,
+        "created_after": created_after,
+        "created_before": created_before,
+    }
+    filters = filter_model(**{
+        key: value for key, value in filter_values.items()
+        if key in filter_model.model_fields
+    })
+    
+    columns = parse_fields(service.get_table_columns(object_type), object_type, fields)
+    
+    if format == ExportFormat.CSV and engine == ExportEngine.COPY:
+        content = service.stream_copy_csv(object_type, filters=filters, columns=columns)
+    else:
+        export_columns, rows = service.stream_rows(object_type, filters=filters, columns=columns)
+        if format == ExportFormat.CSV:
+            content = iter_csv(rows, export_columns)
+        else:
+            content = iter_ndjson(rows)
+    
+    headers = {"Content-Disposition": f'attachment; filename="{object_type}.{format.value}"'}
+    if compress:
+        content = iter_gzip(content)
+        headers["Content-Encoding"] = "gzip"
+    
+    return StreamingResponse(
+        content,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers=headers
+    )
+
 
 # ═══════════════════════════════════════════════════════════════
 # ENDPOINTS CONTACTS
 # ═══════════════════════════════════════════════════════════════
 
 @router.get("/contacts", response_model=PaginatedResponse[HubspotContactBase])
-def get_contacts(
+async def get_contacts(
     page: int = Query(1, ge=1, description="Page number (starting from 1)"),
     limit: int = Query(50, ge=1, le=500, description="Items per page (max 500)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page (next_cursor), valid with the same filters and search. Overrides page."),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return (see /available-columns). Defaults to the essential columns."),
+    search: Optional[str] = Query(None, description="Full-text search (email, first name, last name)"),
+    search_mode: SearchMode = Query(SearchMode.ILIKE, description="ilike: plain substring match (default), trigram: ranked fuzzy search"),
     email: Optional[str] = Query(None, description="Filter by email (exact match)"),
     firstname: Optional[str] = Query(None, description="Filter by first name (partial match)"),
     lastname: Optional[str] = Query(None, description="Filter by last name (partial match)"),
     company: Optional[str] = Query(None, description="Filter by company name (partial match)"),
     country: Optional[str] = Query(None, description="Filter by country"),
     lifecyclestage: Optional[str] = Query(None, description="Filter by lifecycle stage"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+    etag: str = Depends(check_etag),
 ):
     """
     Récupérer la liste des contacts HubSpot synchronisés pour l'utilisateur connecté.
@@ -50,18 +279,29 @@ def get_contacts(
     - jobtitle, hs_linkedin_url, lifecyclestage, country, createdate
     
     **Filtres disponibles:**
+    - `search` : recherche dans email, prénom, nom. Par défaut (`ilike`),
+      sous-chaîne triée par date ; `search_mode=trigram` pour des résultats
+      classés par similarité
     - Par email (exact)
     - Par nom/prénom (partiel)
     - Par entreprise, pays, lifecycle stage
     
+    **Colonnes:**
+    - `fields=a,b,c` : ne retourner que ces colonnes (validées contre
+      `/available-columns/contacts`), pour alléger les tableaux étroits
+    
     **Pagination:**
     - Page 1 = premiers résultats
     - Limite par défaut : 50 contacts/page (max 500)
+    - `cursor` : passer le `next_cursor` de la page précédente pour un
+      défilement profond sans OFFSET (aussi rapide que la première page),
+      y compris pour une recherche classée par pertinence (le curseur
+      n'est valable qu'avec les mêmes filtres et la même recherche)
     """
-    service = HubspotDataService(db, user_id=current_user.id)
+    service = AsyncHubspotDataService(db, user_id=current_user.id)
     
     # Vérifier que le schéma existe
-    if not service.schema_exists():
+    if not await service.schema_exists():
         raise HTTPException(
             status_code=404,
             detail=f"No HubSpot data found for user {current_user.id}. Please connect your HubSpot account first."
@@ -69,6 +309,8 @@ def get_contacts(
     
     # Construire les filtres
     filters = ContactFilters(
+        search=search,
+        search_mode=search_mode,
         email=email,
         firstname=firstname,
         lastname=lastname,
@@ -78,26 +320,43 @@ def get_contacts(
     )
     
     # Récupérer les contacts
-    contacts, total = service.get_contacts(
-        page=page,
-        limit=limit,
-        filters=filters
-    )
+    columns = parse_fields(await service.get_table_columns("contacts"), "contacts", fields)
+    
+    try:
+        contacts, total, total_is_exact, next_cursor = await service.get_contacts(
+            page=page,
+            limit=limit,
+            filters=filters,
+            columns=columns,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    return PaginatedResponse(
+    response = PaginatedResponse(
         items=contacts,
         total=total,
         page=page,
         limit=limit,
-        pages=(total + limit - 1) // limit  # Arrondi supérieur
+        pages=(total + limit - 1) // limit,  # Arrondi supérieur
+        total_is_exact=total_is_exact,
+        next_cursor=next_cursor
     )
+    
+    item_model = HubspotContactBase
+    if columns:
+        column_types = dict(await service.get_table_column_types("contacts"))
+        item_model = projection_model(column_types, "contacts", columns)
+    
+    return page_response(item_model, response, headers=etag_headers(etag))
 
 
 @router.get("/contacts/{contact_id}", response_model=HubspotContactDetail)
-def get_contact_by_id(
+async def get_contact_by_id(
     contact_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+    etag: str = Depends(check_etag),
 ):
     """
     Récupérer les détails complets d'un contact spécifique par son HubSpot ID.
@@ -107,15 +366,15 @@ def get_contact_by_id(
     - Le JSON `properties` complet avec TOUTES les données HubSpot
     - Les métadonnées Airbyte (_airbyte_extracted_at, etc.)
     """
-    service = HubspotDataService(db, user_id=current_user.id)
+    service = AsyncHubspotDataService(db, user_id=current_user.id)
     
-    if not service.schema_exists():
+    if not await service.schema_exists():
         raise HTTPException(
             status_code=404,
             detail=f"No HubSpot data found for user {current_user.id}."
         )
     
-    contact = service.get_contact_by_id(contact_id)
+    contact = await service.get_contact_by_id(contact_id)
     
     if not contact:
         raise HTTPException(
@@ -131,15 +390,20 @@ def get_contact_by_id(
 # ═══════════════════════════════════════════════════════════════
 
 @router.get("/companies", response_model=PaginatedResponse[HubspotCompanyBase])
-def get_companies(
+async def get_companies(
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page (next_cursor), valid with the same filters and search. Overrides page."),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return (see /available-columns). Defaults to the essential columns."),
+    search: Optional[str] = Query(None, description="Full-text search (name, domain)"),
+    search_mode: SearchMode = Query(SearchMode.ILIKE, description="ilike: plain substring match (default), trigram: ranked fuzzy search"),
     name: Optional[str] = Query(None, description="Filter by company name (partial match)"),
     domain: Optional[str] = Query(None, description="Filter by domain (partial match)"),
     industry: Optional[str] = Query(None, description="Filter by industry"),
     country: Optional[str] = Query(None, description="Filter by country"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+    etag: str = Depends(check_etag),
 ):
     """
     Récupérer la liste des entreprises HubSpot synchronisées.
@@ -148,54 +412,73 @@ def get_companies(
     - name, domain, industry, numberofemployees
     - annualrevenue, country, website, createdate
     """
-    service = HubspotDataService(db, user_id=current_user.id)
+    service = AsyncHubspotDataService(db, user_id=current_user.id)
     
-    if not service.schema_exists():
+    if not await service.schema_exists():
         raise HTTPException(
             status_code=404,
             detail=f"No HubSpot data found for user {current_user.id}."
         )
     
     filters = CompanyFilters(
+        search=search,
+        search_mode=search_mode,
         name=name,
         domain=domain,
         industry=industry,
         country=country,
     )
     
-    companies, total = service.get_companies(
-        page=page,
-        limit=limit,
-        filters=filters
-    )
+    columns = parse_fields(await service.get_table_columns("companies"), "companies", fields)
+    
+    try:
+        companies, total, total_is_exact, next_cursor = await service.get_companies(
+            page=page,
+            limit=limit,
+            filters=filters,
+            columns=columns,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    return PaginatedResponse(
+    response = PaginatedResponse(
         items=companies,
         total=total,
         page=page,
         limit=limit,
-        pages=(total + limit - 1) // limit
+        pages=(total + limit - 1) // limit,
+        total_is_exact=total_is_exact,
+        next_cursor=next_cursor
     )
+    
+    item_model = HubspotCompanyBase
+    if columns:
+        column_types = dict(await service.get_table_column_types("companies"))
+        item_model = projection_model(column_types, "companies", columns)
+    
+    return page_response(item_model, response, headers=etag_headers(etag))
 
 
 @router.get("/companies/{company_id}", response_model=HubspotCompanyDetail)
-def get_company_by_id(
+async def get_company_by_id(
     company_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+    etag: str = Depends(check_etag),
 ):
     """
     Récupérer les détails complets d'une entreprise spécifique.
     """
-    service = HubspotDataService(db, user_id=current_user.id)
+    service = AsyncHubspotDataService(db, user_id=current_user.id)
     
-    if not service.schema_exists():
+    if not await service.schema_exists():
         raise HTTPException(
             status_code=404,
             detail=f"No HubSpot data found for user {current_user.id}."
         )
     
-    company = service.get_company_by_id(company_id)
+    company = await service.get_company_by_id(company_id)
     
     if not company:
         raise HTTPException(
@@ -211,16 +494,21 @@ def get_company_by_id(
 # ═══════════════════════════════════════════════════════════════
 
 @router.get("/deals", response_model=PaginatedResponse[HubspotDealBase])
-def get_deals(
+async def get_deals(
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page (next_cursor), valid with the same filters and search. Overrides page."),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return (see /available-columns). Defaults to the essential columns."),
+    search: Optional[str] = Query(None, description="Full-text search (deal name)"),
+    search_mode: SearchMode = Query(SearchMode.ILIKE, description="ilike: plain substring match (default), trigram: ranked fuzzy search"),
     dealname: Optional[str] = Query(None, description="Filter by deal name (partial match)"),
     dealstage: Optional[str] = Query(None, description="Filter by deal stage"),
     pipeline: Optional[str] = Query(None, description="Filter by pipeline"),
     min_amount: Optional[float] = Query(None, description="Minimum deal amount"),
     max_amount: Optional[float] = Query(None, description="Maximum deal amount"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+    etag: str = Depends(check_etag),
 ):
     """
     Récupérer la liste des deals HubSpot synchronisés.
@@ -229,15 +517,17 @@ def get_deals(
     - dealname, amount, dealstage, pipeline
     - closedate, createdate
     """
-    service = HubspotDataService(db, user_id=current_user.id)
+    service = AsyncHubspotDataService(db, user_id=current_user.id)
     
-    if not service.schema_exists():
+    if not await service.schema_exists():
         raise HTTPException(
             status_code=404,
             detail=f"No HubSpot data found for user {current_user.id}."
         )
     
     filters = DealFilters(
+        search=search,
+        search_mode=search_mode,
         dealname=dealname,
         dealstage=dealstage,
         pipeline=pipeline,
@@ -245,39 +535,56 @@ def get_deals(
         max_amount=max_amount,
     )
     
-    deals, total = service.get_deals(
-        page=page,
-        limit=limit,
-        filters=filters
-    )
+    columns = parse_fields(await service.get_table_columns("deals"), "deals", fields)
     
-    return PaginatedResponse(
+    try:
+        deals, total, total_is_exact, next_cursor = await service.get_deals(
+            page=page,
+            limit=limit,
+            filters=filters,
+            columns=columns,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    response = PaginatedResponse(
         items=deals,
         total=total,
         page=page,
         limit=limit,
-        pages=(total + limit - 1) // limit
+        pages=(total + limit - 1) // limit,
+        total_is_exact=total_is_exact,
+        next_cursor=next_cursor
     )
+    
+    item_model = HubspotDealBase
+    if columns:
+        column_types = dict(await service.get_table_column_types("deals"))
+        item_model = projection_model(column_types, "deals", columns)
+    
+    return page_response(item_model, response, headers=etag_headers(etag))
 
 
 @router.get("/deals/{deal_id}", response_model=HubspotDealDetail)
-def get_deal_by_id(
+async def get_deal_by_id(
     deal_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+    etag: str = Depends(check_etag),
 ):
     """
     Récupérer les détails complets d'un deal spécifique.
     """
-    service = HubspotDataService(db, user_id=current_user.id)
+    service = AsyncHubspotDataService(db, user_id=current_user.id)
     
-    if not service.schema_exists():
+    if not await service.schema_exists():
         raise HTTPException(
             status_code=404,
             detail=f"No HubSpot data found for user {current_user.id}."
         )
     
-    deal = service.get_deal_by_id(deal_id)
+    deal = await service.get_deal_by_id(deal_id)
     
     if not deal:
         raise HTTPException(
@@ -293,10 +600,11 @@ def get_deal_by_id(
 # ═══════════════════════════════════════════════════════════════
 
 @router.get("/available-columns/{object_type}", response_model=AvailableColumns)
-def get_available_columns(
+async def get_available_columns(
     object_type: str = Path(..., regex="^(contacts|companies|deals)$", description="Type d'objet HubSpot"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+    etag: str = Depends(check_etag),
 ):
     """
     Récupérer la liste de TOUTES les colonnes disponibles pour un type d'objet.
@@ -314,6 +622,68 @@ def get_available_columns(
     - `companies`
     - `deals`
     """
+    service = AsyncHubspotDataService(db, user_id=current_user.id)
+    
+    if not await service.schema_exists():
+        raise HTTPException(
+            status_code=404,
+            detail=f"No HubSpot data found for user {current_user.id}."
+        )
+    
+    return await service.get_available_columns(object_type)
+
+
+# ═══════════════════════════════════════════════════════════════
+# ENDPOINT STATISTIQUES
+# ═══════════════════════════════════════════════════════════════
+
+@router.get("/stats", response_model=HubspotStatsResponse)
+async def get_stats(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+    etag: str = Depends(check_stats_etag),
+):
+    """
+    Récupérer les statistiques globales des données HubSpot.
+    
+    Les statistiques sont pré-calculées à la fin de chaque synchronisation
+    et servies en une seule lecture. `snapshot_at` indique la date du calcul.
+    
+    **Retourne:**
+    - Totaux contacts / companies / deals
+    - Répartition par lifecycle stage, industrie et étape de deal
+    - Montants des deals (total, gagnés, pipeline)
+    """
+    service = AsyncHubspotDataService(db, user_id=current_user.id)
+    
+    if not await service.schema_exists():
+        raise HTTPException(
+            status_code=404,
+            detail=f"No HubSpot data found for user {current_user.id}."
+        )
+    
+    return await service.get_stats_snapshot()
+
+
+# ═══════════════════════════════════════════════════════════════
+# ENDPOINT INDEX DES TABLES
+# ═══════════════════════════════════════════════════════════════
+
+@router.get("/indexes", response_model=TenantIndexesResponse)
+def get_indexes(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Récupérer les index des tables HubSpot de l'utilisateur.
+    
+    Les index déclarés sont créés automatiquement après chaque
+    synchronisation Airbyte réussie.
+    
+    **Retourne:**
+    - Les index existants (avec leur définition et validité)
+    - Les index déclarés pas encore créés
+    """
     service = HubspotDataService(db, user_id=current_user.id)
     
     if not service.schema_exists():
@@ -322,4 +692,15 @@ def get_available_columns(
             detail=f"No HubSpot data found for user {current_user.id}."
         )
     
-    return service.get_available_columns(object_type)
+    index_service = HubspotIndexService(db, user_id=current_user.id)
+    indexes = index_service.list_indexes()
+    existing_names = {index["index_name"] for index in indexes if index["is_valid"]}
+    
+    return TenantIndexesResponse(
+        schema_name=index_service.schema_name,
+        indexes=indexes,
+        missing_indexes=[
+            index.name for index in index_service.get_declared_indexes()
+            if index.name not in existing_names
+        ]
+    )
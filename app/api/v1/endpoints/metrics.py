@@ -0,0 +1,40 @@
+"""
+Endpoints de métriques d'exploitation (administrateurs)
+"""
+from fastapi import APIRouter, Depends
+
+from app.api.deps import get_current_active_admin
+from app.core import metrics
+from app.core.db_pool import pool_status
+from app.core.http_clients import http_clients
+from app.db_init import async_engine, engine
+from app.models.user import User
+from app.schemas.metrics import MetricsResponse
+
+router = APIRouter()
+
+
+@router.get("", response_model=MetricsResponse)
+def get_metrics(
+    current_user: User = Depends(get_current_active_admin),
+):
+    """
+    Métriques du worker courant.
+    
+    **Retourne:**
+    - `pools` : occupation des pools de connexions (sync psycopg2 et async asyncpg)
+    - `http_clients` : pools keep-alive des clients HTTP sortants (Airbyte, Google, HubSpot)
+    - `timings` : durées récentes (dont l'attente de checkout des pools,
+      `db.*.pool_checkout_wait`)
+    
+    Les valeurs sont propres au processus : avec plusieurs workers,
+    chaque appel reflète le worker qui a répondu.
+    """
+    return MetricsResponse(
+        pools={
+            "sync": pool_status(engine),
+            "async": pool_status(async_engine.sync_engine),
+        },
+        http_clients=http_clients.stats(),
+        timings=metrics.snapshot(),
+    )
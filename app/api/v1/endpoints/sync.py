@@ -1,13 +1,20 @@
 """
 Endpoints pour la gestion de la synchronisation Airbyte
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import AsyncIterator, Optional
+
+import orjson
 
 from app.api.deps import get_db, get_current_user
+from app.core.config import settings
+from app.crud import sync_job as crud_sync_job
 from app.models.user import User
 from app.services.airbyte_service import AirbyteService
+from app.services.sync_events import job_event, sync_events
 from app.schemas.airbyte_sync import (
     SyncJobResponse,
     SyncJobStatus,
@@ -41,13 +48,16 @@ async def trigger_manual_sync(
 
 
 @router.get("/status/{job_id}", response_model=SyncJobStatus)
-async def get_sync_job_status(
+def get_sync_job_status(
     job_id: str,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """
     Récupère le statut détaillé d'un job de synchronisation
+
+    Lu dans la table sync_jobs, mise à jour en arrière-plan par le tracker :
+    le polling du frontend ne sollicite pas l'API Airbyte.
     
     **Paramètres :**
     - `job_id` : ID du job Airbyte
@@ -59,7 +69,7 @@ async def get_sync_job_status(
     - Message d'erreur si échec
     """
     airbyte_service = AirbyteService(db=db, user_id=current_user.id)
-    result = await airbyte_service.get_job_status(job_id)
+    result = airbyte_service.get_job_status(job_id)
     
     if not result:
         raise HTTPException(
@@ -70,25 +80,81 @@ async def get_sync_job_status(
     return SyncJobStatus(**result)
 
 
+def _sse(event: str, data: dict) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+@router.get("/events")
+def stream_sync_events(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Flux Server-Sent Events de la synchronisation de l'utilisateur
+
+    **Événements :**
+    - `snapshot` : état du dernier job à l'ouverture du flux (null si aucun)
+    - `job` : changement de statut ou progression (lignes, octets) d'un job
+
+    Un commentaire keep-alive est envoyé toutes les
+    SYNC_EVENTS_HEARTBEAT_SECONDS. Les événements sont publiés par le
+    tracker de jobs : les clients connectés ne sollicitent pas Airbyte.
+    """
+    user_id = current_user.id
+    latest_job = crud_sync_job.get_latest_job(db, user_id)
+    snapshot = job_event(latest_job) if latest_job else None
+    # Le flux peut rester ouvert des heures : rendre la connexion au pool
+    db.close()
+
+    async def event_stream() -> AsyncIterator[bytes]:
+        async with sync_events.subscribe(user_id) as queue:
+            yield _sse("snapshot", {"job": snapshot})
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(
+                        queue.get(), timeout=settings.SYNC_EVENTS_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                yield _sse("job", event)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # nginx : pas de mise en tampon du flux
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
 @router.get("/history", response_model=SyncHistoryResponse)
 async def get_sync_history(
-    limit: int = Query(10, ge=1, le=50, description="Number of jobs to retrieve"),
+    page: int = Query(1, ge=1, description="Page number (starting from 1)"),
+    limit: int = Query(10, ge=1, le=200, description="Jobs per page (max 200)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """
     Récupère l'historique des synchronisations de l'utilisateur
     
+    Servi depuis la table sync_jobs, complétée de façon incrémentale
+    par les nouveaux jobs Airbyte.
+    
     **Paramètres :**
-    - `limit` : Nombre de jobs à récupérer (max 50)
+    - `page` : Numéro de page (à partir de 1)
+    - `limit` : Nombre de jobs par page (max 200)
     
     **Retour :**
-    - Liste des jobs (récents en premier)
+    - Page de jobs (récents en premier), total et nombre de pages
     - Date de la dernière sync réussie
     - Statistiques globales
     """
     airbyte_service = AirbyteService(db=db, user_id=current_user.id)
-    result = await airbyte_service.get_sync_history(limit=limit)
+    result = await airbyte_service.get_sync_history(page=page, limit=limit)
     
     if not result:
         raise HTTPException(
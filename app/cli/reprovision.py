@@ -0,0 +1,233 @@
+"""
+Re-provisionnement Airbyte en masse (rotation des identifiants ou du workspace)
+
+Recrée, via AirbyteService, les ressources Airbyte des connexions
+sélectionnées :
+- mode destination : nouvelle destination PostgreSQL + nouvelle connexion
+  vers la source existante (rotation des identifiants PostgreSQL)
+- mode full : nouvelles source, destination et connexion dans le
+  workspace configuré (rotation de workspace Airbyte)
+
+La concurrence est bornée et les appels à l'API Airbyte sont limités en
+débit. L'avancement est enregistré dans la table
+airbyte_reprovision_tasks : une exécution interrompue reprend avec
+--run-id, seules les tâches non réussies sont rejouées. Les utilisateurs
+dont un sync est en cours sont ignorés (repris à l'exécution suivante).
+
+Usage (depuis la racine du dépôt) :
+    python -m app.cli.reprovision --dry-run
+    python -m app.cli.reprovision --mode destination --concurrency 10 --rate 5
+    python -m app.cli.reprovision --mode full --workspace-id <ancien workspace>
+    python -m app.cli.reprovision --run-id reprovision-20250101-120000
+"""
+import argparse
+import asyncio
+import time
+from collections import Counter
+from datetime import datetime
+from typing import List, Optional
+
+from app.core.http_clients import http_clients
+from app.core.rate_limit import TokenBucket
+from app.crud import airbyte as crud_airbyte
+from app.crud import hubspot as crud_hubspot
+from app.crud import reprovision as crud_reprovision
+from app.db_init import SessionLocal, init_db
+from app.models.reprovision import ReprovisionTask
+from app.services.airbyte_service import AirbyteService
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=("destination", "full"), default="destination",
+                        help="Ressources à recréer (défaut : destination)")
+    parser.add_argument("--run-id", help="Reprendre une exécution existante")
+    parser.add_argument("--user-id", type=int, action="append", dest="user_ids",
+                        help="Limiter à un utilisateur (option répétable)")
+    parser.add_argument("--status", default="active",
+                        help="Statut des connexions à traiter (défaut : active, 'all' pour tous)")
+    parser.add_argument("--workspace-id", help="Limiter aux connexions de ce workspace Airbyte")
+    parser.add_argument("--limit", type=int, help="Nombre maximal d'utilisateurs")
+    parser.add_argument("--concurrency", type=int, default=5, help="Utilisateurs traités en parallèle")
+    parser.add_argument("--rate", type=float, default=5.0, help="Appels à l'API Airbyte par seconde")
+    parser.add_argument("--sync", action="store_true", help="Déclencher un sync après re-provisionnement")
+    parser.add_argument("--dry-run", action="store_true", help="Afficher le plan sans rien modifier")
+    return parser.parse_args(argv)
+
+
+def select_user_ids(args: argparse.Namespace) -> List[int]:
+    """Utilisateurs d'une nouvelle exécution, selon les filtres"""
+    db = SessionLocal()
+    try:
+        connections = crud_airbyte.get_connections(
+            db,
+            user_ids=args.user_ids,
+            status=None if args.status == "all" else args.status,
+            workspace_id=args.workspace_id
+        )
+    finally:
+        db.close()
+    user_ids = [connection.user_id for connection in connections]
+    return user_ids[:args.limit] if args.limit else user_ids
+
+
+async def process_task(
+    row_id: int,
+    args: argparse.Namespace,
+    rate_limiter: TokenBucket
+) -> ReprovisionTask:
+    """Re-provisionne un utilisateur et enregistre le résultat de la tâche"""
+    db = SessionLocal()
+    try:
+        task = db.get(ReprovisionTask, row_id)
+        connection = crud_airbyte.get_connection_by_user_id(db, task.user_id)
+        task = crud_reprovision.update_task(
+            db,
+            task,
+            status="running",
+            attempts=(task.attempts or 0) + 1,
+            started_at=datetime.utcnow(),
+            old_connection_id=task.old_connection_id or (connection.connection_id if connection else None),
+            error_message=None
+        )
+
+        if connection and connection.last_sync_status == "running":
+            return crud_reprovision.update_task(
+                db, task, status="skipped", error_message="Sync running", finished_at=datetime.utcnow()
+            )
+
+        refresh_token = None
+        if task.mode == "full":
+            token = crud_hubspot.get_active_token(db, task.user_id)
+            if not token:
+                return crud_reprovision.update_task(
+                    db, task, status="skipped", error_message="No active HubSpot token",
+                    finished_at=datetime.utcnow()
+                )
+            refresh_token = token.refresh_token
+
+        service = AirbyteService(db, task.user_id, rate_limiter=rate_limiter)
+        try:
+            connection = await service.reprovision_user_connection(refresh_token)
+        except Exception as e:
+            db.rollback()
+            return crud_reprovision.update_task(
+                db, task, status="failed", error_message=str(e), finished_at=datetime.utcnow()
+            )
+
+        if args.sync:
+            await service.trigger_sync(connection.connection_id)
+
+        return crud_reprovision.update_task(
+            db,
+            task,
+            status="succeeded",
+            new_connection_id=connection.connection_id,
+            finished_at=datetime.utcnow()
+        )
+    finally:
+        db.close()
+
+
+def print_summary(tasks: List[ReprovisionTask]) -> None:
+    """Tableau récapitulatif d'une exécution"""
+    counts = Counter(task.status for task in tasks)
+    header = f"{'status':<12}{'users':>8}"
+    print(header)
+    print("-" * len(header))
+    for status in ("succeeded", "failed", "skipped", "running", "pending"):
+        if counts.get(status):
+            print(f"{status:<12}{counts[status]:>8}")
+
+    failures = [task for task in tasks if task.status in ("failed", "skipped")]
+    if failures:
+        print()
+        print(f"{'user_id':<10}{'status':<10}error")
+        for task in failures:
+            print(f"{task.user_id:<10}{task.status:<10}{task.error_message or ''}")
+
+
+async def run(args: argparse.Namespace) -> int:
+    init_db()
+    db = SessionLocal()
+    try:
+        if args.run_id:
+            run_id = args.run_id
+            tasks = crud_reprovision.get_tasks(db, run_id)
+            if not tasks:
+                print(f"Unknown run {run_id}")
+                return 1
+            # Le mode est celui de l'exécution d'origine
+            mode = tasks[0].mode
+            pending = [(task.id, task.user_id) for task in crud_reprovision.get_unfinished_tasks(db, run_id)]
+        else:
+            run_id = f"reprovision-{datetime.utcnow():%Y%m%d-%H%M%S}"
+            mode = args.mode
+            user_ids = select_user_ids(args)
+            if args.dry_run:
+                pending = [(None, user_id) for user_id in user_ids]
+            else:
+                pending = [
+                    (task.id, task.user_id)
+                    for task in crud_reprovision.create_tasks(db, run_id, args.mode, user_ids)
+                ]
+    finally:
+        db.close()
+
+    print(f"Run {run_id}: {len(pending)} users to re-provision (mode {mode})")
+    if args.dry_run:
+        for _, user_id in pending:
+            print(f"  user {user_id}")
+        print("Dry run: nothing changed")
+        return 0
+    if not pending:
+        return 0
+
+    rate_limiter = TokenBucket(rate=args.rate, capacity=args.rate)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    done = 0
+    start = time.perf_counter()
+
+    async def worker(row_id: int) -> None:
+        nonlocal done
+        async with semaphore:
+            task_start = time.perf_counter()
+            try:
+                task = await process_task(row_id, args, rate_limiter)
+            except Exception as e:
+                # Tâche laissée "running" : rejouée à la reprise
+                done += 1
+                print(f"[{done}/{len(pending)}] task {row_id}: error ({e})")
+                return
+            done += 1
+            print(
+                f"[{done}/{len(pending)}] user {task.user_id}: {task.status} "
+                f"({time.perf_counter() - task_start:.1f}s)"
+                + (f" - {task.error_message}" if task.error_message else "")
+            )
+
+    try:
+        await asyncio.gather(*(worker(row_id) for row_id, _ in pending))
+    finally:
+        await http_clients.close()
+
+    print(f"\nRun {run_id} finished in {time.perf_counter() - start:.0f}s\n")
+    db = SessionLocal()
+    try:
+        tasks = crud_reprovision.get_tasks(db, run_id)
+        print_summary(tasks)
+    finally:
+        db.close()
+
+    if any(task.status != "succeeded" for task in tasks):
+        print(f"\nResume with: python -m app.cli.reprovision --run-id {run_id}")
+        return 2
+    return 0
+
+
+def main() -> None:
+    raise SystemExit(asyncio.run(run(parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Middleware ASGI de compression des réponses (brotli ou gzip)
+
+L'encodage est choisi selon l'en-tête Accept-Encoding du client (brotli
+si le paquet `brotli` est installé, sinon gzip). Sont compressées :
+- les réponses complètes d'au moins `minimum_size` octets
+- les réponses en flux (exports), chunk par chunk, sans les bufferiser
+
+Ne sont jamais recompressées les réponses qui ont déjà un
+Content-Encoding (export avec compress=true), ni les flux SSE
+(text/event-stream) qui doivent être transmis immédiatement.
+"""
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli optionnel : repli sur gzip
+    brotli = None
+
+# Types de contenu compressés (préfixes)
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/problem+json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "text/",
+)
+# Flux dont chaque événement doit partir immédiatement
+UNCOMPRESSIBLE_TYPES = ("text/event-stream",)
+
+
+def select_encoding(accept_encoding: str) -> Optional[str]:
+    """Choisit "br" ou "gzip" selon Accept-Encoding (valeurs q respectées)"""
+    supported = ["br", "gzip"] if brotli is not None else ["gzip"]
+    weights = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if token:
+            weights[token] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in supported:
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    content_type = content_type.lower()
+    if content_type.startswith(UNCOMPRESSIBLE_TYPES):
+        return False
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class _Compressor:
+    """Compresseur incrémental gzip ou brotli"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+            self._zlib = None
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.process(data)
+        return self._zlib.compress(data)
+
+    def finish(self) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+class CompressionMiddleware:
+    """Compresse les réponses HTTP selon Accept-Encoding"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = select_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """Intercepte les messages d'une réponse pour la compresser"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.downstream = send
+        self.start_message: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Envoyé avec le premier chunk, une fois la décision prise
+            self.start_message = message
+            return
+
+        if message["type"] != "http.response.body":
+            await self.downstream(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            start_message, self.start_message = self.start_message, None
+            await self._start(start_message, body, more_body)
+            return
+
+        if self.passthrough:
+            await self.downstream(message)
+            return
+
+        chunk = self.compressor.compress(body)
+        if not more_body:
+            chunk += self.compressor.finish()
+        if chunk or not more_body:
+            await self.downstream({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    async def _start(self, start_message: Message, body: bytes, more_body: bool) -> None:
+        """Premier chunk : décide de compresser ou non puis envoie les en-têtes"""
+        headers = MutableHeaders(raw=start_message["headers"])
+        compress = (
+            start_message["status"] not in (204, 304)
+            and "content-encoding" not in headers
+            and is_compressible(headers.get("content-type", ""))
+            and (more_body or len(body) >= self.middleware.minimum_size)
+        )
+
+        if not compress:
+            self.passthrough = True
+            await self.downstream(start_message)
+            await self.downstream({"type": "http.response.body", "body": body, "more_body": more_body})
+            return
+
+        self.compressor = _Compressor(
+            self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality
+        )
+        chunk = self.compressor.compress(body)
+        if not more_body:
+            chunk += self.compressor.finish()
+
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if more_body:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(len(chunk))
+
+        await self.downstream(start_message)
+        await self.downstream({"type": "http.response.body", "body": chunk, "more_body": more_body})
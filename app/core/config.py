@@ -49,15 +49,97 @@ class Settings(BaseSettings):
         """Retourne l'URL de la base de données"""
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}/{self.POSTGRES_DB}"
 
+    # Pool de connexions PostgreSQL (par moteur et par worker : le total
+    # workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW) x 2 moteurs doit rester
+    # sous max_connections)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+    DB_POOL_TIMEOUT_SECONDS: int = int(os.getenv("DB_POOL_TIMEOUT_SECONDS", "10"))
+    DB_POOL_RECYCLE_SECONDS: int = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    # Timeouts appliqués à chaque session PostgreSQL (0 = désactivé)
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+    DB_LOCK_TIMEOUT_MS: int = int(os.getenv("DB_LOCK_TIMEOUT_MS", "5000"))
+
+    # Compression des réponses (gzip / brotli selon Accept-Encoding)
+    COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_MINIMUM_SIZE: int = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    # Qualité brotli 0-11 : au-delà de 5, le coût CPU explose pour un gain faible
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+    # Clients HTTP sortants (un pool httpx partagé par service amont)
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "10"))
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "30"))
+    HTTP_TIMEOUT_SECONDS: float = float(os.getenv("HTTP_TIMEOUT_SECONDS", "30"))
+    # Attente maximale d'une connexion libre quand le pool est plein
+    HTTP_POOL_TIMEOUT_SECONDS: float = float(os.getenv("HTTP_POOL_TIMEOUT_SECONDS", "60"))
+
     # HubSpot settings
     HUBSPOT_CLIENT_ID: Optional[str] = os.getenv("HUBSPOT_CLIENT_ID")
     HUBSPOT_CLIENT_SECRET: Optional[str] = os.getenv("HUBSPOT_CLIENT_SECRET")
     HUBSPOT_REDIRECT_URI: Optional[str] = os.getenv("HUBSPOT_REDIRECT_URI")
 
+    # HubSpot OAuth - échange et rafraîchissement des tokens
+    HUBSPOT_OAUTH_TIMEOUT_SECONDS: float = float(os.getenv("HUBSPOT_OAUTH_TIMEOUT_SECONDS", "10"))
+    HUBSPOT_OAUTH_MAX_RETRIES: int = int(os.getenv("HUBSPOT_OAUTH_MAX_RETRIES", "3"))
+    HUBSPOT_OAUTH_BACKOFF_SECONDS: float = float(os.getenv("HUBSPOT_OAUTH_BACKOFF_SECONDS", "0.5"))
+
+    # HubSpot OAuth - rafraîchissement proactif des tokens avant expiration
+    HUBSPOT_TOKEN_REFRESH_ENABLED: bool = os.getenv("HUBSPOT_TOKEN_REFRESH_ENABLED", "true").lower() == "true"
+    HUBSPOT_TOKEN_REFRESH_INTERVAL_MINUTES: int = int(os.getenv("HUBSPOT_TOKEN_REFRESH_INTERVAL_MINUTES", "5"))
+    # Les tokens qui expirent dans cette fenêtre sont rafraîchis
+    HUBSPOT_TOKEN_REFRESH_WINDOW_MINUTES: int = int(os.getenv("HUBSPOT_TOKEN_REFRESH_WINDOW_MINUTES", "15"))
+    HUBSPOT_TOKEN_REFRESH_CONCURRENCY: int = int(os.getenv("HUBSPOT_TOKEN_REFRESH_CONCURRENCY", "5"))
+    HUBSPOT_TOKEN_REFRESH_BATCH_SIZE: int = int(os.getenv("HUBSPOT_TOKEN_REFRESH_BATCH_SIZE", "500"))
+
     # HubSpot Auto-Sync Settings
     HUBSPOT_AUTO_SYNC_ENABLED: bool = os.getenv("HUBSPOT_AUTO_SYNC_ENABLED", "true").lower() == "true"
     HUBSPOT_SYNC_INTERVAL_HOURS: int = int(os.getenv("HUBSPOT_SYNC_INTERVAL_HOURS", "6"))
     HUBSPOT_SYNC_STARTUP_DELAY_MINUTES: int = int(os.getenv("HUBSPOT_SYNC_STARTUP_DELAY_MINUTES", "2"))
+    # Les déclenchements sont étalés sur cette fenêtre pour ne pas solliciter Airbyte d'un coup
+    HUBSPOT_SYNC_JITTER_SECONDS: int = int(os.getenv("HUBSPOT_SYNC_JITTER_SECONDS", "300"))
+    HUBSPOT_SYNC_CONCURRENCY: int = int(os.getenv("HUBSPOT_SYNC_CONCURRENCY", "5"))
+    # Un sync "running" plus ancien est considéré comme perdu et relancé
+    HUBSPOT_SYNC_STALE_RUNNING_HOURS: int = int(os.getenv("HUBSPOT_SYNC_STALE_RUNNING_HOURS", "12"))
+
+    # Suivi des jobs Airbyte (table sync_jobs) : un seul polling par job en cours,
+    # intervalle doublé tant que le statut ne change pas
+    SYNC_TRACKER_ENABLED: bool = os.getenv("SYNC_TRACKER_ENABLED", "true").lower() == "true"
+    SYNC_TRACKER_MIN_INTERVAL_SECONDS: int = int(os.getenv("SYNC_TRACKER_MIN_INTERVAL_SECONDS", "10"))
+    SYNC_TRACKER_MAX_INTERVAL_SECONDS: int = int(os.getenv("SYNC_TRACKER_MAX_INTERVAL_SECONDS", "120"))
+    SYNC_TRACKER_CONCURRENCY: int = int(os.getenv("SYNC_TRACKER_CONCURRENCY", "10"))
+    SYNC_TRACKER_BATCH_SIZE: int = int(os.getenv("SYNC_TRACKER_BATCH_SIZE", "200"))
+    # Historique /sync/history : import incrémental des jobs Airbyte au plus une fois par période
+    SYNC_HISTORY_REFRESH_SECONDS: int = int(os.getenv("SYNC_HISTORY_REFRESH_SECONDS", "300"))
+
+    # Flux SSE /sync/events : événements des jobs relayés par LISTEN/NOTIFY
+    SYNC_EVENTS_ENABLED: bool = os.getenv("SYNC_EVENTS_ENABLED", "true").lower() == "true"
+    # Commentaire keep-alive envoyé aux clients (et ping du listener)
+    SYNC_EVENTS_HEARTBEAT_SECONDS: int = int(os.getenv("SYNC_EVENTS_HEARTBEAT_SECONDS", "15"))
+    SYNC_EVENTS_QUEUE_SIZE: int = int(os.getenv("SYNC_EVENTS_QUEUE_SIZE", "100"))
+
+    # HubSpot Data - stratégie de comptage des totaux paginés
+    HUBSPOT_EXACT_COUNT_THRESHOLD: int = int(os.getenv("HUBSPOT_EXACT_COUNT_THRESHOLD", "50000"))
+    HUBSPOT_COUNT_CACHE_TTL_SECONDS: int = int(os.getenv("HUBSPOT_COUNT_CACHE_TTL_SECONDS", "3600"))
+    HUBSPOT_COUNT_CACHE_MAX_ENTRIES: int = int(os.getenv("HUBSPOT_COUNT_CACHE_MAX_ENTRIES", "10000"))
+
+    # HubSpot Data - cache des métadonnées des schémas utilisateurs
+    TENANT_METADATA_CACHE_TTL_SECONDS: int = int(os.getenv("TENANT_METADATA_CACHE_TTL_SECONDS", "600"))
+    TENANT_METADATA_CACHE_MAX_ENTRIES: int = int(os.getenv("TENANT_METADATA_CACHE_MAX_ENTRIES", "5000"))
+    # Schéma absent : gardé peu de temps, la première sync peut le créer à tout moment
+    TENANT_METADATA_MISSING_TTL_SECONDS: int = int(os.getenv("TENANT_METADATA_MISSING_TTL_SECONDS", "10"))
+
+    # HubSpot Data - cache des résultats de lecture (listes, détails, colonnes)
+    # backend : "memory" (LRU par processus), "redis" (partagé) ou "none".
+    # En mémoire, le worker qui observe la fin de sync prévient les autres par
+    # NOTIFY (canal sync_job_events) : chacun invalide son propre cache. Le TTL
+    # ne borne plus que les notifications perdues (listener en reconnexion).
+    HUBSPOT_DATA_CACHE_BACKEND: str = os.getenv("HUBSPOT_DATA_CACHE_BACKEND", "memory")
+    HUBSPOT_DATA_CACHE_TTL_SECONDS: int = int(os.getenv("HUBSPOT_DATA_CACHE_TTL_SECONDS", "900"))
+    HUBSPOT_DATA_CACHE_MAX_ENTRIES: int = int(os.getenv("HUBSPOT_DATA_CACHE_MAX_ENTRIES", "2000"))
+    REDIS_URL: Optional[str] = os.getenv("REDIS_URL")
 
     # Google OAuth Settings
     GOOGLE_CLIENT_ID: Optional[str] = None
@@ -0,0 +1,56 @@
+"""
+Pools de connexions instrumentés
+
+Le temps passé à attendre une connexion libre (checkout) est mesuré à
+chaque emprunt : une attente qui grimpe signale un pool sous-dimensionné
+ou des requêtes qui monopolisent les connexions.
+"""
+import time
+from typing import Any, Dict
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.metrics import record_timing
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool qui mesure l'attente de checkout (moteur psycopg2)"""
+
+    metric_name = "db.sync.pool_checkout_wait"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            record_timing(self.metric_name, (time.perf_counter() - start) * 1000)
+
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool qui mesure l'attente de checkout (moteur asyncpg)"""
+
+    metric_name = "db.async.pool_checkout_wait"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            record_timing(self.metric_name, (time.perf_counter() - start) * 1000)
+
+
+def pool_status(engine: Engine) -> Dict[str, Any]:
+    """Occupation instantanée du pool d'un moteur"""
+    pool = engine.pool
+    size = pool.size()
+    checked_out = pool.checkedout()
+    capacity = size + max(pool._max_overflow, 0)
+    return {
+        "size": size,
+        "max_overflow": pool._max_overflow,
+        "checked_out": checked_out,
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "utilization": round(checked_out / capacity, 3) if capacity else 0.0,
+    }
@@ -0,0 +1,123 @@
+"""
+Clients HTTP sortants partagés (un httpx.AsyncClient par service amont)
+
+Chaque client garde un pool de connexions keep-alive borné : les appels
+successifs à Airbyte, Google ou HubSpot réutilisent les connexions TCP/TLS
+déjà ouvertes, et une opération de masse (sync de tous les utilisateurs)
+ne peut pas ouvrir plus de HTTP_MAX_CONNECTIONS sockets par service : les
+requêtes en trop attendent une connexion libre.
+
+Les clients sont ouverts et fermés par le lifespan de l'application.
+HTTP/2 est activé si le paquet `h2` est installé (httpx[http2]).
+"""
+import importlib.util
+import logging
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.core.airbyte_config import airbyte_settings
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def _client_options() -> Dict[str, Dict[str, Any]]:
+    """Options propres à chaque service amont"""
+    return {
+        "airbyte": {
+            "base_url": airbyte_settings.AIRBYTE_API_URL,
+            "auth": (airbyte_settings.AIRBYTE_EMAIL, airbyte_settings.AIRBYTE_PASSWORD),
+        },
+        "google": {},
+        "hubspot": {"base_url": "https://api.hubapi.com"},
+    }
+
+
+class HttpClientRegistry:
+    """Registre des clients httpx partagés, indexés par nom de service"""
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._requests: Dict[str, int] = {}
+
+    def _create(self, name: str) -> httpx.AsyncClient:
+        options = _client_options()
+        if name not in options:
+            raise KeyError(f"Unknown HTTP client: {name}")
+
+        async def count_request(request: httpx.Request) -> None:
+            self._requests[name] = self._requests.get(name, 0) + 1
+
+        return httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+            timeout=httpx.Timeout(
+                settings.HTTP_TIMEOUT_SECONDS,
+                connect=10.0,
+                pool=settings.HTTP_POOL_TIMEOUT_SECONDS,
+            ),
+            http2=HTTP2_AVAILABLE,
+            event_hooks={"request": [count_request]},
+            **options[name],
+        )
+
+    async def start(self) -> None:
+        """Ouvre les clients de tous les services connus"""
+        for name in _client_options():
+            if name not in self._clients:
+                self._clients[name] = self._create(name)
+        logger.info(f"HTTP clients started: {', '.join(self._clients)} (http2={HTTP2_AVAILABLE})")
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        """
+        Retourne le client partagé d'un service
+
+        Hors de l'application (scripts, tests), le client est créé à la
+        première utilisation ; il doit être fermé par close().
+        """
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._clients[name] = self._create(name)
+        return client
+
+    async def close(self) -> None:
+        for name, client in list(self._clients.items()):
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.error(f"Error closing HTTP client {name}: {e}")
+        self._clients.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """État des pools de connexions de chaque client"""
+        return {
+            name: {
+                "requests": self._requests.get(name, 0),
+                "max_connections": settings.HTTP_MAX_CONNECTIONS,
+                "http2": HTTP2_AVAILABLE,
+                **_pool_connections(client),
+            }
+            for name, client in self._clients.items()
+        }
+
+
+def _pool_connections(client: httpx.AsyncClient) -> Dict[str, Optional[int]]:
+    """Connexions ouvertes / inactives du pool httpcore sous-jacent"""
+    try:
+        connections = client._transport._pool.connections
+    except AttributeError:
+        return {"open_connections": None, "idle_connections": None}
+    return {
+        "open_connections": len(connections),
+        "idle_connections": sum(1 for connection in connections if connection.is_idle()),
+    }
+
+
+# Instance globale, démarrée par le lifespan de l'application
+http_clients = HttpClientRegistry()
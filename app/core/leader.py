@@ -0,0 +1,83 @@
+"""
+Verrous consultatifs PostgreSQL entre workers
+
+- advisory_lock : élection d'un worker pour les tâches planifiées. Chaque
+  worker uvicorn démarre son propre planificateur : une tâche globale
+  (scan de tous les utilisateurs) prend un verrou consultatif de session
+  avant de s'exécuter. Le premier worker qui l'obtient exécute la tâche,
+  les autres passent leur tour.
+- advisory_xact_lock : exclusion mutuelle d'une opération ciblée
+  (rafraîchissement du token d'un utilisateur), en attendant le verrou.
+
+Les verrous sont pris sur le moteur asyncpg : l'attente ne bloque pas la
+boucle d'événements.
+"""
+import hashlib
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+logger = logging.getLogger(__name__)
+
+
+class AdvisoryLockTimeout(Exception):
+    """Verrou consultatif non obtenu dans le délai imparti"""
+
+
+def lock_key(name: str) -> int:
+    """Clé bigint stable dérivée du nom du verrou"""
+    return int.from_bytes(hashlib.sha1(name.encode()).digest()[:8], "big", signed=True)
+
+
+@asynccontextmanager
+async def advisory_lock(name: str) -> AsyncIterator[bool]:
+    """
+    Tente de prendre le verrou `name` sans attendre
+
+    Produit True si le verrou est obtenu (libéré à la sortie du bloc),
+    False si un autre worker le détient déjà.
+    """
+    from app.db_init import async_engine
+
+    key = lock_key(name)
+    async with async_engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        result = await conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": key})
+        acquired = bool(result.scalar())
+        if not acquired:
+            logger.debug(f"Advisory lock {name} held by another worker")
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+
+
+@asynccontextmanager
+async def advisory_xact_lock(name: str, timeout_seconds: float) -> AsyncIterator[None]:
+    """
+    Attend le verrou `name` (au plus `timeout_seconds`) pour la durée du bloc
+
+    Le verrou est lié à une transaction dédiée : il est libéré à la sortie
+    du bloc, y compris sur exception ou coupure de connexion.
+
+    Raises:
+        AdvisoryLockTimeout: le verrou n'a pas été obtenu à temps
+    """
+    from app.db_init import async_engine
+
+    key = lock_key(name)
+    timeout_ms = int(timeout_seconds * 1000)
+    async with async_engine.connect() as conn:
+        async with conn.begin():
+            try:
+                # L'attente du verrou est bornée par lock_timeout (et statement_timeout)
+                await conn.execute(text(f"SET LOCAL lock_timeout = {timeout_ms}"))
+                await conn.execute(text(f"SET LOCAL statement_timeout = {timeout_ms}"))
+                await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": key})
+            except DBAPIError as e:
+                raise AdvisoryLockTimeout(f"Advisory lock {name} not acquired within {timeout_seconds:.0f}s") from e
+            yield
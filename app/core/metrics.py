@@ -0,0 +1,57 @@
+"""Métriques applicatives en processus (durées sur fenêtre glissante)"""
+import threading
+from collections import deque
+from typing import Deque, Dict, List
+
+# Nombre d'échantillons conservés par métrique
+WINDOW_SIZE = 1000
+
+
+class TimingMetric:
+    """Durées (ms) d'une opération : compteur total + fenêtre récente"""
+
+    def __init__(self, window_size: int = WINDOW_SIZE):
+        self.count = 0
+        self.samples: Deque[float] = deque(maxlen=window_size)
+
+    def summary(self) -> Dict[str, float]:
+        samples: List[float] = sorted(self.samples)
+        if not samples:
+            return {"count": self.count, "avg_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        return {
+            "count": self.count,
+            "avg_ms": round(sum(samples) / len(samples), 2),
+            "p50_ms": round(_percentile(samples, 0.50), 2),
+            "p95_ms": round(_percentile(samples, 0.95), 2),
+            "max_ms": round(samples[-1], 2),
+        }
+
+
+def _percentile(sorted_samples: List[float], fraction: float) -> float:
+    index = min(len(sorted_samples) - 1, int(round(fraction * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+_timings: Dict[str, TimingMetric] = {}
+_lock = threading.Lock()
+
+
+def record_timing(name: str, elapsed_ms: float) -> None:
+    """Enregistre une durée pour la métrique `name`"""
+    with _lock:
+        metric = _timings.get(name)
+        if metric is None:
+            metric = _timings[name] = TimingMetric()
+        metric.count += 1
+        metric.samples.append(elapsed_ms)
+
+
+def snapshot() -> Dict[str, Dict[str, float]]:
+    """Résumé de toutes les métriques de durée"""
+    with _lock:
+        return {name: metric.summary() for name, metric in sorted(_timings.items())}
+
+
+def reset() -> None:
+    with _lock:
+        _timings.clear()
@@ -0,0 +1,35 @@
+"""Limiteur de débit asynchrone (seau à jetons) pour les appels sortants"""
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    Seau à jetons : au plus `rate` acquisitions par seconde en régime
+    établi, avec des rafales de `capacity` acquisitions
+
+    Partagé entre les tâches d'une même boucle d'événements.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self) -> None:
+        """Attend qu'un jeton soit disponible puis le consomme"""
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
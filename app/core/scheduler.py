@@ -0,0 +1,42 @@
+"""
+Planificateur partagé des tâches de fond (APScheduler)
+
+Un seul AsyncIOScheduler par processus, démarré et arrêté par le lifespan
+de l'application. Les modules enregistrent leurs tâches via register_job ;
+une tâche qui ne doit tourner que sur un seul worker utilise un verrou
+consultatif (app.core.leader).
+"""
+import logging
+from typing import Any, Callable
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+logger = logging.getLogger(__name__)
+
+scheduler = AsyncIOScheduler(
+    timezone="UTC",
+    job_defaults={
+        # Une exécution en retard n'est jouée qu'une fois, jamais en parallèle
+        "coalesce": True,
+        "max_instances": 1,
+        "misfire_grace_time": 60,
+    },
+)
+
+
+def register_job(func: Callable, trigger: str, job_id: str, **trigger_args: Any) -> None:
+    """Enregistre (ou remplace) une tâche planifiée"""
+    scheduler.add_job(func, trigger, id=job_id, replace_existing=True, **trigger_args)
+    logger.info(f"Scheduled job {job_id} ({trigger} {trigger_args})")
+
+
+def start_scheduler() -> None:
+    if not scheduler.running:
+        scheduler.start()
+        logger.info("Background scheduler started")
+
+
+def shutdown_scheduler() -> None:
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
+        logger.info("Background scheduler stopped")
@@ -1,6 +1,6 @@
 """CRUD pour gérer les connexions Airbyte"""
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 from app.models.airbyte import AirbyteConnection
@@ -21,6 +21,30 @@ def get_connection_by_connection_id(db: Session, connection_id: str) -> Optional
     ).first()
 
 
+def get_active_connections(db: Session) -> List[AirbyteConnection]:
+    """Connexions Airbyte actives (synchronisation automatique)"""
+    return db.query(AirbyteConnection).filter(
+        AirbyteConnection.status == "active"
+    ).order_by(AirbyteConnection.id).all()
+
+
+def get_connections(
+    db: Session,
+    user_ids: Optional[List[int]] = None,
+    status: Optional[str] = None,
+    workspace_id: Optional[str] = None
+) -> List[AirbyteConnection]:
+    """Connexions Airbyte filtrées (opérations en masse)"""
+    query = db.query(AirbyteConnection)
+    if user_ids:
+        query = query.filter(AirbyteConnection.user_id.in_(user_ids))
+    if status:
+        query = query.filter(AirbyteConnection.status == status)
+    if workspace_id:
+        query = query.filter(AirbyteConnection.workspace_id == workspace_id)
+    return query.order_by(AirbyteConnection.user_id).all()
+
+
 def create_connection(db: Session, connection: AirbyteConnectionCreate) -> AirbyteConnection:
     """Créer une nouvelle connexion Airbyte"""
     db_connection = AirbyteConnection(**connection.dict())
@@ -46,6 +70,17 @@ def update_last_sync(
     return db_connection
 
 
+def update_resources(db: Session, user_id: int, **fields) -> Optional[AirbyteConnection]:
+    """Remplacer les IDs Airbyte d'une connexion (re-provisionnement)"""
+    db_connection = get_connection_by_user_id(db, user_id)
+    if db_connection:
+        for key, value in fields.items():
+            setattr(db_connection, key, value)
+        db.commit()
+        db.refresh(db_connection)
+    return db_connection
+
+
 def update_status(
     db: Session,
     user_id: int,
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime, timezone
 from sqlalchemy.orm import Session
 from app.models.hubspot import HubspotToken
@@ -44,6 +44,13 @@ def deactivate_token(db: Session, user_id: int) -> None:
     ).update({"is_active": False})
     db.commit()
 
+def get_tokens_expiring_before(db: Session, before: datetime, limit: int = 500) -> List[HubspotToken]:
+    """Tokens actifs qui expirent avant `before`, les plus urgents d'abord"""
+    return db.query(HubspotToken).filter(
+        HubspotToken.is_active == True,
+        HubspotToken.expires_at < before
+    ).order_by(HubspotToken.expires_at).limit(limit).all()
+
 def is_token_valid(token: HubspotToken) -> bool:
     if not token or not token.is_active:
         return False
@@ -0,0 +1,37 @@
+"""CRUD pour les snapshots de statistiques HubSpot"""
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Optional
+from datetime import datetime
+
+from app.models.hubspot_stats import HubspotStatsSnapshot
+
+
+def get_snapshot(db: Session, user_id: int) -> Optional[HubspotStatsSnapshot]:
+    """Récupérer le snapshot de statistiques d'un utilisateur"""
+    return db.query(HubspotStatsSnapshot).filter(
+        HubspotStatsSnapshot.user_id == user_id
+    ).first()
+
+
+def upsert_snapshot(db: Session, user_id: int, stats: Dict[str, Any]) -> HubspotStatsSnapshot:
+    """Créer ou remplacer le snapshot de statistiques d'un utilisateur"""
+    snapshot = get_snapshot(db, user_id)
+    if snapshot:
+        snapshot.stats = stats
+        snapshot.computed_at = datetime.utcnow()
+    else:
+        snapshot = HubspotStatsSnapshot(user_id=user_id, stats=stats, computed_at=datetime.utcnow())
+        db.add(snapshot)
+    db.commit()
+    db.refresh(snapshot)
+    return snapshot
+
+
+def delete_snapshot(db: Session, user_id: int) -> bool:
+    """Supprimer le snapshot de statistiques d'un utilisateur"""
+    snapshot = get_snapshot(db, user_id)
+    if snapshot:
+        db.delete(snapshot)
+        db.commit()
+        return True
+    return False
@@ -0,0 +1,38 @@
+"""CRUD pour les tâches de re-provisionnement Airbyte"""
+from sqlalchemy.orm import Session
+from typing import Iterable, List
+from datetime import datetime
+
+from app.models.reprovision import ReprovisionTask
+
+
+def get_tasks(db: Session, run_id: str) -> List[ReprovisionTask]:
+    """Tâches d'une exécution"""
+    return db.query(ReprovisionTask).filter(
+        ReprovisionTask.run_id == run_id
+    ).order_by(ReprovisionTask.user_id).all()
+
+
+def get_unfinished_tasks(db: Session, run_id: str) -> List[ReprovisionTask]:
+    """Tâches d'une exécution restant à traiter (reprise)"""
+    return db.query(ReprovisionTask).filter(
+        ReprovisionTask.run_id == run_id,
+        ReprovisionTask.status != "succeeded"
+    ).order_by(ReprovisionTask.user_id).all()
+
+
+def create_tasks(db: Session, run_id: str, mode: str, user_ids: Iterable[int]) -> List[ReprovisionTask]:
+    """Créer les tâches d'une nouvelle exécution"""
+    tasks = [ReprovisionTask(run_id=run_id, user_id=user_id, mode=mode, created_at=datetime.utcnow()) for user_id in user_ids]
+    db.add_all(tasks)
+    db.commit()
+    return get_tasks(db, run_id)
+
+
+def update_task(db: Session, task: ReprovisionTask, **fields) -> ReprovisionTask:
+    """Mettre à jour l'avancement d'une tâche"""
+    for key, value in fields.items():
+        setattr(task, key, value)
+    db.commit()
+    db.refresh(task)
+    return task
@@ -0,0 +1,114 @@
+"""CRUD pour les jobs de synchronisation Airbyte"""
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+
+from app.models.sync_job import SyncJob
+
+
+def get_job(db: Session, user_id: int, job_id: str) -> Optional[SyncJob]:
+    """Récupérer un job d'un utilisateur"""
+    return db.query(SyncJob).filter(
+        SyncJob.user_id == user_id,
+        SyncJob.job_id == job_id
+    ).first()
+
+
+def get_latest_job(db: Session, user_id: int) -> Optional[SyncJob]:
+    """Récupérer le dernier job déclenché pour un utilisateur"""
+    return db.query(SyncJob).filter(
+        SyncJob.user_id == user_id
+    ).order_by(SyncJob.created_at.desc(), SyncJob.id.desc()).first()
+
+
+def get_jobs(db: Session, user_id: int, limit: int = 10, offset: int = 0) -> List[SyncJob]:
+    """Jobs d'un utilisateur, les plus récents d'abord"""
+    return db.query(SyncJob).filter(
+        SyncJob.user_id == user_id
+    ).order_by(SyncJob.created_at.desc(), SyncJob.id.desc()).offset(offset).limit(limit).all()
+
+
+def count_jobs(db: Session, user_id: int) -> int:
+    """Nombre de jobs d'un utilisateur"""
+    return db.query(func.count(SyncJob.id)).filter(SyncJob.user_id == user_id).scalar() or 0
+
+
+def get_last_succeeded_job(db: Session, user_id: int) -> Optional[SyncJob]:
+    """Dernier job terminé avec succès"""
+    return db.query(SyncJob).filter(
+        SyncJob.user_id == user_id,
+        SyncJob.status == "succeeded"
+    ).order_by(SyncJob.created_at.desc(), SyncJob.id.desc()).first()
+
+
+def get_newest_finished_created_at(db: Session, user_id: int) -> Optional[datetime]:
+    """Date de création du job terminé le plus récent (curseur d'import)"""
+    return db.query(func.max(SyncJob.created_at)).filter(
+        SyncJob.user_id == user_id,
+        SyncJob.next_poll_at.is_(None)
+    ).scalar()
+
+
+def get_jobs_due(db: Session, now: datetime, limit: int = 200) -> List[SyncJob]:
+    """Jobs en cours dont le prochain polling est échu"""
+    return db.query(SyncJob).filter(
+        SyncJob.next_poll_at.isnot(None),
+        SyncJob.next_poll_at <= now
+    ).order_by(SyncJob.next_poll_at).limit(limit).all()
+
+
+def create_job(
+    db: Session,
+    user_id: int,
+    connection_id: str,
+    job_id: str,
+    status: str = "pending",
+    next_poll_at: Optional[datetime] = None
+) -> SyncJob:
+    """
+    Enregistrer un job qui vient d'être déclenché
+
+    Sans effet si le job est déjà connu (import de l'historique ou autre
+    worker concurrent) : ON CONFLICT (job_id) DO NOTHING.
+    """
+    now = datetime.utcnow()
+    db.execute(insert(SyncJob).values(
+        user_id=user_id,
+        connection_id=connection_id,
+        job_id=job_id,
+        status=status,
+        created_at=now,
+        next_poll_at=next_poll_at or now,
+        poll_count=0
+    ).on_conflict_do_nothing(index_elements=[SyncJob.job_id]))
+    db.commit()
+    return get_job(db, user_id, job_id)
+
+
+def insert_jobs(db: Session, jobs: List[Dict[str, Any]]) -> int:
+    """
+    Enregistrer en une requête des jobs importés depuis l'historique Airbyte
+
+    Les jobs déjà connus sont ignorés (ON CONFLICT (job_id) DO NOTHING).
+
+    Returns:
+        Nombre de jobs insérés
+    """
+    if not jobs:
+        return 0
+    result = db.execute(
+        insert(SyncJob).values(jobs).on_conflict_do_nothing(index_elements=[SyncJob.job_id])
+    )
+    db.commit()
+    return result.rowcount
+
+
+def update_job(db: Session, job: SyncJob, **fields) -> SyncJob:
+    """Mettre à jour un job (état Airbyte, planification du polling)"""
+    for key, value in fields.items():
+        setattr(job, key, value)
+    db.commit()
+    db.refresh(job)
+    return job
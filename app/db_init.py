@@ -1,13 +1,50 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.core.db_pool import TimedAsyncAdaptedQueuePool, TimedQueuePool
 
 SQLALCHEMY_DATABASE_URI = f"postgresql://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_SERVER}/{settings.POSTGRES_DB}"
+ASYNC_SQLALCHEMY_DATABASE_URI = f"postgresql+asyncpg://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_SERVER}/{settings.POSTGRES_DB}"
 
-engine = create_engine(SQLALCHEMY_DATABASE_URI)
+# Options du pool communes aux deux moteurs (voir DB_* dans Settings)
+POOL_OPTIONS = {
+    "pool_size": settings.DB_POOL_SIZE,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+    "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+    "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+    "pool_pre_ping": settings.DB_POOL_PRE_PING,
+}
+
+# statement_timeout / lock_timeout fixés à l'ouverture de chaque connexion :
+# une requête lente d'un utilisateur ne peut pas monopoliser le pool
+SESSION_SETTINGS = {
+    "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS),
+    "lock_timeout": str(settings.DB_LOCK_TIMEOUT_MS),
+}
+
+# Moteur synchrone (psycopg2) : CRUD, exports, tâches de fond
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URI,
+    poolclass=TimedQueuePool,
+    connect_args={"options": " ".join(f"-c {key}={value}" for key, value in SESSION_SETTINGS.items())},
+    **POOL_OPTIONS
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Moteur asynchrone (asyncpg) : endpoints de lecture async def
+async_engine = create_async_engine(
+    ASYNC_SQLALCHEMY_DATABASE_URI,
+    poolclass=TimedAsyncAdaptedQueuePool,
+    connect_args={"server_settings": SESSION_SETTINGS},
+    **POOL_OPTIONS
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 Base = declarative_base()
 
 def init_db():
@@ -16,6 +53,9 @@ def init_db():
     from app.models import audit
     from app.models import hubspot
     from app.models import airbyte  # ✅ AJOUT
+    from app.models import hubspot_stats
+    from app.models import sync_job
+    from app.models import reprovision
 
     # Create tables if they don't exist
     Base.metadata.create_all(bind=engine)
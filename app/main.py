@@ -1,8 +1,17 @@
 from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.core.config import settings
+from app.core.compression import CompressionMiddleware
+from app.core.http_clients import http_clients
+from app.core.scheduler import register_job, shutdown_scheduler, start_scheduler
+from app.services.hubspot_sync_scheduler import run_scheduled_syncs
+from app.services.hubspot_token_service import refresh_expiring_tokens
+from app.services.sync_events import sync_events
+from app.services.sync_job_tracker import poll_due_jobs
 from app.api.v1.api import api_router
 from app.db_init import init_db
 from slowapi import Limiter, _rate_limit_exceeded_handler
@@ -14,6 +23,35 @@ async def lifespan(app: FastAPI):
     # Startup
     try:
         print("🚀 Démarrage de l'application...")
+        await http_clients.start()
+        if settings.SYNC_EVENTS_ENABLED:
+            await sync_events.start()
+
+        if settings.HUBSPOT_TOKEN_REFRESH_ENABLED:
+            register_job(
+                refresh_expiring_tokens,
+                "interval",
+                "hubspot-token-refresh",
+                minutes=settings.HUBSPOT_TOKEN_REFRESH_INTERVAL_MINUTES,
+            )
+        if settings.HUBSPOT_AUTO_SYNC_ENABLED:
+            register_job(
+                run_scheduled_syncs,
+                "interval",
+                "hubspot-auto-sync",
+                hours=settings.HUBSPOT_SYNC_INTERVAL_HOURS,
+                next_run_time=datetime.now(timezone.utc) + timedelta(
+                    minutes=settings.HUBSPOT_SYNC_STARTUP_DELAY_MINUTES
+                ),
+            )
+        if settings.SYNC_TRACKER_ENABLED:
+            register_job(
+                poll_due_jobs,
+                "interval",
+                "sync-job-tracker",
+                seconds=settings.SYNC_TRACKER_MIN_INTERVAL_SECONDS,
+            )
+        start_scheduler()
         print("✅ Application démarrée")
     except Exception as e:
         print(f"❌ Erreur dans lifespan startup: {e}")
@@ -24,6 +62,9 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     try:
+        shutdown_scheduler()
+        await sync_events.stop()
+        await http_clients.close()
         print("🛑 Application arrêtée")
     except Exception as e:
         print(f"❌ Erreur dans lifespan shutdown: {e}")
@@ -34,6 +75,8 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     redirect_slashes=False,
+    # orjson : encodage JSON nettement plus rapide que json.dumps
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -52,6 +95,15 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_headers=["Content-Type", "Authorization", "Accept", "X-Requested-With"],
     )
 
+# Compression gzip / brotli des réponses (nginx ne compresse pas)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+
 # Initialize database tables
 init_db()
 
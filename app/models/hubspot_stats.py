@@ -0,0 +1,18 @@
+"""Modèle pour stocker les statistiques HubSpot pré-calculées"""
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, JSON
+from datetime import datetime
+
+from app.db_init import Base
+
+
+class HubspotStatsSnapshot(Base):
+    """Statistiques d'un utilisateur, recalculées à la fin de chaque sync"""
+    __tablename__ = "hubspot_stats_snapshots"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), unique=True, index=True)
+
+    # Contenu de HubspotStats sérialisé en JSON
+    stats = Column(JSON, nullable=False)
+
+    computed_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,31 @@
+"""Modèle pour suivre les re-provisionnements Airbyte en masse"""
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text, UniqueConstraint
+from datetime import datetime
+
+from app.db_init import Base
+
+
+class ReprovisionTask(Base):
+    """Re-provisionnement d'un utilisateur au sein d'une exécution (reprise possible)"""
+    __tablename__ = "airbyte_reprovision_tasks"
+
+    id = Column(Integer, primary_key=True, index=True)
+    run_id = Column(String, nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    mode = Column(String, nullable=False)  # destination, full
+
+    status = Column(String, nullable=False, default="pending")  # pending, running, succeeded, failed, skipped
+    attempts = Column(Integer, default=0)
+    error_message = Column(Text, nullable=True)
+
+    # Connexion avant / après le re-provisionnement
+    old_connection_id = Column(String, nullable=True)
+    new_connection_id = Column(String, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("run_id", "user_id", name="uq_reprovision_run_user"),
+    )
@@ -0,0 +1,38 @@
+"""Modèle pour suivre les jobs de synchronisation Airbyte"""
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Integer, String, Text
+from datetime import datetime
+
+from app.db_init import Base
+
+
+class SyncJob(Base):
+    """Job Airbyte d'un utilisateur, mis à jour par le tracker côté serveur"""
+    __tablename__ = "sync_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=False)
+    connection_id = Column(String, nullable=False)
+    job_id = Column(String, nullable=False, unique=True)
+
+    # Dernier état connu côté Airbyte
+    status = Column(String, nullable=False, default="pending")  # pending, running, succeeded, failed, cancelled
+    rows_synced = Column(BigInteger, default=0)
+    bytes_synced = Column(BigInteger, default=0)
+    duration = Column(String, nullable=True)  # Format ISO 8601 : "PT5M30S"
+    error_message = Column(Text, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+
+    # Polling adaptatif (vide une fois le job terminé)
+    next_poll_at = Column(DateTime, nullable=True)
+    last_polled_at = Column(DateTime, nullable=True)
+    poll_count = Column(Integer, default=0)
+
+    __table_args__ = (
+        # Dernier job / historique d'un utilisateur
+        Index("ix_sync_jobs_user_created", "user_id", "created_at"),
+        # Jobs à interroger par le tracker
+        Index("ix_sync_jobs_next_poll", "next_poll_at"),
+    )
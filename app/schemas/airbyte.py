@@ -40,8 +40,9 @@ class SyncTriggerResponse(BaseModel):
 
 class SyncStatusResponse(BaseModel):
     """Statut d'une synchronisation"""
-    job_id: str
+    job_id: Optional[str] = None  # None : aucun job suivi, statut lu sur la connexion
     status: str  # pending, running, succeeded, failed, cancelled
+    last_sync_at: Optional[datetime] = None
     created_at: Optional[datetime] = None
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
@@ -44,15 +44,19 @@ class SyncJobHistoryItem(BaseModel):
     job_id: str
     status: SyncStatus
     rows_synced: int = 0
+    bytes_synced: int = 0
     duration: Optional[str] = None
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
 
 
 class SyncHistoryResponse(BaseModel):
-    """Historique complet des synchronisations"""
+    """Historique paginé des synchronisations"""
     connection_id: str
     total_jobs: int
+    page: int = 1
+    limit: int
+    pages: int
     jobs: List[SyncJobHistoryItem]
     last_successful_sync: Optional[datetime] = None
 
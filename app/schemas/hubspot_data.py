@@ -1,9 +1,11 @@
 """
 Schemas Pydantic pour les données HubSpot synchronisées via Airbyte
 """
-from datetime import datetime
-from typing import Optional, List, Dict, Any, Generic, TypeVar
-from pydantic import BaseModel, Field
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Generic, Tuple, Type, TypeVar
+from enum import Enum
+from pydantic import BaseModel, Field, create_model
 
 # TypeVar pour la pagination générique
 T = TypeVar("T")
@@ -127,6 +129,49 @@ class AvailableColumns(BaseModel):
     total_columns: int
 
 
+# Types Python correspondant aux types SQL des colonnes Airbyte
+SQL_PYTHON_TYPES: Dict[str, Any] = {
+    "character varying": str,
+    "text": str,
+    "integer": int,
+    "bigint": int,
+    "numeric": float,
+    "double precision": float,
+    "real": float,
+    "boolean": bool,
+    "timestamp with time zone": datetime,
+    "timestamp without time zone": datetime,
+    "date": date,
+    "jsonb": Any,
+    "json": Any,
+}
+
+
+@lru_cache(maxsize=512)
+def build_projection_model(
+    object_type: str,
+    columns: Tuple[Tuple[str, str], ...]
+) -> Type[BaseModel]:
+    """
+    Construit (et met en cache) un modèle limité aux colonnes demandées
+    
+    Args:
+        object_type: contacts, companies, deals
+        columns: ((nom de colonne, type SQL), ...)
+    
+    Les noms de colonnes sont conservés en alias (pydantic interdit les
+    noms de champ commençant par "_", ex: _airbyte_extracted_at).
+    """
+    fields = {
+        column_name.lstrip("_"): (
+            Optional[SQL_PYTHON_TYPES.get(data_type, Any)],
+            Field(None, alias=column_name)
+        )
+        for column_name, data_type in columns
+    }
+    return create_model(f"{object_type.title()}Projection", **fields)
+
+
 # ═══════════════════════════════════════════════════════════════
 # 3. PRÉFÉRENCES UTILISATEUR POUR LES COLONNES
 # ═══════════════════════════════════════════════════════════════
@@ -161,6 +206,8 @@ class PaginatedResponse(BaseModel, Generic[T]):
     limit: int
     pages: int
     items: List[T]
+    total_is_exact: bool = True  # False si `total` est une estimation Postgres
+    next_cursor: Optional[str] = None  # Curseur à passer pour obtenir la page suivante
 
 
 class ContactsListResponse(BaseModel):
@@ -194,9 +241,16 @@ class DealsListResponse(BaseModel):
 # 5. FILTRES ET PARAMÈTRES DE RECHERCHE
 # ═══════════════════════════════════════════════════════════════
 
+class SearchMode(str, Enum):
+    """Mode de recherche textuelle"""
+    TRIGRAM = "trigram"  # Sous-chaîne + similarité (index pg_trgm), classé par pertinence
+    ILIKE = "ilike"  # ILIKE '%terme%' historique, trié par date d'extraction
+
+
 class ContactFilters(BaseModel):
     """Filtres pour la recherche de contacts"""
     search: Optional[str] = None  # Recherche dans email, nom, prénom
+    search_mode: SearchMode = SearchMode.ILIKE
     lifecyclestage: Optional[str] = None
     country: Optional[str] = None
     city: Optional[str] = None
@@ -208,6 +262,7 @@ class ContactFilters(BaseModel):
 class CompanyFilters(BaseModel):
     """Filtres pour la recherche de companies"""
     search: Optional[str] = None  # Recherche dans name, domain
+    search_mode: SearchMode = SearchMode.ILIKE
     industry: Optional[str] = None
     country: Optional[str] = None
     city: Optional[str] = None
@@ -221,6 +276,7 @@ class CompanyFilters(BaseModel):
 class DealFilters(BaseModel):
     """Filtres pour la recherche de deals"""
     search: Optional[str] = None  # Recherche dans dealname
+    search_mode: SearchMode = SearchMode.ILIKE
     dealstage: Optional[str] = None
     pipeline: Optional[str] = None
     hubspot_owner_id: Optional[str] = None
@@ -251,10 +307,38 @@ class HubspotStats(BaseModel):
     total_deal_amount: float = 0
     won_deal_amount: float = 0
     pipeline_value: float = 0
+    
+    # Durée des requêtes de calcul par table (ms)
+    query_timings_ms: Dict[str, float] = {}
+
+
+class HubspotStatsResponse(HubspotStats):
+    """Statistiques servies depuis le snapshot calculé après chaque sync"""
+    snapshot_at: Optional[datetime] = None  # Date du calcul des statistiques
+
+
+# ═══════════════════════════════════════════════════════════════
+# 7. INDEX DES TABLES
+# ═══════════════════════════════════════════════════════════════
+
+class TenantIndex(BaseModel):
+    """Index existant sur une table du schéma utilisateur"""
+    table_name: str
+    index_name: str
+    definition: str
+    is_valid: bool
+    is_declared: bool  # Index géré par HubspotIndexService
+
+
+class TenantIndexesResponse(BaseModel):
+    """Index existants et index déclarés manquants d'un schéma"""
+    schema_name: str
+    indexes: List[TenantIndex]
+    missing_indexes: List[str] = []
 
 
 # ═══════════════════════════════════════════════════════════════
-# 7. RÉPONSES D'ERREUR ET SUCCESS
+# 8. RÉPONSES D'ERREUR ET SUCCESS
 # ═══════════════════════════════════════════════════════════════
 
 class ErrorResponse(BaseModel):
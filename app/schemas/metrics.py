@@ -0,0 +1,41 @@
+"""
+Schemas Pydantic pour les métriques d'exploitation
+"""
+from typing import Dict, Optional
+
+from pydantic import BaseModel, Field
+
+
+class TimingSummary(BaseModel):
+    """Durées d'une opération sur la fenêtre récente"""
+    count: int = Field(..., description="Nombre total de mesures depuis le démarrage")
+    avg_ms: float
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+
+
+class PoolStatus(BaseModel):
+    """Occupation instantanée d'un pool de connexions"""
+    size: int
+    max_overflow: int
+    checked_out: int = Field(..., description="Connexions actuellement empruntées")
+    checked_in: int = Field(..., description="Connexions libres dans le pool")
+    overflow: int = Field(..., description="Connexions ouvertes au-delà de size")
+    utilization: float = Field(..., description="checked_out / (size + max_overflow)")
+
+
+class HttpClientStatus(BaseModel):
+    """État du pool de connexions d'un client HTTP sortant"""
+    requests: int = Field(..., description="Requêtes envoyées depuis le démarrage")
+    max_connections: int
+    http2: bool
+    open_connections: Optional[int] = None
+    idle_connections: Optional[int] = Field(None, description="Connexions keep-alive réutilisables")
+
+
+class MetricsResponse(BaseModel):
+    """Métriques du worker qui répond (un processus par worker uvicorn)"""
+    pools: Dict[str, PoolStatus]
+    http_clients: Dict[str, HttpClientStatus]
+    timings: Dict[str, TimingSummary]
@@ -1,7 +1,9 @@
 """Service pour gérer Airbyte via son API"""
+import asyncio
 import httpx
 import logging
-from typing import Dict, Optional
+import time
+from typing import Awaitable, Dict, List, Optional, TypeVar
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from datetime import datetime
@@ -11,22 +13,50 @@ from app.core.airbyte_config import (
     HUBSPOT_SOURCE_DEFINITION_ID,
     POSTGRES_DESTINATION_DEFINITION_ID
 )
+from app.core.http_clients import http_clients
+from app.core.metrics import record_timing
+from app.core.rate_limit import TokenBucket
 from app.models.airbyte import AirbyteConnection
 from app.crud import airbyte as airbyte_crud
+from app.crud import sync_job as sync_job_crud
 from app.schemas.airbyte import AirbyteConnectionCreate
+from app.services.sync_events import notify_job_event
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Création de source / destination / connexion : Airbyte teste la connexion
+CREATE_TIMEOUT_SECONDS = 60.0
+
 
 class AirbyteService:
     """Service pour interagir avec l'API Airbyte"""
 
-    def __init__(self, db: Session, user_id: int):
+    def __init__(
+        self,
+        db: Session,
+        user_id: int,
+        client: Optional[httpx.AsyncClient] = None,
+        rate_limiter: Optional[TokenBucket] = None
+    ):
         self.db = db
         self.user_id = user_id
-        self.base_url = airbyte_settings.AIRBYTE_API_URL
-        self.auth = (airbyte_settings.AIRBYTE_EMAIL, airbyte_settings.AIRBYTE_PASSWORD)
         self.workspace_id = airbyte_settings.AIRBYTE_WORKSPACE_ID
+        # Client partagé (base_url et authentification de l'API Airbyte)
+        self.client = client or http_clients.get("airbyte")
+        # Débit partagé entre services (opérations en masse)
+        self.rate_limiter = rate_limiter
+
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Appelle l'API Airbyte via le pool de connexions partagé"""
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+        start = time.perf_counter()
+        try:
+            return await self.client.request(method, path, **kwargs)
+        finally:
+            record_timing("http.airbyte", (time.perf_counter() - start) * 1000)
 
     async def create_hubspot_source(self, refresh_token: str) -> Optional[str]:
         """Créer une source HubSpot dans Airbyte"""
@@ -46,20 +76,20 @@ class AirbyteService:
                 }
             }
 
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/sources",
-                    auth=self.auth,
-                    json=source_config
-                )
+            response = await self._request(
+                "POST",
+                "/sources",
+                timeout=CREATE_TIMEOUT_SECONDS,
+                json=source_config
+            )
 
-                if response.status_code != 200:
-                    logger.error(f"Error creating HubSpot source: {response.status_code} - {response.text}")
-                    return None
+            if response.status_code != 200:
+                logger.error(f"Error creating HubSpot source: {response.status_code} - {response.text}")
+                return None
 
-                source_id = response.json().get("sourceId")
-                logger.info(f"Created HubSpot source: {source_id} for user {self.user_id}")
-                return source_id
+            source_id = response.json().get("sourceId")
+            logger.info(f"Created HubSpot source: {source_id} for user {self.user_id}")
+            return source_id
 
         except Exception as e:
             logger.error(f"Error creating HubSpot source: {e}")
@@ -84,20 +114,20 @@ class AirbyteService:
                 }
             }
 
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/destinations",
-                    auth=self.auth,
-                    json=dest_config
-                )
+            response = await self._request(
+                "POST",
+                "/destinations",
+                timeout=CREATE_TIMEOUT_SECONDS,
+                json=dest_config
+            )
 
-                if response.status_code != 200:
-                    logger.error(f"Error creating Postgres destination: {response.status_code} - {response.text}")
-                    return None
+            if response.status_code != 200:
+                logger.error(f"Error creating Postgres destination: {response.status_code} - {response.text}")
+                return None
 
-                destination_id = response.json().get("destinationId")
-                logger.info(f"Created Postgres destination: {destination_id} for user {self.user_id}")
-                return destination_id
+            destination_id = response.json().get("destinationId")
+            logger.info(f"Created Postgres destination: {destination_id} for user {self.user_id}")
+            return destination_id
 
         except Exception as e:
             logger.error(f"Error creating Postgres destination: {e}")
@@ -118,20 +148,20 @@ class AirbyteService:
                 "nonBreakingSchemaUpdatesBehavior": "ignore"
             }
 
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/connections",
-                    auth=self.auth,
-                    json=connection_config
-                )
+            response = await self._request(
+                "POST",
+                "/connections",
+                timeout=CREATE_TIMEOUT_SECONDS,
+                json=connection_config
+            )
 
-                if response.status_code != 200:
-                    logger.error(f"Error creating connection: {response.status_code} - {response.text}")
-                    return None
+            if response.status_code != 200:
+                logger.error(f"Error creating connection: {response.status_code} - {response.text}")
+                return None
 
-                connection_id = response.json().get("connectionId")
-                logger.info(f"Created connection: {connection_id} for user {self.user_id}")
-                return connection_id
+            connection_id = response.json().get("connectionId")
+            logger.info(f"Created connection: {connection_id} for user {self.user_id}")
+            return connection_id
 
         except Exception as e:
             logger.error(f"Error creating connection: {e}")
@@ -140,25 +170,25 @@ class AirbyteService:
     async def trigger_sync(self, connection_id: str) -> Optional[str]:
         """Déclencher une synchronisation manuelle"""
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/jobs",
-                    auth=self.auth,
-                    json={
-                        "connectionId": connection_id,
-                        "jobType": "sync"
-                    }
-                )
+            response = await self._request(
+                "POST",
+                "/jobs",
+                json={
+                    "connectionId": connection_id,
+                    "jobType": "sync"
+                }
+            )
 
-                if response.status_code != 200:
-                    logger.error(f"Error triggering sync: {response.status_code} - {response.text}")
-                    return None
+            if response.status_code != 200:
+                logger.error(f"Error triggering sync: {response.status_code} - {response.text}")
+                return None
 
-                job_id = response.json().get("jobId")
-                logger.info(f"Triggered sync job: {job_id} for connection {connection_id}")
+            job_data = response.json()
+            job_id = str(job_data.get("jobId"))
+            logger.info(f"Triggered sync job: {job_id} for connection {connection_id}")
 
-                airbyte_crud.update_sync_status(self.db, self.user_id, "running", job_id)
-                return job_id
+            await asyncio.to_thread(self._track_job, connection_id, job_id, job_data.get("status"))
+            return job_id
 
         except Exception as e:
             logger.error(f"Error triggering sync: {e}")
@@ -167,44 +197,74 @@ class AirbyteService:
     async def get_sync_status(self, job_id: str) -> Optional[Dict]:
         """Récupérer le statut d'une synchronisation"""
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(
-                    f"{self.base_url}/jobs/{job_id}",
-                    auth=self.auth
-                )
+            response = await self._request("GET", f"/jobs/{job_id}")
 
-                if response.status_code != 200:
-                    logger.error(f"Error fetching sync status: {response.status_code}")
-                    return None
+            if response.status_code != 200:
+                logger.error(f"Error fetching sync status: {response.status_code}")
+                return None
 
-                return response.json()
+            return response.json()
 
         except Exception as e:
             logger.error(f"Error fetching sync status: {e}")
             return None
 
-    async def setup_user_connection(self, refresh_token: str) -> Optional[AirbyteConnection]:
-        """Configuration complète Airbyte pour un nouvel utilisateur"""
+    async def _timed_step(self, step: str, coro: Awaitable[T]) -> T:
+        """Exécute une étape du provisioning en mesurant sa durée"""
+        start = time.perf_counter()
+        try:
+            return await coro
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            record_timing(f"airbyte.provision.{step}", elapsed_ms)
+            logger.info(f"Provisioning step {step} for user {self.user_id} took {elapsed_ms:.0f}ms")
+
+    async def _delete_resource(self, kind: str, resource_id: Optional[str]) -> None:
+        """Supprime une ressource Airbyte (rollback ou remplacement), sans lever d'erreur"""
+        if not resource_id:
+            return
         try:
-            existing_connection = airbyte_crud.get_connection_by_user_id(self.db, self.user_id)
-            if existing_connection:
-                logger.info(f"User {self.user_id} already has an Airbyte connection")
-                return existing_connection
+            response = await self._request("DELETE", f"/{kind}/{resource_id}")
+            if response.status_code >= 400 and response.status_code != 404:
+                logger.error(f"Error deleting {kind} {resource_id}: {response.status_code} - {response.text}")
+            else:
+                logger.info(f"Deleted {kind} {resource_id} for user {self.user_id}")
+        except Exception as e:
+            logger.error(f"Error deleting {kind} {resource_id}: {e}")
+
+    async def setup_user_connection(self, refresh_token: str) -> Optional[AirbyteConnection]:
+        """
+        Configuration complète Airbyte pour un nouvel utilisateur
+
+        La source et la destination, indépendantes, sont créées en parallèle ;
+        la connexion est créée une fois les deux disponibles. En cas d'échec,
+        les ressources déjà créées sont supprimées. La durée de chaque étape
+        est enregistrée (métriques airbyte.provision.*).
+        """
+        existing_connection = airbyte_crud.get_connection_by_user_id(self.db, self.user_id)
+        if existing_connection:
+            logger.info(f"User {self.user_id} already has an Airbyte connection")
+            return existing_connection
 
-            schema_name = f"user_{self.user_id}_hubspot"
+        schema_name = f"user_{self.user_id}_hubspot"
+        source_id = destination_id = connection_id = None
+        start = time.perf_counter()
 
-            logger.info(f"Creating HubSpot source for user {self.user_id}...")
-            source_id = await self.create_hubspot_source(refresh_token)
+        try:
+            logger.info(f"Creating HubSpot source and PostgreSQL destination for user {self.user_id}...")
+            source_id, destination_id = await asyncio.gather(
+                self._timed_step("source", self.create_hubspot_source(refresh_token)),
+                self._timed_step("destination", self.create_postgres_destination(schema_name))
+            )
             if not source_id:
                 raise ValueError("Failed to create HubSpot source")
-
-            logger.info(f"Creating PostgreSQL destination for user {self.user_id}...")
-            destination_id = await self.create_postgres_destination(schema_name)
             if not destination_id:
                 raise ValueError("Failed to create PostgreSQL destination")
 
             logger.info(f"Creating connection for user {self.user_id}...")
-            connection_id = await self.create_connection(source_id, destination_id, schema_name)
+            connection_id = await self._timed_step(
+                "connection", self.create_connection(source_id, destination_id, schema_name)
+            )
             if not connection_id:
                 raise ValueError("Failed to create connection")
 
@@ -221,18 +281,109 @@ class AirbyteService:
             airbyte_conn = airbyte_crud.create_connection(self.db, connection_data)
             logger.info(f"Saved Airbyte connection to database for user {self.user_id}")
 
-            logger.info(f"Triggering initial sync for user {self.user_id}...")
-            job_id = await self.trigger_sync(connection_id)
-
-            if job_id:
-                logger.info(f"Initial sync started with job_id: {job_id}")
-
-            return airbyte_conn
-
         except Exception as e:
             logger.error(f"Error setting up user connection: {e}")
+            self.db.rollback()
+            # La connexion référence la source et la destination : supprimée en premier
+            await self._delete_resource("connections", connection_id)
+            await asyncio.gather(
+                self._delete_resource("sources", source_id),
+                self._delete_resource("destinations", destination_id)
+            )
+            record_timing("airbyte.provision.failed", (time.perf_counter() - start) * 1000)
             return None
 
+        record_timing("airbyte.provision.total", (time.perf_counter() - start) * 1000)
+
+        logger.info(f"Triggering initial sync for user {self.user_id}...")
+        job_id = await self._timed_step("initial_sync", self.trigger_sync(connection_id))
+
+        if job_id:
+            logger.info(f"Initial sync started with job_id: {job_id}")
+
+        return airbyte_conn
+
+    async def reprovision_user_connection(self, refresh_token: Optional[str] = None) -> AirbyteConnection:
+        """
+        Recrée les ressources Airbyte d'un utilisateur existant
+
+        Sans `refresh_token`, seule la destination est recréée (rotation des
+        identifiants PostgreSQL) avec une nouvelle connexion vers la source
+        existante. Avec `refresh_token`, la source est aussi recréée, dans le
+        workspace configuré (rotation de workspace).
+
+        Les nouvelles ressources sont enregistrées avant la suppression des
+        anciennes : en cas d'échec, les ressources créées sont supprimées et
+        la connexion existante reste inchangée. Le statut de la connexion
+        (active, inactive...) est conservé.
+
+        Raises:
+            ValueError: connexion absente ou étape de provisioning en échec
+        """
+        connection = airbyte_crud.get_connection_by_user_id(self.db, self.user_id)
+        if not connection:
+            raise ValueError(f"No Airbyte connection found for user {self.user_id}")
+        if not refresh_token and connection.workspace_id != self.workspace_id:
+            raise ValueError(
+                f"Connection is in workspace {connection.workspace_id}, "
+                "full re-provisioning (new source) required"
+            )
+
+        schema_name = connection.schema_name
+        old_source_id = connection.source_id
+        old_destination_id = connection.destination_id
+        old_connection_id = connection.connection_id
+        source_id = destination_id = connection_id = None
+
+        try:
+            if refresh_token:
+                source_id, destination_id = await asyncio.gather(
+                    self._timed_step("source", self.create_hubspot_source(refresh_token)),
+                    self._timed_step("destination", self.create_postgres_destination(schema_name))
+                )
+                if not source_id:
+                    raise ValueError("Failed to create HubSpot source")
+            else:
+                destination_id = await self._timed_step(
+                    "destination", self.create_postgres_destination(schema_name)
+                )
+            if not destination_id:
+                raise ValueError("Failed to create PostgreSQL destination")
+
+            connection_id = await self._timed_step(
+                "connection", self.create_connection(source_id or old_source_id, destination_id, schema_name)
+            )
+            if not connection_id:
+                raise ValueError("Failed to create connection")
+
+            connection = airbyte_crud.update_resources(
+                self.db,
+                self.user_id,
+                workspace_id=self.workspace_id,
+                source_id=source_id or old_source_id,
+                destination_id=destination_id,
+                connection_id=connection_id
+            )
+
+        except Exception:
+            self.db.rollback()
+            await self._delete_resource("connections", connection_id)
+            await asyncio.gather(
+                self._delete_resource("sources", source_id),
+                self._delete_resource("destinations", destination_id)
+            )
+            raise
+
+        logger.info(f"Re-provisioned Airbyte connection for user {self.user_id}: {old_connection_id} -> {connection_id}")
+
+        # Anciennes ressources : la connexion d'abord (elle référence les deux autres)
+        await self._delete_resource("connections", old_connection_id)
+        await asyncio.gather(
+            self._delete_resource("destinations", old_destination_id),
+            self._delete_resource("sources", old_source_id if source_id else None)
+        )
+        return connection
+
     async def delete_user_connection(self) -> bool:
         """Supprimer toutes les ressources Airbyte d'un utilisateur"""
         try:
@@ -241,18 +392,17 @@ class AirbyteService:
                 logger.warning(f"No Airbyte connection found for user {self.user_id}")
                 return True
 
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                if connection.connection_id:
-                    await client.delete(f"{self.base_url}/connections/{connection.connection_id}", auth=self.auth)
-                    logger.info(f"Deleted connection {connection.connection_id}")
+            if connection.connection_id:
+                await self._request("DELETE", f"/connections/{connection.connection_id}")
+                logger.info(f"Deleted connection {connection.connection_id}")
 
-                if connection.source_id:
-                    await client.delete(f"{self.base_url}/sources/{connection.source_id}", auth=self.auth)
-                    logger.info(f"Deleted source {connection.source_id}")
+            if connection.source_id:
+                await self._request("DELETE", f"/sources/{connection.source_id}")
+                logger.info(f"Deleted source {connection.source_id}")
 
-                if connection.destination_id:
-                    await client.delete(f"{self.base_url}/destinations/{connection.destination_id}", auth=self.auth)
-                    logger.info(f"Deleted destination {connection.destination_id}")
+            if connection.destination_id:
+                await self._request("DELETE", f"/destinations/{connection.destination_id}")
+                logger.info(f"Deleted destination {connection.destination_id}")
 
             airbyte_crud.delete_connection(self.db, self.user_id)
             logger.info(f"Deleted Airbyte connection from database for user {self.user_id}")
@@ -284,138 +434,170 @@ class AirbyteService:
             connection_id = connection.connection_id
 
             # Déclencher le job via l'API Airbyte
-            url = f"{airbyte_settings.AIRBYTE_API_URL}/jobs"
             payload = {
                 "connectionId": connection_id,
                 "jobType": "sync"
             }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(url, json=payload, auth=self.auth, timeout=30.0)
-
-                if response.status_code == 200:
-                    job_data = response.json()
-                    logger.info(f"Sync triggered for user {self.user_id}: job_id={job_data.get('jobId')}")
-                    return {
-                        "job_id": str(job_data.get("jobId")),
-                        "connection_id": connection_id,
-                        "status": job_data.get("status", "pending"),
-                        "created_at": datetime.utcnow()
-                    }
-                else:
-                    logger.error(f"Failed to trigger sync: {response.status_code} - {response.text}")
-                    return None
+            response = await self._request("POST", "/jobs", json=payload)
+
+            if response.status_code == 200:
+                job_data = response.json()
+                logger.info(f"Sync triggered for user {self.user_id}: job_id={job_data.get('jobId')}")
+                await asyncio.to_thread(
+                    self._track_job, connection_id, str(job_data.get("jobId")), job_data.get("status")
+                )
+                return {
+                    "job_id": str(job_data.get("jobId")),
+                    "connection_id": connection_id,
+                    "status": job_data.get("status", "pending"),
+                    "created_at": datetime.utcnow()
+                }
+            else:
+                logger.error(f"Failed to trigger sync: {response.status_code} - {response.text}")
+                return None
 
         except Exception as e:
             logger.error(f"Error triggering sync for user {self.user_id}: {str(e)}")
             return None
 
-    async def get_job_status(self, job_id: str) -> Optional[dict]:
+    def get_job_status(self, job_id: str) -> Optional[dict]:
         """
         Récupère le statut d'un job de synchronisation
-        
+
+        Lu dans la table sync_jobs, tenue à jour par le tracker
+        (app.services.sync_job_tracker) : aucun appel à Airbyte, lecture
+        synchrone (endpoint def, exécuté dans le pool de threads).
+
         Args:
             job_id: ID du job Airbyte
-            
+
         Returns:
-            dict avec les détails du job ou None si erreur
+            dict avec les détails du job ou None si le job est inconnu
+        """
+        job = sync_job_crud.get_job(self.db, self.user_id, job_id)
+        if not job:
+            return None
+
+        return {
+            "job_id": job.job_id,
+            "connection_id": job.connection_id,
+            "status": job.status,
+            "rows_synced": job.rows_synced or 0,
+            "bytes_synced": job.bytes_synced or 0,
+            "duration": job.duration,
+            "created_at": job.created_at,
+            "started_at": job.started_at,
+            "completed_at": job.completed_at,
+            "error_message": job.error_message
+        }
+
+    def _track_job(self, connection_id: str, job_id: str, status: Optional[str]) -> None:
+        """Enregistre un job déclenché pour le suivi côté serveur (appelé dans un thread)"""
+        airbyte_crud.update_sync_status(self.db, self.user_id, "running", job_id)
+        job = sync_job_crud.create_job(
+            self.db,
+            self.user_id,
+            connection_id,
+            job_id,
+            status=(status or "pending").lower()
+        )
+        notify_job_event(self.db, job)
+
+    async def list_jobs(
+        self,
+        connection_id: str,
+        created_at_start: Optional[datetime] = None,
+        limit: int = 100,
+        offset: int = 0
+    ) -> Optional[List[dict]]:
         """
+        Liste les jobs de sync d'une connexion, les plus anciens d'abord
+
+        Args:
+            created_at_start: ne retourne que les jobs créés depuis cette date
+        """
+        params = {
+            "connectionId": connection_id,
+            "jobType": "sync",
+            "limit": limit,
+            "offset": offset,
+            "orderBy": "createdAt|ASC"
+        }
+        if created_at_start is not None:
+            params["createdAtStart"] = created_at_start.strftime("%Y-%m-%dT%H:%M:%SZ")
+
         try:
-            url = f"{airbyte_settings.AIRBYTE_API_URL}/jobs/{job_id}"
-
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, auth=self.auth, timeout=30.0)
-
-                if response.status_code == 200:
-                    job_data = response.json()
-                    return {
-                        "job_id": str(job_data.get("jobId")),
-                        "connection_id": job_data.get("connectionId"),
-                        "status": job_data.get("status"),
-                        "rows_synced": job_data.get("rowsSynced", 0),
-                        "bytes_synced": job_data.get("bytesSynced", 0),
-                        "duration": job_data.get("duration"),
-                        "created_at": job_data.get("createdAt"),
-                        "started_at": job_data.get("startedAt"),
-                        "completed_at": job_data.get("updatedAt"),
-                        "error_message": job_data.get("failureReason")
-                    }
-                else:
-                    logger.error(f"Failed to get job status: {response.status_code}")
-                    return None
+            response = await self._request("GET", "/jobs", params=params)
+            if response.status_code != 200:
+                logger.error(f"Failed to list jobs: {response.status_code}")
+                return None
+            return response.json().get("data", [])
 
         except Exception as e:
-            logger.error(f"Error getting job status {job_id}: {str(e)}")
+            logger.error(f"Error listing jobs for connection {connection_id}: {str(e)}")
             return None
 
-    async def get_sync_history(self, limit: int = 10) -> Optional[dict]:
+    async def get_sync_history(self, page: int = 1, limit: int = 10) -> Optional[dict]:
         """
         Récupère l'historique des synchronisations pour l'utilisateur
-        
+
+        Servi depuis la table sync_jobs : seuls les jobs plus récents que le
+        dernier job terminé sont importés depuis Airbyte (import incrémental,
+        au plus une fois par SYNC_HISTORY_REFRESH_SECONDS). Les accès
+        psycopg2 passent par un thread.
+
         Args:
-            limit: Nombre de jobs à récupérer (par défaut 10)
-            
+            page: Numéro de page (à partir de 1)
+            limit: Nombre de jobs par page
+
         Returns:
-            dict avec la liste des jobs et stats ou None si erreur
+            dict avec la page de jobs et stats ou None si erreur
         """
+        # Import local : le tracker dépend de ce service
+        from app.services.sync_job_tracker import import_job_history
+
         try:
-            # Récupérer la connexion depuis la DB
-            connection = airbyte_crud.get_connection_by_user_id(self.db, self.user_id)
-            
+            connection = await asyncio.to_thread(airbyte_crud.get_connection_by_user_id, self.db, self.user_id)
+
             if not connection or not connection.connection_id:
                 logger.error(f"No Airbyte connection found for user {self.user_id}")
                 return None
-            
-            connection_id = connection.connection_id
-
-            # Récupérer l'historique via l'API Airbyte
-            url = f"{airbyte_settings.AIRBYTE_API_URL}/jobs"
-            params = {
-                "connectionId": connection_id,
-                "limit": limit,
-                "orderBy": "createdAt|DESC"
-            }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, auth=self.auth, params=params, timeout=30.0)
-
-                if response.status_code == 200:
-                    data = response.json()
-                    jobs = data.get("data", [])
-
-                    # Formater les jobs
-                    formatted_jobs = []
-                    last_successful_sync = None
-
-                    for job in jobs:
-                        job_item = {
-                            "job_id": str(job.get("jobId")),
-                            "status": job.get("status"),
-                            "rows_synced": job.get("rowsSynced", 0),
-                            "duration": job.get("duration"),
-                            "started_at": job.get("startedAt"),
-                            "completed_at": job.get("updatedAt")
-                        }
-                        formatted_jobs.append(job_item)
-
-                        # Trouver le dernier sync réussi
-                        if job.get("status") == "succeeded" and not last_successful_sync:
-                            last_successful_sync = job.get("updatedAt")
-
-                    return {
-                        "connection_id": connection_id,
-                        "total_jobs": len(formatted_jobs),
-                        "jobs": formatted_jobs,
-                        "last_successful_sync": last_successful_sync
-                    }
-                else:
-                    logger.error(f"Failed to get sync history: {response.status_code}")
-                    return None
+            await import_job_history(self.db, self.user_id, connection.connection_id)
+            return await asyncio.to_thread(self._history_page, connection.connection_id, page, limit)
 
         except Exception as e:
             logger.error(f"Error getting sync history for user {self.user_id}: {str(e)}")
             return None
 
+    def _history_page(self, connection_id: str, page: int, limit: int) -> dict:
+        """Page de l'historique lue dans sync_jobs (appelé dans un thread)"""
+        total = sync_job_crud.count_jobs(self.db, self.user_id)
+        jobs = sync_job_crud.get_jobs(self.db, self.user_id, limit=limit, offset=(page - 1) * limit)
+        last_succeeded = sync_job_crud.get_last_succeeded_job(self.db, self.user_id)
+
+        return {
+            "connection_id": connection_id,
+            "total_jobs": total,
+            "page": page,
+            "limit": limit,
+            "pages": (total + limit - 1) // limit,
+            "jobs": [
+                {
+                    "job_id": job.job_id,
+                    "status": job.status,
+                    "rows_synced": job.rows_synced or 0,
+                    "bytes_synced": job.bytes_synced or 0,
+                    "duration": job.duration,
+                    "started_at": job.started_at,
+                    "completed_at": job.completed_at
+                }
+                for job in jobs
+            ],
+            "last_successful_sync": last_succeeded.completed_at if last_succeeded else None
+        }
+
     async def get_connection_info(self) -> Optional[dict]:
         """
         Récupère les informations de la connexion Airbyte de l'utilisateur
@@ -435,29 +617,27 @@ class AirbyteService:
             destination_id = connection.destination_id
 
             # Récupérer le statut via l'API Airbyte
-            url = f"{airbyte_settings.AIRBYTE_API_URL}/connections/{connection_id}"
-
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, auth=self.auth, timeout=30.0)
-
-                if response.status_code == 200:
-                    conn_data = response.json()
-                    return {
-                        "connection_id": connection_id,
-                        "source_id": source_id,
-                        "destination_id": destination_id,
-                        "status": conn_data.get("status", "unknown"),
-                        "name": conn_data.get("name", f"User {self.user_id} HubSpot Sync")
-                    }
-                else:
-                    # Si l'API échoue, retourner les infos de base
-                    return {
-                        "connection_id": connection_id,
-                        "source_id": source_id,
-                        "destination_id": destination_id,
-                        "status": "unknown",
-                        "name": f"User {self.user_id} HubSpot Sync"
-                    }
+
+            response = await self._request("GET", f"/connections/{connection_id}")
+
+            if response.status_code == 200:
+                conn_data = response.json()
+                return {
+                    "connection_id": connection_id,
+                    "source_id": source_id,
+                    "destination_id": destination_id,
+                    "status": conn_data.get("status", "unknown"),
+                    "name": conn_data.get("name", f"User {self.user_id} HubSpot Sync")
+                }
+            else:
+                # Si l'API échoue, retourner les infos de base
+                return {
+                    "connection_id": connection_id,
+                    "source_id": source_id,
+                    "destination_id": destination_id,
+                    "status": "unknown",
+                    "name": f"User {self.user_id} HubSpot Sync"
+                }
 
         except Exception as e:
             logger.error(f"Error getting connection info for user {self.user_id}: {str(e)}")
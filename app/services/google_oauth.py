@@ -1,8 +1,8 @@
 from google.oauth2 import id_token
 from google.auth.transport import requests
 from typing import Optional, Dict, Any
-import httpx
 from app.core.config import settings
+from app.core.http_clients import http_clients
 
 class GoogleOAuthService:
     def __init__(self):
@@ -37,21 +37,19 @@ class GoogleOAuthService:
             "redirect_uri": self.redirect_uri,
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(token_url, data=data)
-            if response.status_code == 200:
-                return response.json()
-            return None
+        response = await http_clients.get("google").post(token_url, data=data)
+        if response.status_code == 200:
+            return response.json()
+        return None
     
     async def get_user_info(self, access_token: str) -> Optional[Dict[str, Any]]:
         """Get user information from Google"""
         user_info_url = "https://www.googleapis.com/oauth2/v2/userinfo"
         headers = {"Authorization": f"Bearer {access_token}"}
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(user_info_url, headers=headers)
-            if response.status_code == 200:
-                return response.json()
-            return None
+        response = await http_clients.get("google").get(user_info_url, headers=headers)
+        if response.status_code == 200:
+            return response.json()
+        return None
 
 google_oauth_service = GoogleOAuthService()
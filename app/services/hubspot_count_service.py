@@ -0,0 +1,131 @@
+"""
+Stratégie de comptage des totaux pour les listes HubSpot paginées
+
+Un COUNT(*) exact sur un gros schéma user_{id}_hubspot coûte plus cher
+que la page elle-même. Selon la taille de la table :
+- petite table : COUNT(*) exact
+- grosse table sans filtre : estimation pg_class.reltuples
+- grosse table filtrée : estimation du planificateur (EXPLAIN)
+
+Les résultats sont mis en cache par (schéma, table, hash des filtres)
+et invalidés à la fin de chaque synchronisation Airbyte.
+"""
+import hashlib
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Cache process-wide : (schema_name, table_name, filter_hash) -> (total, is_exact)
+count_cache = TTLCache(
+    maxsize=settings.HUBSPOT_COUNT_CACHE_MAX_ENTRIES,
+    ttl=settings.HUBSPOT_COUNT_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_tenant_counts(schema_name: str) -> int:
+    """Supprime tous les totaux en cache d'un schéma utilisateur"""
+    removed = count_cache.invalidate(lambda key: key[0] == schema_name)
+    logger.info(f"Invalidated {removed} cached counts for {schema_name}")
+    return removed
+
+
+class HubspotCountService:
+    """Calcule le total d'une requête filtrée (exact ou estimé)"""
+
+    def __init__(self, db: Session, schema_name: str):
+        self.db = db
+        self.schema_name = schema_name
+        self.exact_threshold = settings.HUBSPOT_EXACT_COUNT_THRESHOLD
+
+    def count(
+        self,
+        table_name: str,
+        where_conditions: List[str],
+        params: Dict[str, Any]
+    ) -> Tuple[int, bool]:
+        """
+        Retourne le total de lignes correspondant aux filtres
+
+        Returns:
+            Tuple[int, bool]: (total, True si exact / False si estimé)
+        """
+        cache_key = (self.schema_name, table_name, self._filter_hash(where_conditions, params))
+        cached = count_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        where_clause = "WHERE " + " AND ".join(where_conditions) if where_conditions else ""
+        table_rows = self._estimated_table_rows(table_name)
+
+        if table_rows is None or table_rows < self.exact_threshold:
+            result = (self._exact_count(table_name, where_clause, params), True)
+        elif not where_conditions:
+            result = (table_rows, False)
+        else:
+            estimated_rows = self._explain_rows(table_name, where_clause, params)
+            if estimated_rows < self.exact_threshold:
+                result = (self._exact_count(table_name, where_clause, params), True)
+            else:
+                result = (estimated_rows, False)
+
+        count_cache.set(cache_key, result)
+        return result
+
+    def _filter_hash(self, where_conditions: List[str], params: Dict[str, Any]) -> str:
+        """Hash stable des conditions et de leurs paramètres"""
+        payload = json.dumps(
+            {"where": [" ".join(c.split()) for c in where_conditions], "params": params},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+    def _exact_count(self, table_name: str, where_clause: str, params: Dict[str, Any]) -> int:
+        query = text(f"""
+            SELECT COUNT(*)
+            FROM {self.schema_name}.{table_name}
+            {where_clause}
+        """)
+        return self.db.execute(query, params).scalar()
+
+    def _estimated_table_rows(self, table_name: str) -> Optional[int]:
+        """
+        Nombre de lignes estimé par les statistiques Postgres (pg_class.reltuples)
+
+        Retourne None si la table n'a jamais été analysée.
+        """
+        query = text("""
+            SELECT c.reltuples::bigint
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = :schema_name
+            AND c.relname = :table_name
+        """)
+        estimate = self.db.execute(
+            query,
+            {"schema_name": self.schema_name, "table_name": table_name}
+        ).scalar()
+        if estimate is None or estimate < 0:
+            return None
+        return int(estimate)
+
+    def _explain_rows(self, table_name: str, where_clause: str, params: Dict[str, Any]) -> int:
+        """Nombre de lignes estimé par le planificateur pour la requête filtrée"""
+        query = text(f"""
+            EXPLAIN (FORMAT JSON)
+            SELECT 1
+            FROM {self.schema_name}.{table_name}
+            {where_clause}
+        """)
+        plan = self.db.execute(query, params).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
@@ -2,12 +2,23 @@
 Service pour lire les données HubSpot synchronisées via Airbyte
 depuis les schémas PostgreSQL user_{id}_hubspot
 """
-from typing import List, Optional, Dict, Any, Tuple
-from sqlalchemy import text, inspect
+from typing import List, Optional, Dict, Any, Iterator, Tuple
+from sqlalchemy import DateTime, text, inspect
 from sqlalchemy.orm import Session
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import base64
+import json
 import logging
+import time
 
+from app.crud import airbyte as crud_airbyte
+from app.crud import hubspot_stats as crud_hubspot_stats
+from app.services.hubspot_count_service import HubspotCountService
+from app.services.hubspot_export_service import iter_copy_csv
+from app.services.hubspot_index_service import SEARCHABLE_COLUMNS, trigram_available
+from app.services.hubspot_query_cache import cached_read
+from app.services.tenant_metadata_cache import get_tenant_metadata
 from app.schemas.hubspot_data import (
     HubspotContactBase,
     HubspotContactDetail,
@@ -21,10 +32,54 @@ from app.schemas.hubspot_data import (
     CompanyFilters,
     DealFilters,
     HubspotStats,
+    HubspotStatsResponse,
+    SearchMode,
 )
 
 logger = logging.getLogger(__name__)
 
+# Alias des valeurs du curseur, renseignées pour la seule ligne qui sert de
+# curseur suivant et retirées des lignes renvoyées
+CURSOR_ALIASES = {
+    "extracted_at": "_cursor_extracted_at",
+    "id": "_cursor_id",
+    "rank": "_cursor_rank",
+}
+
+
+def encode_cursor(extracted_at: datetime, record_id: Any, rank: Optional[float] = None) -> str:
+    """
+    Encode la position (_airbyte_extracted_at, id) en curseur opaque
+
+    Pour une recherche classée, le score de la dernière ligne vue (`rank`)
+    fait aussi partie de la position.
+    """
+    position = [extracted_at.isoformat(), str(record_id)]
+    if rank is not None:
+        position.append(float(rank))
+    payload = json.dumps(position)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str, Optional[float]]:
+    """
+    Décode un curseur opaque en (_airbyte_extracted_at, id, score)
+
+    Le score est None pour un curseur de liste non classée.
+
+    Raises:
+        ValueError: si le curseur est invalide
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        extracted_at, record_id, *rank = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if len(rank) > 1:
+            raise ValueError(cursor)
+        rank = float(rank[0]) if rank else None
+        return datetime.fromisoformat(extracted_at), str(record_id), rank
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
 
 class HubspotDataService:
     """Service pour lire les données HubSpot depuis Airbyte"""
@@ -39,52 +94,243 @@ class HubspotDataService:
     # ═══════════════════════════════════════════════════════════════
     
     def schema_exists(self) -> bool:
-        """Vérifie si le schéma existe"""
-        query = text("""
-            SELECT EXISTS(
-                SELECT 1 FROM information_schema.schemata 
-                WHERE schema_name = :schema_name
-            )
-        """)
-        result = self.db.execute(query, {"schema_name": self.schema_name})
-        return result.scalar()
+        """Vérifie si le schéma existe (via le cache des métadonnées)"""
+        return get_tenant_metadata(self.db, self.schema_name).exists
     
     def get_table_columns(self, table_name: str) -> List[str]:
         """Récupère la liste des colonnes d'une table"""
-        query = text("""
-            SELECT column_name 
-            FROM information_schema.columns
-            WHERE table_schema = :schema_name 
-            AND table_name = :table_name
-            ORDER BY ordinal_position
-        """)
-        result = self.db.execute(
-            query, 
-            {"schema_name": self.schema_name, "table_name": table_name}
+        return get_tenant_metadata(self.db, self.schema_name).columns(table_name)
+    
+    def get_table_column_types(self, table_name: str) -> List[Tuple[str, str]]:
+        """Récupère les colonnes d'une table avec leur type SQL"""
+        return get_tenant_metadata(self.db, self.schema_name).tables.get(table_name, [])
+    
+    def get_data_marker(self, include_stats_snapshot: bool = False) -> str:
+        """
+        Marqueur qui change dès que les données du schéma peuvent changer
+        
+        Basé sur la dernière sync connue (AirbyteConnection.last_sync_at et
+        statut). Pendant une sync, ou sans connexion, Airbyte peut écrire à
+        tout moment : on se rabat sur MAX(_airbyte_extracted_at) des tables.
+        
+        Args:
+            include_stats_snapshot: ajoute la date du snapshot de
+                statistiques, recalculé après la sync (de façon différée)
+        """
+        parts = []
+        connection = crud_airbyte.get_connection_by_user_id(self.db, self.user_id)
+        if connection and connection.last_sync_at and connection.last_sync_status != "running":
+            parts.append(f"{connection.last_sync_status}@{connection.last_sync_at.isoformat()}")
+        else:
+            metadata = get_tenant_metadata(self.db, self.schema_name)
+            tables = [table for table in ("contacts", "companies", "deals") if table in metadata.tables]
+            if tables:
+                query = text("SELECT GREATEST({})".format(", ".join(
+                    f"(SELECT MAX(_airbyte_extracted_at) FROM {self.schema_name}.{table})"
+                    for table in tables
+                )))
+                latest = self.db.execute(query).scalar()
+                parts.append(f"extracted@{latest.isoformat() if latest else 'none'}")
+            else:
+                parts.append("no-data")
+        
+        if include_stats_snapshot:
+            snapshot = crud_hubspot_stats.get_snapshot(self.db, self.user_id)
+            parts.append(f"stats@{snapshot.computed_at.isoformat() if snapshot else 'none'}")
+        
+        return "|".join(parts)
+    
+    def _fetch_page(
+        self,
+        table_name: str,
+        select_columns: List[str],
+        where_conditions: List[str],
+        params: Dict[str, Any],
+        page: int,
+        limit: int,
+        cursor: Optional[str] = None,
+        rank_expression: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], int, bool, Optional[str]]:
+        """
+        Calcule le total et exécute la requête paginée d'une table du schéma
+        
+        Sans curseur, la pagination se fait par OFFSET. Avec un curseur,
+        la requête se positionne directement après la dernière ligne vue
+        via une comparaison (_airbyte_extracted_at, id) < (...), ce qui
+        évite de parcourir les pages précédentes.
+        
+        Si `rank_expression` est fourni (recherche classée par similarité),
+        les résultats sont triés par score décroissant ; le curseur porte
+        alors aussi le score de la dernière ligne et la comparaison devient
+        (score, _airbyte_extracted_at, id) < (...).
+        
+        Le total est exact ou estimé selon la taille de la table
+        (voir HubspotCountService).
+        
+        Returns:
+            Tuple[List[Dict], int, bool, Optional[str]]:
+                (données, total, total exact, curseur suivant)
+        """
+        # Total (sans la condition du curseur)
+        total, total_exact = HubspotCountService(self.db, self.schema_name).count(
+            table_name, where_conditions, params
         )
-        return [row[0] for row in result]
+        
+        page_conditions = list(where_conditions)
+        page_params = dict(params)
+        # Une ligne de plus pour savoir s'il existe une page suivante
+        page_params["limit"] = limit + 1
+        
+        if cursor:
+            cursor_extracted_at, cursor_id, cursor_rank = decode_cursor(cursor)
+            if (cursor_rank is None) != (rank_expression is None):
+                raise ValueError("Cursor does not match the search parameters")
+            if rank_expression:
+                # CAST : le score (real) est comparé à sa propre valeur, sans arrondi
+                page_conditions.append(
+                    f"({rank_expression}, _airbyte_extracted_at, id)"
+                    " < (CAST(:cursor_rank AS real), :cursor_extracted_at, :cursor_id)"
+                )
+                page_params["cursor_rank"] = cursor_rank
+            else:
+                page_conditions.append(
+                    "(_airbyte_extracted_at, id) < (:cursor_extracted_at, :cursor_id)"
+                )
+            page_params["cursor_extracted_at"] = cursor_extracted_at
+            page_params["cursor_id"] = cursor_id
+            pagination_clause = "LIMIT :limit"
+        else:
+            page_params["offset"] = (page - 1) * limit
+            pagination_clause = "LIMIT :limit OFFSET :offset"
+        
+        page_where_clause = "WHERE " + " AND ".join(page_conditions) if page_conditions else ""
+        
+        order_by = "_airbyte_extracted_at DESC, id DESC"
+        if rank_expression:
+            order_by = f"{rank_expression} DESC, {order_by}"
+        
+        # Les valeurs du curseur ne sont lues que pour la dernière ligne de la
+        # page (numérotée avant OFFSET) : la projection demandée (fields=)
+        # reste inchangée pour les autres lignes
+        page_params["cursor_row"] = page_params.get("offset", 0) + limit
+        cursor_values = {"extracted_at": "_airbyte_extracted_at", "id": "id"}
+        if rank_expression:
+            cursor_values["rank"] = rank_expression
+        select_columns = list(select_columns) + [
+            f"CASE WHEN row_number() OVER page_order = :cursor_row THEN {expression} END"
+            f" AS {CURSOR_ALIASES[key]}"
+            for key, expression in cursor_values.items()
+        ]
+        
+        # Requête SELECT
+        select_query = text(f"""
+            SELECT {", ".join(select_columns)}
+            FROM {self.schema_name}.{table_name} 
+            {page_where_clause}
+            WINDOW page_order AS (ORDER BY {order_by})
+            ORDER BY {order_by}
+            {pagination_clause}
+        """).columns(**{CURSOR_ALIASES["extracted_at"]: DateTime()})
+        
+        result = self.db.execute(select_query, page_params)
+        rows = [dict(row._mapping) for row in result]
+        cursors = [
+            {key: row.pop(alias, None) for key, alias in CURSOR_ALIASES.items()}
+            for row in rows
+        ]
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = cursors[limit - 1]
+            next_cursor = encode_cursor(last["extracted_at"], last["id"], last["rank"])
+        
+        return rows, total, total_exact, next_cursor
+    
+    def _add_search_condition(
+        self,
+        table_name: str,
+        search: str,
+        search_mode: SearchMode,
+        where_conditions: List[str],
+        params: Dict[str, Any]
+    ) -> Optional[str]:
+        """
+        Ajoute la condition de recherche textuelle sur les colonnes cherchables
+        
+        En mode trigram (si pg_trgm est installé), la recherche combine
+        sous-chaîne (ILIKE) et similarité de mots (<%), toutes deux servies
+        par les index GIN gin_trgm_ops. En mode ilike, le comportement
+        historique (ILIKE '%terme%') est conservé.
+        
+        Returns:
+            L'expression de score à utiliser pour le tri, ou None en mode ilike
+        """
+        columns = SEARCHABLE_COLUMNS[table_name]
+        params["search"] = f"%{search}%"
+        
+        if search_mode == SearchMode.TRIGRAM and trigram_available(self.db):
+            params["search_term"] = search
+            where_conditions.append("(" + " OR ".join(
+                f"{column} ILIKE :search OR :search_term <% {column}" for column in columns
+            ) + ")")
+            return "GREATEST(" + ", ".join(
+                f"word_similarity(:search_term, COALESCE({column}, ''))" for column in columns
+            ) + ")"
+        
+        where_conditions.append("(" + " OR ".join(
+            f"{column} ILIKE :search" for column in columns
+        ) + ")")
+        return None
     
     # ═══════════════════════════════════════════════════════════════
     # 2. CONTACTS
     # ═══════════════════════════════════════════════════════════════
     
+    @cached_read
     def get_contacts(
         self, 
         page: int = 1, 
         limit: int = 50,
         filters: Optional[ContactFilters] = None,
-        columns: Optional[List[str]] = None
-    ) -> Tuple[List[Dict[str, Any]], int]:
+        columns: Optional[List[str]] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], int, bool, Optional[str]]:
         """
         Récupère la liste des contacts avec pagination et filtres
         
+        Args:
+            cursor: curseur opaque renvoyé par la page précédente (next_cursor).
+                Si fourni, `page` est ignoré.
+        
         Returns:
-            Tuple[List[Dict], int]: (données, total)
+            Tuple[List[Dict], int, bool, Optional[str]]:
+                (données, total, total exact, curseur suivant)
         """
         if not self.schema_exists():
             logger.warning(f"Schema {self.schema_name} does not exist")
-            return [], 0
+            return [], 0, True, None
+        
+        select_columns, where_conditions, params, rank_expression = self._build_contacts_query(
+            filters, columns
+        )
+        
+        return self._fetch_page(
+            "contacts", select_columns, where_conditions, params, page, limit, cursor,
+            rank_expression=rank_expression
+        )
+    
+    def _build_contacts_query(
+        self,
+        filters: Optional[ContactFilters] = None,
+        columns: Optional[List[str]] = None
+    ) -> Tuple[List[str], List[str], Dict[str, Any], Optional[str]]:
+        """
+        Construit les colonnes et conditions de la requête des contacts
         
+        Returns:
+            Tuple: (colonnes, conditions WHERE, paramètres, expression de score)
+        """
         # Colonnes par défaut
         default_columns = [
             "id", "properties_email", "properties_firstname", "properties_lastname",
@@ -96,20 +342,17 @@ class HubspotDataService:
         
         # Utiliser les colonnes demandées ou les colonnes par défaut
         select_columns = columns if columns else default_columns
-        columns_str = ", ".join(select_columns)
         
         # Construction de la requête WHERE
         where_conditions = []
-        params = {"limit": limit, "offset": (page - 1) * limit}
+        params = {}
+        rank_expression = None
         
         if filters:
             if filters.search:
-                where_conditions.append("""
-                    (properties_email ILIKE :search 
-                    OR properties_firstname ILIKE :search 
-                    OR properties_lastname ILIKE :search)
-                """)
-                params["search"] = f"%{filters.search}%"
+                rank_expression = self._add_search_condition(
+                    "contacts", filters.search, filters.search_mode, where_conditions, params
+                )
             
             if filters.lifecyclestage:
                 where_conditions.append("properties_lifecyclestage = :lifecyclestage")
@@ -135,30 +378,9 @@ class HubspotDataService:
                 where_conditions.append("properties_createdate <= :created_before")
                 params["created_before"] = filters.created_before
         
-        where_clause = "WHERE " + " AND ".join(where_conditions) if where_conditions else ""
-        
-        # Requête COUNT
-        count_query = text(f"""
-            SELECT COUNT(*) 
-            FROM {self.schema_name}.contacts 
-            {where_clause}
-        """)
-        total = self.db.execute(count_query, params).scalar()
-        
-        # Requête SELECT
-        select_query = text(f"""
-            SELECT {columns_str}
-            FROM {self.schema_name}.contacts 
-            {where_clause}
-            ORDER BY _airbyte_extracted_at DESC
-            LIMIT :limit OFFSET :offset
-        """)
-        
-        result = self.db.execute(select_query, params)
-        rows = [dict(row._mapping) for row in result]
-        
-        return rows, total
+        return select_columns, where_conditions, params, rank_expression
     
+    @cached_read
     def get_contact_by_id(self, contact_id: str) -> Optional[Dict[str, Any]]:
         """Récupère un contact par son ID avec toutes les données"""
         if not self.schema_exists():
@@ -179,17 +401,39 @@ class HubspotDataService:
     # 3. COMPANIES
     # ═══════════════════════════════════════════════════════════════
     
+    @cached_read
     def get_companies(
         self, 
         page: int = 1, 
         limit: int = 50,
         filters: Optional[CompanyFilters] = None,
-        columns: Optional[List[str]] = None
-    ) -> Tuple[List[Dict[str, Any]], int]:
-        """Récupère la liste des companies avec pagination et filtres"""
+        columns: Optional[List[str]] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], int, bool, Optional[str]]:
+        """Récupère la liste des companies avec pagination (offset ou curseur) et filtres"""
         if not self.schema_exists():
-            return [], 0
+            return [], 0, True, None
+        
+        select_columns, where_conditions, params, rank_expression = self._build_companies_query(
+            filters, columns
+        )
+        
+        return self._fetch_page(
+            "companies", select_columns, where_conditions, params, page, limit, cursor,
+            rank_expression=rank_expression
+        )
+    
+    def _build_companies_query(
+        self,
+        filters: Optional[CompanyFilters] = None,
+        columns: Optional[List[str]] = None
+    ) -> Tuple[List[str], List[str], Dict[str, Any], Optional[str]]:
+        """
+        Construit les colonnes et conditions de la requête des companies
         
+        Returns:
+            Tuple: (colonnes, conditions WHERE, paramètres, expression de score)
+        """
         default_columns = [
             "id", "properties_name", "properties_domain", "properties_industry",
             "properties_numberofemployees", "properties_annualrevenue",
@@ -199,18 +443,16 @@ class HubspotDataService:
         ]
         
         select_columns = columns if columns else default_columns
-        columns_str = ", ".join(select_columns)
         
         where_conditions = []
-        params = {"limit": limit, "offset": (page - 1) * limit}
+        params = {}
+        rank_expression = None
         
         if filters:
             if filters.search:
-                where_conditions.append("""
-                    (properties_name ILIKE :search 
-                    OR properties_domain ILIKE :search)
-                """)
-                params["search"] = f"%{filters.search}%"
+                rank_expression = self._add_search_condition(
+                    "companies", filters.search, filters.search_mode, where_conditions, params
+                )
             
             if filters.industry:
                 where_conditions.append("properties_industry = :industry")
@@ -244,28 +486,9 @@ class HubspotDataService:
                 where_conditions.append("properties_createdate <= :created_before")
                 params["created_before"] = filters.created_before
         
-        where_clause = "WHERE " + " AND ".join(where_conditions) if where_conditions else ""
-        
-        count_query = text(f"""
-            SELECT COUNT(*) 
-            FROM {self.schema_name}.companies 
-            {where_clause}
-        """)
-        total = self.db.execute(count_query, params).scalar()
-        
-        select_query = text(f"""
-            SELECT {columns_str}
-            FROM {self.schema_name}.companies 
-            {where_clause}
-            ORDER BY _airbyte_extracted_at DESC
-            LIMIT :limit OFFSET :offset
-        """)
-        
-        result = self.db.execute(select_query, params)
-        rows = [dict(row._mapping) for row in result]
-        
-        return rows, total
+        return select_columns, where_conditions, params, rank_expression
     
+    @cached_read
     def get_company_by_id(self, company_id: str) -> Optional[Dict[str, Any]]:
         """Récupère une company par son ID avec toutes les données"""
         if not self.schema_exists():
@@ -286,17 +509,39 @@ class HubspotDataService:
     # 4. DEALS
     # ═══════════════════════════════════════════════════════════════
     
+    @cached_read
     def get_deals(
         self, 
         page: int = 1, 
         limit: int = 50,
         filters: Optional[DealFilters] = None,
-        columns: Optional[List[str]] = None
-    ) -> Tuple[List[Dict[str, Any]], int]:
-        """Récupère la liste des deals avec pagination et filtres"""
+        columns: Optional[List[str]] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], int, bool, Optional[str]]:
+        """Récupère la liste des deals avec pagination (offset ou curseur) et filtres"""
         if not self.schema_exists():
-            return [], 0
+            return [], 0, True, None
+        
+        select_columns, where_conditions, params, rank_expression = self._build_deals_query(
+            filters, columns
+        )
+        
+        return self._fetch_page(
+            "deals", select_columns, where_conditions, params, page, limit, cursor,
+            rank_expression=rank_expression
+        )
+    
+    def _build_deals_query(
+        self,
+        filters: Optional[DealFilters] = None,
+        columns: Optional[List[str]] = None
+    ) -> Tuple[List[str], List[str], Dict[str, Any], Optional[str]]:
+        """
+        Construit les colonnes et conditions de la requête des deals
         
+        Returns:
+            Tuple: (colonnes, conditions WHERE, paramètres, expression de score)
+        """
         default_columns = [
             "id", "properties_dealname", "properties_amount", "properties_dealstage",
             "properties_pipeline", "properties_closedate", "properties_createdate",
@@ -305,15 +550,16 @@ class HubspotDataService:
         ]
         
         select_columns = columns if columns else default_columns
-        columns_str = ", ".join(select_columns)
         
         where_conditions = []
-        params = {"limit": limit, "offset": (page - 1) * limit}
+        params = {}
+        rank_expression = None
         
         if filters:
             if filters.search:
-                where_conditions.append("properties_dealname ILIKE :search")
-                params["search"] = f"%{filters.search}%"
+                rank_expression = self._add_search_condition(
+                    "deals", filters.search, filters.search_mode, where_conditions, params
+                )
             
             if filters.dealstage:
                 where_conditions.append("properties_dealstage = :dealstage")
@@ -347,28 +593,9 @@ class HubspotDataService:
                 where_conditions.append("properties_createdate <= :created_before")
                 params["created_before"] = filters.created_before
         
-        where_clause = "WHERE " + " AND ".join(where_conditions) if where_conditions else ""
-        
-        count_query = text(f"""
-            SELECT COUNT(*) 
-            FROM {self.schema_name}.deals 
-            {where_clause}
-        """)
-        total = self.db.execute(count_query, params).scalar()
-        
-        select_query = text(f"""
-            SELECT {columns_str}
-            FROM {self.schema_name}.deals 
-            {where_clause}
-            ORDER BY _airbyte_extracted_at DESC
-            LIMIT :limit OFFSET :offset
-        """)
-        
-        result = self.db.execute(select_query, params)
-        rows = [dict(row._mapping) for row in result]
-        
-        return rows, total
+        return select_columns, where_conditions, params, rank_expression
     
+    @cached_read
     def get_deal_by_id(self, deal_id: str) -> Optional[Dict[str, Any]]:
         """Récupère un deal par son ID avec toutes les données"""
         if not self.schema_exists():
@@ -386,9 +613,96 @@ class HubspotDataService:
         return dict(row._mapping) if row else None
     
     # ═══════════════════════════════════════════════════════════════
-    # 5. MÉTADONNÉES DES COLONNES
+    # 5. EXPORT
     # ═══════════════════════════════════════════════════════════════
     
+    def build_export_query(
+        self,
+        object_type: str,
+        filters: Optional[Any] = None,
+        columns: Optional[List[str]] = None
+    ) -> Tuple[str, Dict[str, Any], List[str]]:
+        """
+        Construit la requête d'export complète (sans pagination)
+        
+        Mêmes colonnes, filtres et tri que get_contacts/get_companies/get_deals.
+        
+        Returns:
+            Tuple[str, Dict, List[str]]: (SQL, paramètres, colonnes exportées)
+        """
+        builders = {
+            "contacts": self._build_contacts_query,
+            "companies": self._build_companies_query,
+            "deals": self._build_deals_query,
+        }
+        select_columns, where_conditions, params, rank_expression = builders[object_type](
+            filters, columns
+        )
+        
+        where_clause = "WHERE " + " AND ".join(where_conditions) if where_conditions else ""
+        order_by = "_airbyte_extracted_at DESC, id DESC"
+        if rank_expression:
+            order_by = f"{rank_expression} DESC, {order_by}"
+        
+        query = f"""
+            SELECT {", ".join(select_columns)}
+            FROM {self.schema_name}.{object_type}
+            {where_clause}
+            ORDER BY {order_by}
+        """
+        return query, params, list(select_columns)
+    
+    def stream_rows(
+        self,
+        object_type: str,
+        filters: Optional[Any] = None,
+        columns: Optional[List[str]] = None,
+        batch_size: int = 2000
+    ) -> Tuple[List[str], Iterator[Dict[str, Any]]]:
+        """
+        Prépare un export ligne à ligne via un curseur serveur
+        
+        La requête est construite immédiatement, mais les lignes ne sont lues
+        qu'à l'itération, par lots de `batch_size`, sur une connexion dédiée :
+        la mémoire reste constante quel que soit le volume, et l'itération
+        peut se poursuivre après la fermeture de la session de la requête.
+        
+        Returns:
+            Tuple[List[str], Iterator[Dict]]: (colonnes exportées, lignes)
+        """
+        query, params, export_columns = self.build_export_query(object_type, filters, columns)
+        engine = self.db.get_bind()
+        
+        def iterate_rows() -> Iterator[Dict[str, Any]]:
+            with engine.connect() as conn:
+                result = conn.execution_options(
+                    stream_results=True, yield_per=batch_size
+                ).execute(text(query), params)
+                for row in result.mappings():
+                    yield dict(row)
+        
+        return export_columns, iterate_rows()
+    
+    def stream_copy_csv(
+        self,
+        object_type: str,
+        filters: Optional[Any] = None,
+        columns: Optional[List[str]] = None
+    ) -> Iterator[bytes]:
+        """
+        Prépare un export CSV produit par Postgres (COPY ... TO STDOUT)
+        
+        Mêmes filtres et colonnes que stream_rows, mais les chunks CSV sont
+        transmis tels quels, sans matérialiser de lignes Python.
+        """
+        query, params, _ = self.build_export_query(object_type, filters, columns)
+        return iter_copy_csv(self.db.get_bind(), query, params)
+    
+    # ═══════════════════════════════════════════════════════════════
+    # 6. MÉTADONNÉES DES COLONNES
+    # ═══════════════════════════════════════════════════════════════
+    
+    @cached_read
     def get_available_columns(self, object_type: str) -> AvailableColumns:
         """
         Récupère toutes les colonnes disponibles pour un type d'objet
@@ -422,23 +736,8 @@ class HubspotDataService:
         }
         
         # Récupérer les colonnes de la table
-        query = text("""
-            SELECT column_name, data_type
-            FROM information_schema.columns
-            WHERE table_schema = :schema_name 
-            AND table_name = :table_name
-            ORDER BY ordinal_position
-        """)
-        
-        result = self.db.execute(
-            query, 
-            {"schema_name": self.schema_name, "table_name": object_type}
-        )
-        
         all_columns = []
-        for row in result:
-            col_name = row[0]
-            col_type = row[1]
+        for col_name, col_type in self.get_table_column_types(object_type):
             
             # Ignorer les colonnes système Airbyte sauf _airbyte_extracted_at
             if col_name.startswith("_airbyte") and col_name != "_airbyte_extracted_at":
@@ -502,11 +801,48 @@ class HubspotDataService:
         return defaults.get(object_type, [])
     
     # ═══════════════════════════════════════════════════════════════
-    # 6. STATISTIQUES
+    # 7. STATISTIQUES
     # ═══════════════════════════════════════════════════════════════
     
-    def get_stats(self) -> HubspotStats:
-        """Récupère les statistiques globales HubSpot"""
+    def get_stats_snapshot(self) -> HubspotStatsResponse:
+        """
+        Récupère les statistiques depuis le snapshot (une seule lecture indexée)
+        
+        Le snapshot est recalculé à la fin de chaque sync ; s'il n'existe
+        pas encore, il est calculé et enregistré immédiatement.
+        """
+        snapshot = crud_hubspot_stats.get_snapshot(self.db, self.user_id)
+        if not snapshot:
+            snapshot = self.refresh_stats_snapshot()
+        
+        return HubspotStatsResponse(**snapshot.stats, snapshot_at=snapshot.computed_at)
+    
+    def refresh_stats_snapshot(self, unbounded: bool = False):
+        """
+        Recalcule les statistiques et remplace le snapshot
+        
+        Args:
+            unbounded: lève le statement_timeout des requêtes API pour les
+                agrégats (recalcul en tâche de fond après une sync, sur un
+                gros portail). Le calcul à la demande reste borné.
+        """
+        stats = self.get_stats(unbounded=unbounded)
+        return crud_hubspot_stats.upsert_snapshot(
+            self.db, self.user_id, stats.model_dump(mode="json")
+        )
+    
+    def get_stats(self, unbounded: bool = False) -> HubspotStats:
+        """
+        Calcule les statistiques globales HubSpot à partir des tables
+        
+        Chaque table est lue en un seul parcours (GROUPING SETS + FILTER)
+        et les trois requêtes s'exécutent en parallèle sur des connexions
+        distinctes. La durée de chaque requête est exposée dans
+        `query_timings_ms`.
+        
+        Args:
+            unbounded: requêtes sans statement_timeout (voir refresh_stats_snapshot)
+        """
         if not self.schema_exists():
             return HubspotStats(
                 total_contacts=0,
@@ -514,75 +850,126 @@ class HubspotDataService:
                 total_deals=0
             )
         
-        # Counts
-        contacts_count = self.db.execute(
-            text(f"SELECT COUNT(*) FROM {self.schema_name}.contacts")
-        ).scalar()
-        
-        companies_count = self.db.execute(
-            text(f"SELECT COUNT(*) FROM {self.schema_name}.companies")
-        ).scalar()
+        queries = {
+            "contacts": self._build_stats_query(
+                "contacts", "properties_lifecyclestage",
+                ["MAX(_airbyte_extracted_at) AS last_extracted_at"]
+            ),
+            "companies": self._build_stats_query("companies", "properties_industry"),
+            "deals": self._build_stats_query(
+                "deals", "properties_dealstage",
+                [
+                    "COALESCE(SUM(properties_amount), 0) AS total_amount",
+                    "COALESCE(SUM(properties_amount) FILTER (WHERE properties_hs_is_closed_won), 0) AS won_amount",
+                    "COALESCE(SUM(properties_amount) FILTER (WHERE NOT COALESCE(properties_hs_is_closed_won, false) AND NOT COALESCE(properties_hs_is_closed_lost, false)), 0) AS pipeline_amount",
+                ]
+            ),
+        }
+        # Un flux Airbyte désactivé ne crée pas sa table
+        existing_tables = get_tenant_metadata(self.db, self.schema_name).tables
+        queries = {table: query for table, query in queries.items() if table in existing_tables}
         
-        deals_count = self.db.execute(
-            text(f"SELECT COUNT(*) FROM {self.schema_name}.deals")
-        ).scalar()
+        results, timings = self._run_stats_queries(queries, unbounded)
         
-        # Dernière date de sync
-        last_sync_query = text(f"""
-            SELECT MAX(_airbyte_extracted_at) 
-            FROM {self.schema_name}.contacts
-        """)
-        last_sync_at = self.db.execute(last_sync_query).scalar()
-        
-        # Stats par lifecyclestage
-        lifecyclestage_query = text(f"""
-            SELECT properties_lifecyclestage, COUNT(*) 
-            FROM {self.schema_name}.contacts
-            WHERE properties_lifecyclestage IS NOT NULL
-            GROUP BY properties_lifecyclestage
-        """)
-        lifecyclestage_result = self.db.execute(lifecyclestage_query)
-        contacts_by_lifecyclestage = {row[0]: row[1] for row in lifecyclestage_result}
-        
-        # Stats par industry
-        industry_query = text(f"""
-            SELECT properties_industry, COUNT(*) 
-            FROM {self.schema_name}.companies
-            WHERE properties_industry IS NOT NULL
-            GROUP BY properties_industry
-        """)
-        industry_result = self.db.execute(industry_query)
-        companies_by_industry = {row[0]: row[1] for row in industry_result}
-        
-        # Stats par dealstage
-        dealstage_query = text(f"""
-            SELECT properties_dealstage, COUNT(*) 
-            FROM {self.schema_name}.deals
-            WHERE properties_dealstage IS NOT NULL
-            GROUP BY properties_dealstage
-        """)
-        dealstage_result = self.db.execute(dealstage_query)
-        deals_by_stage = {row[0]: row[1] for row in dealstage_result}
-        
-        # Montants
-        amounts_query = text(f"""
-            SELECT 
-                COALESCE(SUM(properties_amount), 0) as total_amount,
-                COALESCE(SUM(CASE WHEN properties_hs_is_closed_won THEN properties_amount ELSE 0 END), 0) as won_amount,
-                COALESCE(SUM(CASE WHEN NOT COALESCE(properties_hs_is_closed_won, false) AND NOT COALESCE(properties_hs_is_closed_lost, false) THEN properties_amount ELSE 0 END), 0) as pipeline_amount
-            FROM {self.schema_name}.deals
-        """)
-        amounts_result = self.db.execute(amounts_query).fetchone()
+        contacts_total, contacts_by_lifecyclestage = self._split_stats_rows(results.get("contacts", []))
+        companies_total, companies_by_industry = self._split_stats_rows(results.get("companies", []))
+        deals_total, deals_by_stage = self._split_stats_rows(results.get("deals", []))
         
         return HubspotStats(
-            total_contacts=contacts_count,
-            total_companies=companies_count,
-            total_deals=deals_count,
-            last_sync_at=last_sync_at,
+            total_contacts=contacts_total.get("row_count", 0),
+            total_companies=companies_total.get("row_count", 0),
+            total_deals=deals_total.get("row_count", 0),
+            last_sync_at=contacts_total.get("last_extracted_at"),
             contacts_by_lifecyclestage=contacts_by_lifecyclestage,
             companies_by_industry=companies_by_industry,
             deals_by_stage=deals_by_stage,
-            total_deal_amount=float(amounts_result[0]) if amounts_result else 0,
-            won_deal_amount=float(amounts_result[1]) if amounts_result else 0,
-            pipeline_value=float(amounts_result[2]) if amounts_result else 0
+            total_deal_amount=float(deals_total.get("total_amount", 0)),
+            won_deal_amount=float(deals_total.get("won_amount", 0)),
+            pipeline_value=float(deals_total.get("pipeline_amount", 0)),
+            query_timings_ms=timings
         )
+    
+    def _build_stats_query(
+        self,
+        table_name: str,
+        group_column: str,
+        extra_aggregates: Optional[List[str]] = None
+    ) -> str:
+        """
+        Requête de statistiques en un seul parcours de la table
+        
+        GROUPING SETS ((), (group_column)) retourne à la fois la ligne des
+        totaux (is_total = 1) et une ligne par valeur de `group_column`.
+        """
+        aggregates = ["COUNT(*) AS row_count"] + (extra_aggregates or [])
+        return f"""
+            SELECT GROUPING({group_column}) AS is_total,
+                   {group_column} AS bucket,
+                   {", ".join(aggregates)}
+            FROM {self.schema_name}.{table_name}
+            GROUP BY GROUPING SETS ((), ({group_column}))
+        """
+    
+    def _run_stats_queries(
+        self,
+        queries: Dict[str, str],
+        unbounded: bool = False
+    ) -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, float]]:
+        """
+        Exécute les requêtes de statistiques en parallèle et mesure leur durée
+        
+        Avec `unbounded`, statement_timeout est levé par SET LOCAL : limité à
+        la transaction de chaque connexion, ou à celle de la session jusqu'à
+        l'enregistrement du snapshot (commit).
+        """
+        engine = self.db.get_bind()
+        # Via AsyncHubspotDataService (run_sync), la session asyncpg ne peut
+        # pas être partagée entre threads : les requêtes restent séquentielles
+        concurrent = not engine.dialect.is_async
+        
+        def run(table_name: str, query: str) -> Tuple[str, List[Dict[str, Any]], float]:
+            start = time.perf_counter()
+            if concurrent:
+                with engine.connect() as conn:
+                    if unbounded:
+                        conn.execute(text("SET LOCAL statement_timeout = 0"))
+                    rows = [dict(row) for row in conn.execute(text(query)).mappings()]
+            else:
+                rows = [dict(row) for row in self.db.execute(text(query)).mappings()]
+            return table_name, rows, round((time.perf_counter() - start) * 1000, 2)
+        
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        timings: Dict[str, float] = {}
+        if not queries:
+            return results, timings
+        
+        if unbounded and not concurrent:
+            self.db.execute(text("SET LOCAL statement_timeout = 0"))
+        
+        if concurrent:
+            with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+                futures = [executor.submit(run, table, query) for table, query in queries.items()]
+                outcomes = [future.result() for future in futures]
+        else:
+            outcomes = [run(table, query) for table, query in queries.items()]
+        
+        for table_name, rows, elapsed_ms in outcomes:
+            results[table_name] = rows
+            timings[table_name] = elapsed_ms
+        
+        logger.debug(f"Stats queries for {self.schema_name}: {timings}")
+        return results, timings
+    
+    def _split_stats_rows(
+        self,
+        rows: List[Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], Dict[str, int]]:
+        """Sépare la ligne des totaux des lignes par groupe"""
+        totals: Dict[str, Any] = {}
+        groups: Dict[str, int] = {}
+        for row in rows:
+            if row["is_total"]:
+                totals = row
+            elif row["bucket"] is not None:
+                groups[row["bucket"]] = row["row_count"]
+        return totals, groups
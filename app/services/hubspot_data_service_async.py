@@ -0,0 +1,112 @@
+"""
+Variante asynchrone de HubspotDataService (asyncpg)
+
+Les requêtes, filtres et caches sont ceux de HubspotDataService : chaque
+méthode exécute la méthode synchrone correspondante via
+AsyncSession.run_sync, qui pilote le driver asyncpg sans bloquer la
+boucle d'événements ni occuper le threadpool de FastAPI.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.services.hubspot_data_service import HubspotDataService
+from app.schemas.hubspot_data import (
+    AvailableColumns,
+    CompanyFilters,
+    ContactFilters,
+    DealFilters,
+    HubspotStatsResponse,
+)
+
+
+class AsyncHubspotDataService:
+    """Service async pour lire les données HubSpot depuis Airbyte"""
+
+    def __init__(self, db: AsyncSession, user_id: int):
+        self.db = db
+        self.user_id = user_id
+        self.schema_name = f"user_{user_id}_hubspot"
+
+    async def _run(self, method: str, *args, **kwargs) -> Any:
+        """Exécute une méthode de HubspotDataService sur la session async"""
+        def call(session: Session) -> Any:
+            return getattr(HubspotDataService(session, self.user_id), method)(*args, **kwargs)
+
+        return await self.db.run_sync(call)
+
+    # ═══════════════════════════════════════════════════════════════
+    # 1. VÉRIFICATION DU SCHÉMA
+    # ═══════════════════════════════════════════════════════════════
+
+    async def schema_exists(self) -> bool:
+        return await self._run("schema_exists")
+
+    async def get_table_columns(self, table_name: str) -> List[str]:
+        return await self._run("get_table_columns", table_name)
+
+    async def get_table_column_types(self, table_name: str) -> List[Tuple[str, str]]:
+        return await self._run("get_table_column_types", table_name)
+
+    async def get_data_marker(self, include_stats_snapshot: bool = False) -> str:
+        return await self._run("get_data_marker", include_stats_snapshot)
+
+    # ═══════════════════════════════════════════════════════════════
+    # 2. LISTES ET DÉTAILS
+    # ═══════════════════════════════════════════════════════════════
+
+    async def get_contacts(
+        self,
+        page: int = 1,
+        limit: int = 50,
+        filters: Optional[ContactFilters] = None,
+        columns: Optional[List[str]] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], int, bool, Optional[str]]:
+        return await self._run(
+            "get_contacts", page=page, limit=limit, filters=filters, columns=columns, cursor=cursor
+        )
+
+    async def get_contact_by_id(self, contact_id: str) -> Optional[Dict[str, Any]]:
+        return await self._run("get_contact_by_id", contact_id)
+
+    async def get_companies(
+        self,
+        page: int = 1,
+        limit: int = 50,
+        filters: Optional[CompanyFilters] = None,
+        columns: Optional[List[str]] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], int, bool, Optional[str]]:
+        return await self._run(
+            "get_companies", page=page, limit=limit, filters=filters, columns=columns, cursor=cursor
+        )
+
+    async def get_company_by_id(self, company_id: str) -> Optional[Dict[str, Any]]:
+        return await self._run("get_company_by_id", company_id)
+
+    async def get_deals(
+        self,
+        page: int = 1,
+        limit: int = 50,
+        filters: Optional[DealFilters] = None,
+        columns: Optional[List[str]] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], int, bool, Optional[str]]:
+        return await self._run(
+            "get_deals", page=page, limit=limit, filters=filters, columns=columns, cursor=cursor
+        )
+
+    async def get_deal_by_id(self, deal_id: str) -> Optional[Dict[str, Any]]:
+        return await self._run("get_deal_by_id", deal_id)
+
+    # ═══════════════════════════════════════════════════════════════
+    # 3. MÉTADONNÉES ET STATISTIQUES
+    # ═══════════════════════════════════════════════════════════════
+
+    async def get_available_columns(self, object_type: str) -> AvailableColumns:
+        return await self._run("get_available_columns", object_type)
+
+    async def get_stats_snapshot(self) -> HubspotStatsResponse:
+        return await self._run("get_stats_snapshot")
@@ -0,0 +1,209 @@
+"""
+Sérialisation en flux des exports HubSpot (CSV / NDJSON)
+
+Deux moteurs d'export :
+- curseur serveur : les lignes sont encodées en Python par paquets au
+  fil de la lecture (CSV ou NDJSON)
+- COPY : Postgres produit directement le CSV (COPY ... TO STDOUT), les
+  octets sont transmis tels quels sans créer d'objets ligne en Python
+
+Dans les deux cas, aucun export n'est entièrement chargé en mémoire.
+"""
+import csv
+import io
+import json
+import logging
+import queue
+import threading
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Dict, Iterable, Iterator, List
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+
+class ExportFormat(str, Enum):
+    """Formats d'export supportés"""
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class ExportEngine(str, Enum):
+    """Moteur utilisé pour les exports CSV"""
+    COPY = "copy"  # COPY (SELECT ...) TO STDOUT, sans sérialisation Python
+    CURSOR = "cursor"  # Curseur serveur + module csv
+
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+    ExportFormat.NDJSON: "application/x-ndjson",
+}
+
+# Nombre de lignes encodées par chunk envoyé au client
+ROWS_PER_CHUNK = 500
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def iter_ndjson(rows: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    """Encode les lignes en JSON, une ligne par objet"""
+    buffer = []
+    for row in rows:
+        buffer.append(json.dumps(row, default=_json_default, ensure_ascii=False))
+        if len(buffer) >= ROWS_PER_CHUNK:
+            yield ("\n".join(buffer) + "\n").encode()
+            buffer = []
+    if buffer:
+        yield ("\n".join(buffer) + "\n").encode()
+
+
+def iter_csv(rows: Iterable[Dict[str, Any]], columns: List[str]) -> Iterator[bytes]:
+    """Encode les lignes en CSV avec une ligne d'en-tête"""
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(columns)
+
+    count = 0
+    for row in rows:
+        writer.writerow([_csv_value(row.get(column)) for column in columns])
+        count += 1
+        if count % ROWS_PER_CHUNK == 0:
+            yield output.getvalue().encode()
+            output.seek(0)
+            output.truncate(0)
+
+    if output.tell():
+        yield output.getvalue().encode()
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=_json_default, ensure_ascii=False)
+    return value
+
+
+def iter_gzip(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Compresse un flux de chunks au format gzip"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+# Nombre maximal de chunks COPY en attente d'envoi (contre-pression)
+COPY_QUEUE_SIZE = 32
+# psycopg2 écrit une fois par ligne : on regroupe en chunks de cette taille
+COPY_CHUNK_SIZE = 64 * 1024
+_COPY_DONE = object()
+
+
+class _CopyCancelled(Exception):
+    """Le client a interrompu le téléchargement"""
+
+
+class _QueueWriter:
+    """Fichier en écriture seule qui transmet la sortie COPY à une file"""
+
+    def __init__(self, chunks: "queue.Queue"):
+        self.chunks = chunks
+        self.cancelled = False
+        self._buffer = bytearray()
+
+    def write(self, data) -> int:
+        if self.cancelled:
+            raise _CopyCancelled()
+        if isinstance(data, str):
+            data = data.encode()
+        self._buffer += data
+        if len(self._buffer) >= COPY_CHUNK_SIZE:
+            self.flush()
+        return len(data)
+
+    def flush(self) -> None:
+        if self._buffer:
+            self.chunks.put(bytes(self._buffer))
+            self._buffer.clear()
+
+
+def iter_copy_csv(engine: Engine, query: str, params: Dict[str, Any]) -> Iterator[bytes]:
+    """
+    Exporte le résultat de `query` en CSV via COPY ... TO STDOUT
+
+    copy_expert (psycopg2) écrit de façon bloquante dans un fichier : il
+    s'exécute dans un thread qui alimente une file bornée, consommée ici
+    au rythme du client. Si le client se déconnecte, le COPY est annulé
+    côté serveur (il peut encore calculer ses premières lignes, sans rien
+    écrire) et la connexion rendue au pool.
+    """
+    raw_connection = engine.raw_connection()
+    chunks: "queue.Queue" = queue.Queue(maxsize=COPY_QUEUE_SIZE)
+    writer = _QueueWriter(chunks)
+    thread = None
+    finished = False
+
+    try:
+        cursor = raw_connection.cursor()
+        # COPY n'accepte pas de paramètres liés : la requête est rendue
+        # côté client par psycopg2 (échappement sûr des valeurs)
+        compiled = text(query).compile(dialect=engine.dialect)
+        select_sql = cursor.mogrify(str(compiled), params).decode()
+        copy_sql = f"COPY ({select_sql}) TO STDOUT WITH (FORMAT csv, HEADER true)"
+        # Un export complet dépasse le statement_timeout des requêtes API ;
+        # SET LOCAL est annulé au retour de la connexion dans le pool
+        cursor.execute("SET LOCAL statement_timeout = 0")
+
+        def run_copy():
+            try:
+                cursor.copy_expert(copy_sql, writer)
+                writer.flush()
+            except _CopyCancelled:
+                pass
+            except Exception as e:
+                chunks.put(e)
+            finally:
+                chunks.put(_COPY_DONE)
+
+        thread = threading.Thread(target=run_copy, name="copy-export", daemon=True)
+        thread.start()
+
+        while True:
+            item = chunks.get()
+            if item is _COPY_DONE:
+                finished = True
+                break
+            if isinstance(item, Exception):
+                logger.error(f"COPY export failed: {item}")
+                raise item
+            yield item
+    finally:
+        writer.cancelled = True
+        if not finished and thread is not None and thread.is_alive():
+            # Interrompt la requête en cours : copy_expert lève alors une erreur
+            try:
+                raw_connection.dbapi_connection.cancel()
+            except Exception as e:
+                logger.warning(f"Could not cancel COPY export: {e}")
+        # Vide la file pour débloquer le thread COPY s'il attend
+        while thread is not None and thread.is_alive():
+            try:
+                chunks.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        raw_connection.close()
@@ -0,0 +1,283 @@
+"""
+Service de provisionnement des index sur les tables créées par Airbyte
+
+Airbyte crée user_{id}_hubspot.contacts/companies/deals sans aucun index
+adapté à nos requêtes (tri par _airbyte_extracted_at, recherche par id,
+filtres d'égalité, recherche textuelle via pg_trgm). Ce service crée un
+ensemble d'index déclarés, de manière idempotente, avec CREATE INDEX
+CONCURRENTLY pour ne pas bloquer les écritures d'Airbyte. Il est exécuté
+après chaque sync réussie, car un full refresh Airbyte recrée les tables
+(et perd donc leurs index).
+"""
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.services.tenant_metadata_cache import TenantMetadata, get_tenant_metadata, invalidate_tenant_metadata
+
+logger = logging.getLogger(__name__)
+
+
+class IndexDefinition:
+    """Index attendu sur une table du schéma utilisateur"""
+
+    def __init__(
+        self,
+        name: str,
+        table: str,
+        columns: List[str],
+        method: str = "btree",
+        descending: bool = False,
+        opclass: Optional[str] = None,
+    ):
+        self.name = name
+        self.table = table
+        self.columns = columns
+        self.method = method
+        self.descending = descending
+        self.opclass = opclass
+
+    def create_sql(self, schema_name: str) -> str:
+        column_defs = []
+        for column in self.columns:
+            column_def = column
+            if self.opclass:
+                column_def += f" {self.opclass}"
+            if self.descending:
+                column_def += " DESC"
+            column_defs.append(column_def)
+        return (
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {self.name} "
+            f"ON {schema_name}.{self.table} USING {self.method} ({', '.join(column_defs)})"
+        )
+
+
+def _table_indexes(table: str, filter_columns: List[str]) -> List[IndexDefinition]:
+    """Index communs (tri, lookup par id) + un index par colonne de filtre"""
+    indexes = [
+        IndexDefinition(f"ix_{table}_extracted_at_id", table, ["_airbyte_extracted_at", "id"], descending=True),
+        IndexDefinition(f"ix_{table}_id", table, ["id"]),
+    ]
+    for column in filter_columns:
+        short_name = column.replace("properties_", "")
+        indexes.append(IndexDefinition(f"ix_{table}_{short_name}", table, [column]))
+    return indexes
+
+
+# Colonnes utilisées par le filtre `search` des listes
+SEARCHABLE_COLUMNS: Dict[str, List[str]] = {
+    "contacts": ["properties_email", "properties_firstname", "properties_lastname"],
+    "companies": ["properties_name", "properties_domain"],
+    "deals": ["properties_dealname"],
+}
+
+
+def _trigram_indexes(table: str) -> List[IndexDefinition]:
+    """Index GIN trigram pour la recherche par sous-chaîne et similarité"""
+    return [
+        IndexDefinition(
+            f"ix_{table}_{column.replace('properties_', '')}_trgm",
+            table,
+            [column],
+            method="gin",
+            opclass="gin_trgm_ops",
+        )
+        for column in SEARCHABLE_COLUMNS[table]
+    ]
+
+
+# Index déclarés par table
+DECLARED_INDEXES: Dict[str, List[IndexDefinition]] = {
+    "contacts": _table_indexes("contacts", [
+        "properties_lifecyclestage",
+        "properties_country",
+        "properties_hubspot_owner_id",
+    ]) + _trigram_indexes("contacts"),
+    "companies": _table_indexes("companies", [
+        "properties_industry",
+        "properties_country",
+        "properties_hubspot_owner_id",
+    ]) + _trigram_indexes("companies"),
+    "deals": _table_indexes("deals", [
+        "properties_dealstage",
+        "properties_pipeline",
+        "properties_hubspot_owner_id",
+    ]) + _trigram_indexes("deals"),
+}
+
+# Disponibilité de l'extension pg_trgm (vérifiée au plus une fois par TTL)
+_extension_cache = TTLCache(maxsize=1, ttl=300)
+
+
+def trigram_available(db: Session) -> bool:
+    """Indique si l'extension pg_trgm est installée dans la base"""
+    available = _extension_cache.get("pg_trgm")
+    if available is None:
+        available = bool(db.execute(
+            text("SELECT EXISTS(SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")
+        ).scalar())
+        _extension_cache.set("pg_trgm", available)
+    return available
+
+
+class HubspotIndexService:
+    """Crée et inspecte les index des tables HubSpot d'un utilisateur"""
+
+    def __init__(self, db: Session, user_id: int):
+        self.db = db
+        self.user_id = user_id
+        self.schema_name = f"user_{user_id}_hubspot"
+
+    def get_declared_indexes(self) -> List[IndexDefinition]:
+        return [index for indexes in DECLARED_INDEXES.values() for index in indexes]
+
+    def list_indexes(self) -> List[Dict]:
+        """Liste les index existants du schéma (déclarés ou non)"""
+        query = text("""
+            SELECT t.relname AS table_name,
+                   c.relname AS index_name,
+                   pg_get_indexdef(i.indexrelid) AS definition,
+                   i.indisvalid AS is_valid
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            JOIN pg_class t ON t.oid = i.indrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = :schema_name
+            ORDER BY t.relname, c.relname
+        """)
+        declared_names = {index.name for index in self.get_declared_indexes()}
+        result = self.db.execute(query, {"schema_name": self.schema_name})
+        return [
+            {
+                "table_name": row.table_name,
+                "index_name": row.index_name,
+                "definition": row.definition,
+                "is_valid": row.is_valid,
+                "is_declared": row.index_name in declared_names,
+            }
+            for row in result
+        ]
+
+    def ensure_indexes(self) -> Dict[str, List[str]]:
+        """
+        Crée les index déclarés manquants (idempotent)
+
+        Un index laissé invalide par un CREATE INDEX CONCURRENTLY interrompu
+        est supprimé puis recréé. Les index dont une colonne n'existe pas
+        (propriété HubSpot absente du portail) sont ignorés.
+
+        Returns:
+            dict avec les listes "created", "existing" et "skipped"
+        """
+        report: Dict[str, List[str]] = {"created": [], "existing": [], "skipped": []}
+
+        metadata = get_tenant_metadata(self.db, self.schema_name)
+        if not metadata.exists:
+            logger.info(f"Schema {self.schema_name} does not exist, no index to create")
+            return report
+
+        existing = {index["index_name"]: index["is_valid"] for index in self.list_indexes()}
+        # Libère la transaction de lecture avant les DDL concurrents
+        self.db.commit()
+
+        # CREATE INDEX CONCURRENTLY ne peut pas s'exécuter dans une transaction
+        with self.db.get_bind().connect() as conn:
+            conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+            # La construction d'un index sur une grosse table dépasse
+            # largement le statement_timeout des requêtes API
+            conn.execute(text("SET statement_timeout = 0"))
+            conn.execute(text("SET lock_timeout = 0"))
+            try:
+                self._create_indexes(conn, metadata, existing, report)
+            finally:
+                conn.execute(text("RESET statement_timeout"))
+                conn.execute(text("RESET lock_timeout"))
+
+        return report
+
+    def _create_indexes(
+        self,
+        conn,
+        metadata: TenantMetadata,
+        existing: Dict[str, bool],
+        report: Dict[str, List[str]]
+    ) -> None:
+        """Crée les index manquants sur une connexion AUTOCOMMIT"""
+        has_trigram = self._ensure_trigram_extension(conn)
+
+        for index in self.get_declared_indexes():
+            if index.opclass == "gin_trgm_ops" and not has_trigram:
+                report["skipped"].append(index.name)
+                continue
+
+            table_columns = metadata.columns(index.table)
+            if not all(column in table_columns for column in index.columns):
+                report["skipped"].append(index.name)
+                continue
+
+            if existing.get(index.name) is True:
+                report["existing"].append(index.name)
+                continue
+
+            try:
+                if index.name in existing:
+                    logger.warning(f"Rebuilding invalid index {self.schema_name}.{index.name}")
+                    conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {self.schema_name}.{index.name}"))
+
+                conn.execute(text(index.create_sql(self.schema_name)))
+                report["created"].append(index.name)
+                logger.info(f"Created index {self.schema_name}.{index.name}")
+            except Exception as e:
+                report["skipped"].append(index.name)
+                logger.error(f"Error creating index {self.schema_name}.{index.name}: {e}")
+
+    def _ensure_trigram_extension(self, conn) -> bool:
+        """Installe pg_trgm si nécessaire (requiert le droit CREATE sur la base)"""
+        try:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            _extension_cache.set("pg_trgm", True)
+            return True
+        except Exception as e:
+            logger.warning(f"pg_trgm extension unavailable, skipping trigram indexes: {e}")
+            return False
+
+
+# Schémas dont le provisionnement est en cours (un seul à la fois par schéma)
+_provisioning_in_progress = set()
+_provisioning_lock = threading.Lock()
+
+
+def provision_indexes(user_id: int) -> Optional[Dict[str, List[str]]]:
+    """Provisionne les index d'un utilisateur avec sa propre session"""
+    from app.db_init import SessionLocal
+
+    schema_name = f"user_{user_id}_hubspot"
+    with _provisioning_lock:
+        if schema_name in _provisioning_in_progress:
+            logger.info(f"Index provisioning already running for {schema_name}")
+            return None
+        _provisioning_in_progress.add(schema_name)
+
+    db = SessionLocal()
+    try:
+        # Les tables viennent potentiellement d'être recréées par Airbyte
+        invalidate_tenant_metadata(schema_name)
+        report = HubspotIndexService(db, user_id).ensure_indexes()
+        logger.info(
+            f"Index provisioning for {schema_name}: "
+            f"{len(report['created'])} created, {len(report['existing'])} existing, "
+            f"{len(report['skipped'])} skipped"
+        )
+        return report
+    except Exception as e:
+        logger.error(f"Error provisioning indexes for {schema_name}: {e}")
+        return None
+    finally:
+        db.close()
+        with _provisioning_lock:
+            _provisioning_in_progress.discard(schema_name)
+
@@ -0,0 +1,145 @@
+"""
+Client OAuth HubSpot asynchrone (échange de code et rafraîchissement)
+
+Les appels passent par le client httpx partagé "hubspot" : aucune requête
+sortante ne bloque la boucle d'événements. Les erreurs transitoires
+(timeout, erreur réseau, 429, 5xx) sont réessayées avec un backoff
+exponentiel ; un refus de HubSpot (400, 401...) est remonté immédiatement.
+
+Un code d'autorisation est à usage unique : son échange n'est réessayé
+que si la requête n'a pas pu partir (connexion impossible). Après un
+envoi, une nouvelle tentative ne pourrait obtenir que invalid_grant.
+"""
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.core.http_clients import http_clients
+from app.core.metrics import record_timing
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATH = "/oauth/v1/token"
+# Erreurs levées avant l'envoi de la requête : toujours réessayables
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+# Plafond d'attente entre deux tentatives (secondes)
+MAX_BACKOFF_SECONDS = 8.0
+
+
+class HubspotOAuthError(Exception):
+    """
+    Échec d'un appel OAuth HubSpot
+
+    `retryable` est vrai si HubSpot était indisponible (tentatives
+    épuisées) et faux si la demande a été refusée (code ou token invalide).
+    """
+
+    def __init__(self, message: str, status_code: Optional[int] = None, retryable: bool = False):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retryable = retryable
+
+
+class HubspotOAuthClient:
+    """Appels à l'endpoint /oauth/v1/token de HubSpot"""
+
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        max_retries: int = settings.HUBSPOT_OAUTH_MAX_RETRIES,
+        timeout: float = settings.HUBSPOT_OAUTH_TIMEOUT_SECONDS,
+        backoff: float = settings.HUBSPOT_OAUTH_BACKOFF_SECONDS,
+    ):
+        self._client = client
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.backoff = backoff
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._client or http_clients.get("hubspot")
+
+    async def exchange_code(self, code: str) -> Dict[str, Any]:
+        """Échange un code d'autorisation contre les tokens"""
+        return await self._token_request({
+            "grant_type": "authorization_code",
+            "client_id": settings.HUBSPOT_CLIENT_ID,
+            "client_secret": settings.HUBSPOT_CLIENT_SECRET,
+            "redirect_uri": settings.HUBSPOT_REDIRECT_URI,
+            "code": code,
+        })
+
+    async def refresh(self, refresh_token: str) -> Dict[str, Any]:
+        """Obtient de nouveaux tokens à partir d'un refresh token"""
+        return await self._token_request({
+            "grant_type": "refresh_token",
+            "client_id": settings.HUBSPOT_CLIENT_ID,
+            "client_secret": settings.HUBSPOT_CLIENT_SECRET,
+            "refresh_token": refresh_token,
+        })
+
+    async def _token_request(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        grant_type = data["grant_type"]
+        # L'échange d'un code (usage unique) n'est pas rejouable une fois envoyé
+        replayable = grant_type != "authorization_code"
+        last_error = "no attempt"
+
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            start = time.perf_counter()
+            try:
+                response = await self.client.post(TOKEN_PATH, data=data, timeout=self.timeout)
+            except httpx.TransportError as e:
+                last_error = f"{type(e).__name__}: {e}"
+                if not replayable and not isinstance(e, NOT_SENT_ERRORS):
+                    raise HubspotOAuthError(
+                        f"HubSpot OAuth {grant_type} failed after sending: {last_error}", retryable=True
+                    )
+            else:
+                if response.status_code == 200:
+                    return response.json()
+                if response.status_code != 429 and response.status_code < 500:
+                    raise HubspotOAuthError(response.text, status_code=response.status_code)
+                last_error = f"HTTP {response.status_code}"
+                if not replayable:
+                    raise HubspotOAuthError(
+                        f"HubSpot OAuth {grant_type} failed: {last_error}",
+                        status_code=response.status_code,
+                        retryable=True,
+                    )
+                retry_after = _retry_after_seconds(response)
+            finally:
+                record_timing("http.hubspot_oauth", (time.perf_counter() - start) * 1000)
+
+            if attempt < self.max_retries:
+                delay = retry_after if retry_after is not None else self._backoff_delay(attempt)
+                logger.warning(
+                    f"HubSpot OAuth {grant_type} failed ({last_error}), "
+                    f"retry {attempt + 1}/{self.max_retries} in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+
+        raise HubspotOAuthError(
+            f"HubSpot OAuth {grant_type} unavailable after {self.max_retries + 1} attempts: {last_error}",
+            retryable=True,
+        )
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Backoff exponentiel avec jitter"""
+        delay = self.backoff * (2 ** attempt)
+        return min(MAX_BACKOFF_SECONDS, delay + random.uniform(0, self.backoff))
+
+
+def _retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    try:
+        return min(MAX_BACKOFF_SECONDS, float(response.headers["Retry-After"]))
+    except (KeyError, ValueError):
+        return None
+
+
+hubspot_oauth_client = HubspotOAuthClient()
@@ -0,0 +1,284 @@
+"""
+Cache des résultats de lecture HubSpot (listes, détails, colonnes)
+
+Les tables user_{id}_hubspot ne changent qu'à la fin d'une sync Airbyte :
+entre deux syncs, une même page renvoie toujours le même résultat. Les
+lectures de HubspotDataService décorées par `cached_read` sont mises en
+cache par (utilisateur, génération, méthode, arguments normalisés).
+
+La génération d'un utilisateur est un compteur incrémenté à chaque sync
+réussie : les entrées de la génération précédente ne sont plus jamais
+lues et disparaissent par expiration (ou immédiatement en mémoire).
+
+Backends :
+- memory : LRU par processus (génération propre à chaque worker). Le
+  worker qui constate la fin de la sync prévient les autres via NOTIFY
+  (sync_events), chacun incrémente alors sa propre génération.
+- redis : partagé entre workers, paquet `redis` requis (REDIS_URL). Les
+  valeurs y sont stockées en JSON (orjson).
+"""
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import threading
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Optional
+
+import orjson
+from pydantic import BaseModel
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.schemas.hubspot_data import AvailableColumns
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class QueryCacheBackend(ABC):
+    """Interface d'un backend de cache des lectures"""
+
+    # True si les entrées et générations sont partagées entre workers
+    shared = False
+
+    @abstractmethod
+    def get(self, key: str) -> Any:
+        """Retourne la valeur ou _MISSING"""
+
+    @abstractmethod
+    def set(self, key: str, value: Any) -> None:
+        """Enregistre une valeur"""
+
+    @abstractmethod
+    def get_generation(self, user_id: int) -> int:
+        """Génération courante d'un utilisateur, -1 si inconnue"""
+
+    @abstractmethod
+    def bump_generation(self, user_id: int) -> int:
+        """Passe à la génération suivante et la retourne"""
+
+
+# Modèles pydantic pouvant figurer dans une valeur en cache
+_CACHEABLE_MODELS = {model.__name__: model for model in (AvailableColumns,)}
+
+
+def _to_json(value: Any) -> Any:
+    """Valeur en cache ramenée à du JSON, types non JSON balisés"""
+    if isinstance(value, dict):
+        return {key: _to_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_to_json(item) for item in value]
+    if isinstance(value, tuple):
+        return {"__type__": "tuple", "items": [_to_json(item) for item in value]}
+    if isinstance(value, datetime):
+        return {"__type__": "datetime", "value": value.isoformat()}
+    if isinstance(value, date):
+        return {"__type__": "date", "value": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"__type__": "decimal", "value": str(value)}
+    if isinstance(value, BaseModel):
+        name = type(value).__name__
+        if name not in _CACHEABLE_MODELS:
+            raise TypeError(f"Model {name} cannot be cached")
+        return {"__type__": "model", "model": name, "value": value.model_dump(mode="json")}
+    return value
+
+
+def _from_json(value: Any) -> Any:
+    """Inverse de _to_json"""
+    if isinstance(value, list):
+        return [_from_json(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+
+    kind = value.get("__type__")
+    if kind == "tuple":
+        return tuple(_from_json(item) for item in value["items"])
+    if kind == "datetime":
+        return datetime.fromisoformat(value["value"])
+    if kind == "date":
+        return date.fromisoformat(value["value"])
+    if kind == "decimal":
+        return Decimal(value["value"])
+    if kind == "model":
+        return _CACHEABLE_MODELS[value["model"]].model_validate(value["value"])
+    return {key: _from_json(item) for key, item in value.items()}
+
+
+def dumps_value(value: Any) -> bytes:
+    """Sérialise une valeur en cache (JSON)"""
+    return orjson.dumps(_to_json(value))
+
+
+def loads_value(payload: bytes) -> Any:
+    """Désérialise une valeur écrite par dumps_value"""
+    return _from_json(orjson.loads(payload))
+
+
+class MemoryQueryCache(QueryCacheBackend):
+    """Backend LRU en processus"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generations: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        return self.entries.get(key, _MISSING)
+
+    def set(self, key: str, value: Any) -> None:
+        self.entries.set(key, value)
+
+    def get_generation(self, user_id: int) -> int:
+        return self._generations.get(user_id, 0)
+
+    def bump_generation(self, user_id: int) -> int:
+        with self._lock:
+            generation = self._generations.get(user_id, 0) + 1
+            self._generations[user_id] = generation
+        # Libère tout de suite la mémoire des générations périmées
+        prefix = f"{user_id}:"
+        self.entries.invalidate(lambda key: key.startswith(prefix))
+        return generation
+
+
+class RedisQueryCache(QueryCacheBackend):
+    """
+    Backend Redis partagé entre workers
+
+    Les erreurs Redis ne font jamais échouer une requête : elles sont
+    traitées comme des absences de cache.
+    """
+
+    shared = True
+
+    def __init__(self, url: str, ttl: int):
+        import redis
+
+        self.client = redis.Redis.from_url(url, socket_timeout=0.2, socket_connect_timeout=0.2)
+        self.ttl = ttl
+
+    def get(self, key: str) -> Any:
+        try:
+            payload = self.client.get(f"hubspot:data:{key}")
+            return _MISSING if payload is None else loads_value(payload)
+        except Exception as e:
+            logger.warning(f"Redis cache read failed: {e}")
+            return _MISSING
+
+    def set(self, key: str, value: Any) -> None:
+        try:
+            self.client.set(f"hubspot:data:{key}", dumps_value(value), ex=self.ttl)
+        except Exception as e:
+            logger.warning(f"Redis cache write failed: {e}")
+
+    def get_generation(self, user_id: int) -> int:
+        try:
+            return int(self.client.get(f"hubspot:generation:{user_id}") or 0)
+        except Exception as e:
+            logger.warning(f"Redis cache generation read failed: {e}")
+            # Génération inconnue : aucune entrée ne sera lue ni écrite
+            return -1
+
+    def bump_generation(self, user_id: int) -> int:
+        return int(self.client.incr(f"hubspot:generation:{user_id}"))
+
+
+def _create_backend() -> Optional[QueryCacheBackend]:
+    backend = settings.HUBSPOT_DATA_CACHE_BACKEND.lower()
+    if backend == "none":
+        return None
+
+    if backend == "redis":
+        if settings.REDIS_URL:
+            try:
+                return RedisQueryCache(settings.REDIS_URL, settings.HUBSPOT_DATA_CACHE_TTL_SECONDS)
+            except ImportError:
+                logger.warning("redis package not installed, falling back to in-memory query cache")
+        else:
+            logger.warning("REDIS_URL not set, falling back to in-memory query cache")
+
+    return MemoryQueryCache(
+        maxsize=settings.HUBSPOT_DATA_CACHE_MAX_ENTRIES,
+        ttl=settings.HUBSPOT_DATA_CACHE_TTL_SECONDS,
+    )
+
+
+query_cache = _create_backend()
+
+
+def bump_tenant_generation(user_id: int) -> Optional[int]:
+    """Rend obsolètes toutes les lectures en cache d'un utilisateur"""
+    if query_cache is None:
+        return None
+    generation = query_cache.bump_generation(user_id)
+    logger.info(f"Query cache generation for user {user_id} is now {generation}")
+    return generation
+
+
+def bump_local_generation(user_id: int) -> Optional[int]:
+    """
+    Invalidation reçue d'un autre worker (NOTIFY)
+
+    Seul un backend propre au processus est concerné : la génération
+    Redis a déjà été incrémentée par le worker émetteur.
+    """
+    if query_cache is None or query_cache.shared:
+        return None
+    return query_cache.bump_generation(user_id)
+
+
+def _normalize(value: Any) -> Any:
+    """Forme JSON stable d'un argument (filtres, colonnes, pagination)"""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", exclude_none=True)
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def cached_read(method: Callable) -> Callable:
+    """
+    Met en cache le résultat d'une méthode de lecture de HubspotDataService
+
+    La clé contient tous les arguments, valeurs par défaut comprises :
+    `get_contacts(page=1)` et `get_contacts()` partagent la même entrée.
+    Les exceptions (curseur invalide...) ne sont pas mises en cache.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if query_cache is None:
+            return method(self, *args, **kwargs)
+
+        generation = query_cache.get_generation(self.user_id)
+        if generation < 0:
+            return method(self, *args, **kwargs)
+
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = {
+            name: _normalize(value)
+            for name, value in bound.arguments.items()
+            if name != "self"
+        }
+        digest = hashlib.sha1(
+            json.dumps(arguments, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        key = f"{self.user_id}:{generation}:{method.__name__}:{digest}"
+
+        cached = query_cache.get(key)
+        if cached is not _MISSING:
+            return cached
+
+        result = method(self, *args, **kwargs)
+        query_cache.set(key, result)
+        return result
+
+    return wrapper
@@ -0,0 +1,125 @@
+"""
+Synchronisation automatique des connexions Airbyte
+
+Tâche planifiée toutes les HUBSPOT_SYNC_INTERVAL_HOURS : déclenche un sync
+pour chaque connexion active. Les déclenchements sont étalés (jitter) et
+leur concurrence est bornée ; une connexion dont un sync est en cours ou
+vient de se terminer est ignorée. Un seul worker exécute la tâche
+(verrou consultatif).
+"""
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.leader import advisory_lock
+from app.crud import airbyte as airbyte_crud
+from app.models.airbyte import AirbyteConnection
+from app.services.airbyte_service import AirbyteService
+
+logger = logging.getLogger(__name__)
+
+
+def _skip_reason(connection: AirbyteConnection, now: datetime) -> Optional[str]:
+    """Raison d'ignorer une connexion, None si un sync doit être déclenché"""
+    if connection.status != "active":
+        return "inactive"
+    if connection.last_sync_at is None:
+        return None
+
+    if connection.last_sync_status == "running":
+        stale_after = timedelta(hours=settings.HUBSPOT_SYNC_STALE_RUNNING_HOURS)
+        if connection.last_sync_at > now - stale_after:
+            return "running"
+        logger.warning(f"Sync of user {connection.user_id} running since {connection.last_sync_at}, restarting")
+        return None
+
+    # Sync récent (manuel ou lancé par un autre worker) : données encore fraîches
+    if connection.last_sync_at > now - timedelta(hours=settings.HUBSPOT_SYNC_INTERVAL_HOURS) / 2:
+        return "recent"
+    return None
+
+
+def _select_targets() -> Tuple[List[int], int]:
+    """Utilisateurs dont la connexion doit être synchronisée, nombre d'ignorés"""
+    from app.db_init import SessionLocal
+
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        targets, skipped = [], 0
+        for connection in airbyte_crud.get_active_connections(db):
+            if _skip_reason(connection, now):
+                skipped += 1
+            else:
+                targets.append(connection.user_id)
+        return targets, skipped
+    finally:
+        db.close()
+
+
+def _connection_to_sync(db: Session, user_id: int) -> Optional[str]:
+    """Relit la connexion : connection_id à synchroniser, None si à ignorer"""
+    connection = airbyte_crud.get_connection_by_user_id(db, user_id)
+    if connection is None or _skip_reason(connection, datetime.utcnow()):
+        return None
+    return connection.connection_id
+
+
+async def run_scheduled_syncs() -> Dict[str, int]:
+    """
+    Tâche planifiée : déclenche un sync pour toutes les connexions actives
+
+    Exécutée par un seul worker à la fois (verrou consultatif). Les accès
+    psycopg2 passent par un thread : seuls les appels à Airbyte ont lieu
+    sur la boucle d'événements.
+    """
+    from app.db_init import SessionLocal
+
+    report = {"triggered": 0, "skipped": 0, "failed": 0}
+
+    async with advisory_lock("hubspot-auto-sync") as acquired:
+        if not acquired:
+            return report
+
+        targets, report["skipped"] = await asyncio.to_thread(_select_targets)
+        if not targets:
+            logger.info(f"Auto sync: nothing to trigger ({report['skipped']} skipped)")
+            return report
+
+        semaphore = asyncio.Semaphore(settings.HUBSPOT_SYNC_CONCURRENCY)
+
+        async def sync_one(user_id: int) -> None:
+            # Étale les déclenchements pour ne pas solliciter Airbyte d'un coup
+            await asyncio.sleep(random.uniform(0, settings.HUBSPOT_SYNC_JITTER_SECONDS))
+            async with semaphore:
+                task_db = SessionLocal()
+                try:
+                    # Relu après l'attente : un sync manuel a pu démarrer entre-temps
+                    connection_id = await asyncio.to_thread(_connection_to_sync, task_db, user_id)
+                    if connection_id is None:
+                        report["skipped"] += 1
+                        return
+
+                    job_id = await AirbyteService(task_db, user_id).trigger_sync(connection_id)
+                    if job_id:
+                        report["triggered"] += 1
+                    else:
+                        report["failed"] += 1
+                except Exception as e:
+                    report["failed"] += 1
+                    logger.error(f"Auto sync failed for user {user_id}: {e}")
+                finally:
+                    await asyncio.to_thread(task_db.close)
+
+        await asyncio.gather(*(sync_one(user_id) for user_id in targets))
+
+    logger.info(
+        f"Auto sync: {report['triggered']} triggered, {report['skipped']} skipped, "
+        f"{report['failed']} failed"
+    )
+    return report
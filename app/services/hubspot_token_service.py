@@ -0,0 +1,180 @@
+"""
+Rafraîchissement des tokens HubSpot
+
+- À la demande : refresh_user_token, single-flight par utilisateur ; les
+  requêtes concurrentes (de ce worker ou d'un autre) attendent le premier
+  rafraîchissement puis relisent le token au lieu d'appeler HubSpot à
+  leur tour
+- En tâche de fond : refresh_expiring_tokens rafraîchit, par lots et
+  avec une concurrence bornée, les tokens qui expirent bientôt
+
+Les accès psycopg2 passent par un thread : seuls l'appel à HubSpot et
+l'attente des verrous (asyncpg) ont lieu sur la boucle d'événements.
+"""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.leader import AdvisoryLockTimeout, advisory_lock, advisory_xact_lock
+from app.crud import hubspot as crud_hubspot
+from app.models.hubspot import HubspotToken
+from app.schemas.hubspot import HubspotTokenCreate
+from app.services.hubspot_oauth import MAX_BACKOFF_SECONDS, HubspotOAuthError, hubspot_oauth_client
+
+logger = logging.getLogger(__name__)
+
+# Attente maximale du verrou d'un utilisateur : durée d'un rafraîchissement
+# avec toutes ses tentatives
+REFRESH_LOCK_TIMEOUT_SECONDS = (
+    settings.HUBSPOT_OAUTH_TIMEOUT_SECONDS * (settings.HUBSPOT_OAUTH_MAX_RETRIES + 1)
+    + MAX_BACKOFF_SECONDS * settings.HUBSPOT_OAUTH_MAX_RETRIES
+)
+
+# Verrous par utilisateur dans ce processus (supprimés dès qu'inutilisés) :
+# les requêtes concurrentes d'un même worker n'ouvrent qu'une connexion
+_refresh_locks: Dict[int, asyncio.Lock] = {}
+_refresh_lock_users: Dict[int, int] = {}
+
+
+@asynccontextmanager
+async def _local_refresh_lock(user_id: int) -> AsyncIterator[None]:
+    lock = _refresh_locks.setdefault(user_id, asyncio.Lock())
+    _refresh_lock_users[user_id] = _refresh_lock_users.get(user_id, 0) + 1
+    try:
+        async with lock:
+            yield
+    finally:
+        _refresh_lock_users[user_id] -= 1
+        if not _refresh_lock_users[user_id]:
+            del _refresh_lock_users[user_id]
+            del _refresh_locks[user_id]
+
+
+def _expires_within(token: HubspotToken, margin: timedelta) -> bool:
+    if token.expires_at is None:
+        return True
+    expires_at = token.expires_at
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    return expires_at <= datetime.now(timezone.utc) + margin
+
+
+def _reload_active_token(db: Session, user_id: int) -> Optional[HubspotToken]:
+    """Relit le token actif en base (et non l'instance déjà chargée par la session)"""
+    db.expire_all()
+    return crud_hubspot.get_active_token(db, user_id)
+
+
+async def refresh_user_token(
+    db: Session,
+    user_id: int,
+    margin: timedelta = timedelta(0)
+) -> Optional[HubspotToken]:
+    """
+    Rafraîchit le token actif d'un utilisateur s'il expire dans `margin`
+
+    Le rafraîchissement est protégé par un verrou consultatif par
+    utilisateur, partagé par tous les workers. Le token est relu une fois
+    le verrou obtenu : s'il a été rafraîchi entre-temps (autre requête,
+    tâche de fond), il est retourné tel quel.
+
+    Raises:
+        HubspotOAuthError: refus de HubSpot (le token est alors désactivé)
+            ou HubSpot indisponible (retryable, token conservé)
+    """
+    async with _local_refresh_lock(user_id):
+        try:
+            async with advisory_xact_lock(f"hubspot-token-refresh:{user_id}", REFRESH_LOCK_TIMEOUT_SECONDS):
+                return await _refresh_locked(db, user_id, margin)
+        except AdvisoryLockTimeout as e:
+            raise HubspotOAuthError(str(e), retryable=True)
+
+
+async def _refresh_locked(db: Session, user_id: int, margin: timedelta) -> Optional[HubspotToken]:
+    token = await asyncio.to_thread(_reload_active_token, db, user_id)
+    if token is None or not _expires_within(token, margin):
+        return token
+
+    try:
+        token_data = await hubspot_oauth_client.refresh(token.refresh_token)
+    except HubspotOAuthError as e:
+        if not e.retryable:
+            logger.warning(f"HubSpot refused token refresh for user {user_id}, deactivating token")
+            await asyncio.to_thread(crud_hubspot.deactivate_token, db, user_id)
+        raise
+
+    expires_in = token_data.get("expires_in", 21600)  # Default 6 hours
+    token_update = HubspotTokenCreate(
+        access_token=token_data["refresh_token"],
+        refresh_token=token_data["refresh_token"],
+        expires_at=datetime.now(timezone.utc) + timedelta(seconds=expires_in),
+        is_active=True
+    )
+    logger.info(f"Refreshed HubSpot token for user {user_id}")
+    return await asyncio.to_thread(crud_hubspot.create_token, db, token_update, user_id)
+
+
+def _expiring_user_ids(window: timedelta) -> List[int]:
+    from app.db_init import SessionLocal
+
+    db = SessionLocal()
+    try:
+        tokens = crud_hubspot.get_tokens_expiring_before(
+            db,
+            datetime.now(timezone.utc) + window,
+            limit=settings.HUBSPOT_TOKEN_REFRESH_BATCH_SIZE
+        )
+        return list(dict.fromkeys(token.user_id for token in tokens))
+    finally:
+        db.close()
+
+
+async def refresh_expiring_tokens() -> Dict[str, int]:
+    """
+    Tâche planifiée : rafraîchit les tokens qui expirent dans la fenêtre
+
+    Exécutée par un seul worker à la fois (verrou consultatif).
+    """
+    from app.db_init import SessionLocal
+
+    report = {"refreshed": 0, "failed": 0}
+    window = timedelta(minutes=settings.HUBSPOT_TOKEN_REFRESH_WINDOW_MINUTES)
+
+    async with advisory_lock("hubspot-token-refresh") as acquired:
+        if not acquired:
+            return report
+
+        user_ids = await asyncio.to_thread(_expiring_user_ids, window)
+        if not user_ids:
+            return report
+
+        semaphore = asyncio.Semaphore(settings.HUBSPOT_TOKEN_REFRESH_CONCURRENCY)
+
+        async def refresh_one(user_id: int) -> None:
+            async with semaphore:
+                # Une session par tâche : les rafraîchissements sont concurrents
+                task_db = SessionLocal()
+                try:
+                    await refresh_user_token(task_db, user_id, margin=window)
+                    report["refreshed"] += 1
+                except HubspotOAuthError as e:
+                    report["failed"] += 1
+                    logger.error(f"Scheduled token refresh failed for user {user_id}: {e}")
+                except Exception as e:
+                    report["failed"] += 1
+                    logger.error(f"Unexpected error refreshing token for user {user_id}: {e}")
+                finally:
+                    await asyncio.to_thread(task_db.close)
+
+        await asyncio.gather(*(refresh_one(user_id) for user_id in user_ids))
+
+    logger.info(
+        f"Token refresh: {report['refreshed']} refreshed, {report['failed']} failed "
+        f"({len(user_ids)} expiring within {window})"
+    )
+    return report
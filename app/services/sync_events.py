@@ -0,0 +1,158 @@
+"""
+Diffusion des événements de synchronisation (flux SSE /sync/events)
+
+Le tracker (un seul worker) publie chaque changement d'un job via
+NOTIFY PostgreSQL. Chaque worker garde une unique connexion LISTEN et
+redistribue les événements en mémoire aux flux SSE ouverts par ses
+clients : le coût côté Airbyte reste d'un polling par job, quel que soit
+le nombre de tableaux de bord connectés.
+
+Le même canal diffuse l'invalidation des caches en processus d'un
+utilisateur après une sync réussie (message de type "invalidate").
+"""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Set
+
+import asyncpg
+import orjson
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.sync_job import SyncJob
+from app.services import sync_hooks
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "sync_job_events"
+# Délai maximal entre deux reconnexions du listener (secondes)
+MAX_RECONNECT_DELAY_SECONDS = 30.0
+
+
+def job_event(job: SyncJob) -> Dict[str, Any]:
+    """Représentation d'un job diffusée aux clients"""
+    return {
+        "job_id": job.job_id,
+        "connection_id": job.connection_id,
+        "status": job.status,
+        "rows_synced": job.rows_synced or 0,
+        "bytes_synced": job.bytes_synced or 0,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "completed_at": job.completed_at.isoformat() if job.completed_at else None,
+        "error_message": job.error_message,
+    }
+
+
+def notify_job_event(db: Session, job: SyncJob) -> None:
+    """Publie l'état d'un job à tous les workers (NOTIFY, envoyé au commit)"""
+    payload = orjson.dumps({"user_id": job.user_id, "job": job_event(job)}).decode()
+    try:
+        db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": CHANNEL, "payload": payload})
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error publishing sync event for job {job.job_id}: {e}")
+
+
+def notify_tenant_invalidation(db: Session, user_id: int) -> None:
+    """Demande à tous les workers d'invalider leurs caches de l'utilisateur"""
+    payload = orjson.dumps({"type": "invalidate", "user_id": user_id}).decode()
+    try:
+        db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": CHANNEL, "payload": payload})
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error publishing cache invalidation for user {user_id}: {e}")
+
+
+class SyncEventBroadcaster:
+    """Redistribue les événements NOTIFY aux abonnés de ce processus"""
+
+    def __init__(self, queue_size: int = settings.SYNC_EVENTS_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: int) -> AsyncIterator[asyncio.Queue]:
+        """File des événements d'un utilisateur, le temps du bloc"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self._subscribers.get(user_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[user_id]
+
+    def publish(self, user_id: int, event: Dict[str, Any]) -> None:
+        for queue in self._subscribers.get(user_id, ()):
+            if queue.full():
+                # Client trop lent : l'événement le plus ancien est perdu,
+                # le suivant porte de toute façon l'état complet du job
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        try:
+            message = orjson.loads(payload)
+            if message.get("type") == "invalidate":
+                sync_hooks.invalidate_local_caches(int(message["user_id"]))
+            else:
+                self.publish(int(message["user_id"]), message["job"])
+        except Exception as e:
+            logger.error(f"Invalid sync event payload: {e}")
+
+    async def start(self) -> None:
+        """Démarre l'écoute du canal NOTIFY (appelé par le lifespan)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen(), name="sync-events-listener")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _listen(self) -> None:
+        """Garde une connexion LISTEN ouverte, reconnectée en cas de coupure"""
+        from app.db_init import SQLALCHEMY_DATABASE_URI
+
+        delay = 1.0
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(SQLALCHEMY_DATABASE_URI)
+                await connection.add_listener(CHANNEL, self._on_notify)
+                logger.info(f"Listening for sync events on {CHANNEL}")
+                delay = 1.0
+                # Ping périodique : détecte une connexion coupée sans fermeture
+                while not connection.is_closed():
+                    await asyncio.sleep(settings.SYNC_EVENTS_HEARTBEAT_SECONDS)
+                    await connection.execute("SELECT 1")
+            except asyncio.CancelledError:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+                raise
+            except Exception as e:
+                logger.error(f"Sync events listener error: {e}, reconnecting in {delay:.0f}s")
+            finally:
+                if connection is not None and not connection.is_closed():
+                    connection.terminate()
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY_SECONDS)
+
+
+# Instance globale, démarrée par le lifespan de l'application
+sync_events = SyncEventBroadcaster()
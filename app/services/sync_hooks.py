@@ -0,0 +1,99 @@
+"""
+Actions déclenchées à la fin d'une synchronisation Airbyte réussie
+
+Les données du schéma user_{id}_hubspot ne changent qu'à ce moment-là :
+c'est donc ici que les caches dérivés de ces données sont invalidés et
+que les données pré-calculées (index, statistiques) sont rafraîchies.
+
+Les caches en mémoire sont propres à chaque worker : le worker du tracker
+les invalide chez lui, puis prévient les autres via NOTIFY (sync_events),
+qui appellent invalidate_local_caches.
+"""
+import logging
+import threading
+
+from sqlalchemy.orm import Session
+
+from app.services.hubspot_count_service import invalidate_tenant_counts
+from app.services.hubspot_index_service import provision_indexes
+from app.services.hubspot_query_cache import bump_local_generation, bump_tenant_generation
+from app.services.tenant_metadata_cache import invalidate_tenant_metadata
+
+logger = logging.getLogger(__name__)
+
+
+def get_schema_name(user_id: int) -> str:
+    """Nom du schéma PostgreSQL des données HubSpot d'un utilisateur"""
+    return f"user_{user_id}_hubspot"
+
+
+def _invalidate_schema_caches(schema_name: str) -> None:
+    try:
+        invalidate_tenant_metadata(schema_name)
+    except Exception as e:
+        logger.error(f"Error invalidating metadata cache for {schema_name}: {e}")
+
+    try:
+        invalidate_tenant_counts(schema_name)
+    except Exception as e:
+        logger.error(f"Error invalidating cached counts for {schema_name}: {e}")
+
+
+def invalidate_local_caches(user_id: int) -> None:
+    """
+    Invalide les caches en processus d'un utilisateur (NOTIFY reçu)
+
+    Le worker émetteur reçoit aussi sa propre notification : l'invalidation
+    est alors répétée, sans autre effet.
+    """
+    _invalidate_schema_caches(get_schema_name(user_id))
+
+    try:
+        bump_local_generation(user_id)
+    except Exception as e:
+        logger.error(f"Error bumping local query cache generation for user {user_id}: {e}")
+
+
+def on_sync_succeeded(db: Session, user_id: int) -> None:
+    """Appelé une fois par job Airbyte terminé avec succès"""
+    # Import local : sync_events importe ce module
+    from app.services.sync_events import notify_tenant_invalidation
+
+    schema_name = get_schema_name(user_id)
+    logger.info(f"Sync succeeded for user {user_id}, refreshing derived data of {schema_name}")
+
+    _invalidate_schema_caches(schema_name)
+
+    try:
+        bump_tenant_generation(user_id)
+    except Exception as e:
+        logger.error(f"Error bumping query cache generation for user {user_id}: {e}")
+
+    # Les autres workers invalident leurs propres caches à la réception
+    notify_tenant_invalidation(db, user_id)
+
+    # Index et statistiques peuvent prendre du temps sur un gros portail
+    thread = threading.Thread(
+        target=run_post_sync_jobs,
+        args=(user_id,),
+        name=f"post-sync-{user_id}",
+        daemon=True,
+    )
+    thread.start()
+
+
+def run_post_sync_jobs(user_id: int) -> None:
+    """Provisionne les index puis recalcule le snapshot de statistiques"""
+    from app.db_init import SessionLocal
+    from app.services.hubspot_data_service import HubspotDataService
+
+    provision_indexes(user_id)
+
+    db = SessionLocal()
+    try:
+        HubspotDataService(db, user_id).refresh_stats_snapshot(unbounded=True)
+        logger.info(f"Stats snapshot refreshed for user {user_id}")
+    except Exception as e:
+        logger.error(f"Error refreshing stats snapshot for user {user_id}: {e}")
+    finally:
+        db.close()
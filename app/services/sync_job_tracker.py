@@ -0,0 +1,305 @@
+"""
+Suivi côté serveur des jobs de synchronisation Airbyte
+
+Chaque job déclenché est enregistré dans la table sync_jobs. La tâche
+planifiée poll_due_jobs interroge Airbyte une seule fois par job en cours,
+quel que soit le nombre de clients qui suivent la synchronisation :
+l'intervalle de polling double tant que le statut ne change pas (entre
+SYNC_TRACKER_MIN_INTERVAL_SECONDS et SYNC_TRACKER_MAX_INTERVAL_SECONDS).
+Les endpoints de statut lisent la table.
+
+La fin d'un job (statut terminal) est enregistrée sur la connexion et
+déclenche les actions post-sync, une seule fois par job. Chaque
+changement (statut, progression) est publié pour le flux SSE.
+
+import_job_history complète la table avec les jobs lancés hors de
+l'application (interface Airbyte, jobs antérieurs) : seuls les jobs
+créés depuis le dernier job terminé sont demandés à Airbyte. La borne
+createdAtStart est inclusive et à la seconde : ce dernier job (et ceux
+créés la même seconde) est relu à chaque import, puis ignoré à
+l'insertion ; les autres jobs terminés ne sont jamais relus.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.leader import advisory_lock
+from app.crud import airbyte as airbyte_crud
+from app.crud import sync_job as sync_job_crud
+from app.models.sync_job import SyncJob
+from app.services import sync_hooks
+from app.services.airbyte_service import AirbyteService
+from app.services.sync_events import notify_job_event
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("succeeded", "failed", "cancelled")
+
+# Import de l'historique : taille de page Airbyte et nombre maximal de pages
+HISTORY_PAGE_SIZE = 100
+HISTORY_MAX_PAGES = 20
+
+# Utilisateurs dont l'historique a été importé récemment
+_history_refreshed = TTLCache(maxsize=10000, ttl=settings.SYNC_HISTORY_REFRESH_SECONDS)
+
+
+def normalize_status(status: Optional[str]) -> str:
+    """Statut Airbyte ramené aux valeurs de SyncStatus"""
+    status = (status or "pending").lower()
+    # "incomplete" : tentative échouée, Airbyte va réessayer
+    if status == "incomplete":
+        return "running"
+    return status
+
+
+def next_poll_delay(poll_count: int) -> timedelta:
+    """Intervalle avant le prochain polling (backoff exponentiel plafonné)"""
+    delay = settings.SYNC_TRACKER_MIN_INTERVAL_SECONDS * (2 ** min(poll_count, 16))
+    return timedelta(seconds=min(delay, settings.SYNC_TRACKER_MAX_INTERVAL_SECONDS))
+
+
+def _parse_datetime(value: Any) -> Optional[datetime]:
+    """Date Airbyte (ISO 8601 ou timestamp) en datetime UTC naïf"""
+    if value is None:
+        return None
+    try:
+        if isinstance(value, (int, float)):
+            return datetime.fromtimestamp(value, tz=timezone.utc).replace(tzinfo=None)
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except (ValueError, OverflowError, OSError):
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _record_outcome(db: Session, job: SyncJob) -> None:
+    """Enregistre la fin du job sur la connexion et lance les actions post-sync"""
+    airbyte_crud.update_last_sync(db, job.connection_id, job.status, job.completed_at)
+    logger.info(f"Sync job {job.job_id} {job.status} for user {job.user_id}")
+
+    if job.status == "succeeded":
+        sync_hooks.on_sync_succeeded(db, job.user_id)
+
+
+def apply_job_data(db: Session, job: SyncJob, data: Dict[str, Any], now: Optional[datetime] = None) -> SyncJob:
+    """Met à jour un job à partir de la réponse de GET /jobs/{job_id}"""
+    now = now or datetime.utcnow()
+    status = normalize_status(data.get("status"))
+    changed = status != job.status
+    progress = (job.rows_synced, job.bytes_synced)
+    # Le backoff repart du minimum à chaque changement de statut
+    poll_count = 0 if changed else (job.poll_count or 0) + 1
+    terminal = status in TERMINAL_STATUSES
+
+    job = sync_job_crud.update_job(
+        db,
+        job,
+        status=status,
+        rows_synced=data.get("rowsSynced") or job.rows_synced or 0,
+        bytes_synced=data.get("bytesSynced") or job.bytes_synced or 0,
+        duration=data.get("duration") or job.duration,
+        error_message=data.get("failureReason") or job.error_message,
+        started_at=_parse_datetime(data.get("startTime") or data.get("startedAt")) or job.started_at,
+        completed_at=(
+            _parse_datetime(data.get("lastUpdatedAt") or data.get("updatedAt")) or now
+        ) if terminal else None,
+        last_polled_at=now,
+        poll_count=poll_count,
+        next_poll_at=None if terminal else now + next_poll_delay(poll_count),
+    )
+
+    if changed or (job.rows_synced, job.bytes_synced) != progress:
+        notify_job_event(db, job)
+    if terminal and changed:
+        _record_outcome(db, job)
+    return job
+
+
+async def poll_job(db: Session, job: SyncJob) -> SyncJob:
+    """Interroge Airbyte pour un job en cours (écritures en base dans un thread)"""
+    now = datetime.utcnow()
+    data = await AirbyteService(db, job.user_id).get_sync_status(job.job_id)
+    return await asyncio.to_thread(record_poll, db, job, data, now)
+
+
+def record_poll(db: Session, job: SyncJob, data: Optional[Dict[str, Any]], now: datetime) -> SyncJob:
+    """Enregistre le résultat d'un polling (None : Airbyte n'a pas répondu)"""
+    if data is not None:
+        return apply_job_data(db, job, data, now)
+
+    # Airbyte injoignable ou job inconnu : on réessaie plus tard, sauf si le
+    # job est trop ancien pour être encore en cours
+    stale_after = timedelta(hours=settings.HUBSPOT_SYNC_STALE_RUNNING_HOURS)
+    if job.created_at and job.created_at < now - stale_after:
+        logger.warning(f"Sync job {job.job_id} unreachable since {job.created_at}, marking as failed")
+        job = sync_job_crud.update_job(
+            db,
+            job,
+            status="failed",
+            error_message=job.error_message or "Job status unavailable from Airbyte",
+            completed_at=now,
+            last_polled_at=now,
+            next_poll_at=None,
+        )
+        notify_job_event(db, job)
+        _record_outcome(db, job)
+        return job
+
+    poll_count = (job.poll_count or 0) + 1
+    return sync_job_crud.update_job(
+        db,
+        job,
+        last_polled_at=now,
+        poll_count=poll_count,
+        next_poll_at=now + next_poll_delay(poll_count),
+    )
+
+
+def _job_row(user_id: int, connection_id: str, data: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+    """Ligne sync_jobs d'un job importé, sans déclencher d'action post-sync"""
+    status = normalize_status(data.get("status"))
+    terminal = status in TERMINAL_STATUSES
+    started_at = _parse_datetime(data.get("startTime") or data.get("startedAt"))
+
+    return dict(
+        user_id=user_id,
+        connection_id=connection_id,
+        job_id=str(data.get("jobId")),
+        status=status,
+        rows_synced=data.get("rowsSynced") or 0,
+        bytes_synced=data.get("bytesSynced") or 0,
+        duration=data.get("duration"),
+        error_message=data.get("failureReason"),
+        created_at=_parse_datetime(data.get("createdAt")) or started_at or now,
+        started_at=started_at,
+        completed_at=(
+            _parse_datetime(data.get("lastUpdatedAt") or data.get("updatedAt")) or now
+        ) if terminal else None,
+        # Un job encore en cours est confié au tracker
+        next_poll_at=None if terminal else now,
+        last_polled_at=None,
+        poll_count=0,
+    )
+
+
+async def import_job_history(db: Session, user_id: int, connection_id: str, force: bool = False) -> int:
+    """
+    Importe les jobs Airbyte créés depuis le dernier job terminé connu
+
+    Au plus une fois par SYNC_HISTORY_REFRESH_SECONDS et par utilisateur
+    (sauf `force`). Une erreur Airbyte est journalisée : l'historique
+    déjà en base reste servi. Les jobs sont insérés en une requête, les
+    jobs déjà connus (terminés, ou suivis par le tracker) étant ignorés
+    par ON CONFLICT ; les accès psycopg2 passent par un thread.
+
+    Returns:
+        Nombre de jobs importés
+    """
+    if not force and _history_refreshed.get(user_id):
+        return 0
+
+    service = AirbyteService(db, user_id)
+    since = await asyncio.to_thread(sync_job_crud.get_newest_finished_created_at, db, user_id)
+    now = datetime.utcnow()
+    rows: Dict[str, Dict[str, Any]] = {}
+    complete = False
+
+    for page in range(HISTORY_MAX_PAGES):
+        jobs = await service.list_jobs(
+            connection_id, created_at_start=since, limit=HISTORY_PAGE_SIZE, offset=page * HISTORY_PAGE_SIZE
+        )
+        if jobs is None:
+            break
+
+        for data in jobs:
+            if data.get("jobId") is not None:
+                rows.setdefault(str(data["jobId"]), _job_row(user_id, connection_id, data, now))
+
+        if len(jobs) < HISTORY_PAGE_SIZE:
+            complete = True
+            break
+    else:
+        # Import partiel : la suite est lue au prochain appel, à partir du
+        # dernier job terminé enregistré
+        logger.warning(
+            f"Sync history import of user {user_id} stopped after {HISTORY_MAX_PAGES} pages, "
+            "remaining jobs will be imported on the next refresh"
+        )
+
+    # Les pages déjà lues sont enregistrées, même si Airbyte a échoué ensuite ;
+    # l'import n'est suspendu (SYNC_HISTORY_REFRESH_SECONDS) qu'une fois complet
+    imported = await asyncio.to_thread(sync_job_crud.insert_jobs, db, list(rows.values()))
+    if complete:
+        _history_refreshed.set(user_id, True)
+    if imported:
+        logger.info(f"Imported {imported} Airbyte jobs into sync history of user {user_id}")
+    return imported
+
+
+def _due_job_ids() -> List[int]:
+    from app.db_init import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return [
+            job.id for job in sync_job_crud.get_jobs_due(
+                db, datetime.utcnow(), limit=settings.SYNC_TRACKER_BATCH_SIZE
+            )
+        ]
+    finally:
+        db.close()
+
+
+async def poll_due_jobs() -> Dict[str, int]:
+    """
+    Tâche planifiée : interroge Airbyte pour les jobs dont le polling est échu
+
+    Exécutée par un seul worker à la fois (verrou consultatif). Les accès
+    psycopg2 passent par un thread : seuls les appels à Airbyte ont lieu
+    sur la boucle d'événements.
+    """
+    from app.db_init import SessionLocal
+
+    report = {"polled": 0, "completed": 0, "failed": 0}
+
+    async with advisory_lock("sync-job-tracker") as acquired:
+        if not acquired:
+            return report
+
+        job_ids = await asyncio.to_thread(_due_job_ids)
+        if not job_ids:
+            return report
+
+        semaphore = asyncio.Semaphore(settings.SYNC_TRACKER_CONCURRENCY)
+
+        async def poll_one(row_id: int) -> None:
+            async with semaphore:
+                task_db = SessionLocal()
+                try:
+                    job = await asyncio.to_thread(task_db.get, SyncJob, row_id)
+                    if job is None or job.next_poll_at is None:
+                        return
+                    job = await poll_job(task_db, job)
+                    report["polled"] += 1
+                    if job.status in TERMINAL_STATUSES:
+                        report["completed"] += 1
+                except Exception as e:
+                    report["failed"] += 1
+                    logger.error(f"Error polling sync job row {row_id}: {e}")
+                finally:
+                    await asyncio.to_thread(task_db.close)
+
+        await asyncio.gather(*(poll_one(row_id) for row_id in job_ids))
+
+    if report["completed"] or report["failed"]:
+        logger.info(
+            f"Sync tracker: {report['polled']} polled, {report['completed']} completed, "
+            f"{report['failed']} failed"
+        )
+    return report
@@ -0,0 +1,83 @@
+"""
+Cache process-wide des métadonnées des schémas user_{id}_hubspot
+
+Évite d'interroger information_schema à chaque requête : l'existence du
+schéma et les colonnes (nom, type) de chaque table sont chargées en une
+fois puis conservées jusqu'à expiration ou jusqu'à la prochaine sync.
+L'absence d'un schéma n'est conservée que TENANT_METADATA_MISSING_TTL_SECONDS.
+"""
+import logging
+from typing import Dict, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class TenantMetadata:
+    """Métadonnées d'un schéma utilisateur"""
+
+    def __init__(self, exists: bool, tables: Dict[str, List[Tuple[str, str]]]):
+        self.exists = exists
+        # table_name -> [(column_name, data_type), ...] dans l'ordre des colonnes
+        self.tables = tables
+
+    def columns(self, table_name: str) -> List[str]:
+        return [column_name for column_name, _ in self.tables.get(table_name, [])]
+
+
+# schema_name -> TenantMetadata
+metadata_cache = TTLCache(
+    maxsize=settings.TENANT_METADATA_CACHE_MAX_ENTRIES,
+    ttl=settings.TENANT_METADATA_CACHE_TTL_SECONDS,
+)
+
+
+def get_tenant_metadata(db: Session, schema_name: str) -> TenantMetadata:
+    """Retourne les métadonnées du schéma, depuis le cache si possible"""
+    metadata = metadata_cache.get(schema_name)
+    if metadata is not None:
+        return metadata
+
+    metadata = _load_tenant_metadata(db, schema_name)
+    # Un schéma absent peut être créé par la première sync, y compris sur un
+    # worker qui n'a pas reçu l'invalidation : TTL court
+    ttl = None if metadata.exists else settings.TENANT_METADATA_MISSING_TTL_SECONDS
+    metadata_cache.set(schema_name, metadata, ttl=ttl)
+    return metadata
+
+
+def invalidate_tenant_metadata(schema_name: str) -> None:
+    """Oublie les métadonnées d'un schéma (ex: après une sync)"""
+    metadata_cache.delete(schema_name)
+
+
+def _load_tenant_metadata(db: Session, schema_name: str) -> TenantMetadata:
+    """
+    Charge l'existence du schéma et toutes ses colonnes depuis le catalogue
+
+    Une seule requête : le schéma est joint à gauche à ses colonnes, un
+    schéma sans table donne une ligne aux colonnes NULL, un schéma absent
+    aucune ligne.
+    """
+    query = text("""
+        SELECT c.table_name, c.column_name, c.data_type
+        FROM information_schema.schemata s
+        LEFT JOIN information_schema.columns c ON c.table_schema = s.schema_name
+        WHERE s.schema_name = :schema_name
+        ORDER BY c.table_name, c.ordinal_position
+    """)
+
+    exists = False
+    tables: Dict[str, List[Tuple[str, str]]] = {}
+    for table_name, column_name, data_type in db.execute(query, {"schema_name": schema_name}):
+        exists = True
+        if table_name is not None:
+            tables.setdefault(table_name, []).append((column_name, data_type))
+
+    logger.debug(f"Loaded metadata for {schema_name}: exists={exists}, tables={list(tables)}")
+    return TenantMetadata(exists=exists, tables=tables)
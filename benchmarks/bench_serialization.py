@@ -0,0 +1,153 @@
+"""
+Benchmark de sérialisation des pages PaginatedResponse de /hubspot-data
+
+Compare, pour une même page, le temps d'encodage :
+- fastapi+json : chemin par défaut de FastAPI (validation response_model,
+  sérialisation, puis json.dumps via JSONResponse)
+- fastapi+orjson : même chemin, rendu par ORJSONResponse (classe par
+  défaut de l'application)
+- direct : page_response() des endpoints de liste (validation des items
+  puis model_dump_json de pydantic-core, sans passe intermédiaire)
+
+Aucune base de données n'est nécessaire : les lignes sont synthétiques.
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.bench_serialization [--repeat 50]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.api.v1.endpoints.hubspot_data import page_response
+from app.schemas.hubspot_data import (
+    HubspotCompanyBase,
+    HubspotContactBase,
+    HubspotContactDetail,
+    HubspotDealBase,
+    PaginatedResponse,
+)
+
+NOW = datetime(2024, 1, 1)
+
+
+def contact_row(i: int, properties: int = 0) -> Dict[str, Any]:
+    row = {
+        "id": str(100000 + i),
+        "properties_email": f"contact{i}@example.com",
+        "properties_firstname": f"Firstname{i}",
+        "properties_lastname": f"Lastname{i}",
+        "properties_phone": "+33 1 23 45 67 89",
+        "properties_company": f"Company {i % 300}",
+        "properties_jobtitle": "Head of Sales",
+        "properties_hs_linkedin_url": f"https://www.linkedin.com/in/contact-{i}",
+        "properties_lifecyclestage": random.choice(["lead", "customer", "opportunity"]),
+        "properties_country": "France",
+        "properties_city": "Paris",
+        "properties_createdate": NOW - timedelta(days=i % 1000),
+        "_airbyte_extracted_at": NOW,
+    }
+    if properties:
+        # Détail : JSON `properties` complet, souvent plusieurs centaines de clés
+        row["properties"] = {f"custom_property_{k}": f"value {k} for {i}" for k in range(properties)}
+        row["archived"] = False
+    return row
+
+
+def company_row(i: int) -> Dict[str, Any]:
+    return {
+        "id": str(200000 + i),
+        "properties_name": f"Company {i}",
+        "properties_domain": f"company{i}.example.com",
+        "properties_industry": "COMPUTER_SOFTWARE",
+        "properties_numberofemployees": 10 + i,
+        "properties_annualrevenue": 1_000_000.0 + i,
+        "properties_country": "France",
+        "properties_city": "Lyon",
+        "properties_website": f"https://company{i}.example.com",
+        "properties_createdate": NOW - timedelta(days=i % 1000),
+        "_airbyte_extracted_at": NOW,
+    }
+
+
+def deal_row(i: int) -> Dict[str, Any]:
+    return {
+        "id": str(300000 + i),
+        "properties_dealname": f"Deal {i}",
+        "properties_amount": 5000.0 + i,
+        "properties_dealstage": "appointmentscheduled",
+        "properties_pipeline": "default",
+        "properties_closedate": NOW + timedelta(days=i % 90),
+        "properties_createdate": NOW - timedelta(days=i % 1000),
+        "properties_hs_is_closed_won": i % 3 == 0,
+        "_airbyte_extracted_at": NOW,
+    }
+
+
+def make_page(rows: List[Dict[str, Any]]) -> PaginatedResponse:
+    return PaginatedResponse(
+        items=rows, total=100000, page=1, limit=len(rows), pages=100000 // len(rows)
+    )
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> float:
+    """Médiane du temps d'exécution (ms)"""
+    fn()  # préchauffage (construction des schémas pydantic)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def fastapi_path(item_model, page: PaginatedResponse, response_class) -> Callable[[], bytes]:
+    field = create_response_field(name="response", type_=PaginatedResponse[item_model])
+    loop = asyncio.new_event_loop()
+
+    def run() -> bytes:
+        content = loop.run_until_complete(
+            serialize_response(field=field, response_content=page, is_coroutine=True)
+        )
+        return response_class(content).body
+
+    return run
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=50, help="Itérations par mesure")
+    args = parser.parse_args()
+    random.seed(0)
+
+    shapes = [
+        ("contacts x50", HubspotContactBase, [contact_row(i) for i in range(50)]),
+        ("contacts x500", HubspotContactBase, [contact_row(i) for i in range(500)]),
+        ("companies x500", HubspotCompanyBase, [company_row(i) for i in range(500)]),
+        ("deals x500", HubspotDealBase, [deal_row(i) for i in range(500)]),
+        ("contact details x50 (300 props)", HubspotContactDetail, [contact_row(i, 300) for i in range(50)]),
+    ]
+
+    header = f"{'shape':<34}{'fastapi+json':>14}{'fastapi+orjson':>16}{'direct':>10}{'speedup':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, item_model, rows in shapes:
+        page = make_page(rows)
+        baseline = measure(fastapi_path(item_model, page, JSONResponse), args.repeat)
+        with_orjson = measure(fastapi_path(item_model, page, ORJSONResponse), args.repeat)
+        direct = measure(lambda: page_response(item_model, page).body, args.repeat)
+        print(
+            f"{name:<34}{baseline:>12.2f}ms{with_orjson:>14.2f}ms{direct:>8.2f}ms"
+            f"{baseline / direct:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
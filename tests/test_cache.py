@@ -0,0 +1,46 @@
+from app.core.cache import TTLCache
+
+
+def test_get_returns_default_when_missing():
+    cache = TTLCache(maxsize=2, ttl=60)
+    assert cache.get("missing") is None
+    assert cache.get("missing", "default") == "default"
+
+
+def test_entry_expires_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.core.cache.time.monotonic", lambda: now[0])
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set("key", "value")
+    cache.set("short", "value", ttl=1)
+
+    now[0] += 5
+    assert cache.get("key") == "value"
+    assert cache.get("short") is None
+
+    now[0] += 6
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_invalidate_by_predicate():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("1:contacts", 1)
+    cache.set("1:deals", 2)
+    cache.set("2:contacts", 3)
+
+    assert cache.invalidate(lambda key: key.startswith("1:")) == 2
+    assert cache.get("2:contacts") == 3
+    assert len(cache) == 1
@@ -0,0 +1,113 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware, brotli
+
+LARGE = {"items": [{"id": i, "email": f"contact{i}@example.com"} for i in range(200)]}
+
+
+def make_client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/large")
+    def large():
+        return JSONResponse(LARGE)
+
+    @app.get("/stream")
+    def stream():
+        chunks = (f"line {i}\n".encode() * 100 for i in range(5))
+        return StreamingResponse(chunks, media_type="text/csv", headers={"Content-Length": "4500"})
+
+    @app.get("/events")
+    def events():
+        return StreamingResponse(iter([b"data: 1\n\n", b"data: 2\n\n"]), media_type="text/event-stream")
+
+    @app.get("/encoded")
+    def encoded():
+        body = gzip.compress(b"a,b\n" * 1000)
+        return Response(body, media_type="text/csv", headers={"Content-Encoding": "gzip"})
+
+    @app.get("/not-modified")
+    def not_modified():
+        return Response(status_code=304, headers={"ETag": 'W/"abc"'})
+
+    return TestClient(app)
+
+
+def get_raw(client: TestClient, path: str, accept_encoding: str):
+    with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+def test_small_json_is_not_compressed():
+    response, raw = get_raw(make_client(), "/small", "gzip, br")
+
+    assert "content-encoding" not in response.headers
+    assert raw == b'{"ok":true}'
+
+
+@pytest.mark.parametrize("accept_encoding, encoding, decompress", [
+    ("gzip", "gzip", gzip.decompress),
+    pytest.param(
+        "gzip, br", "br", lambda raw: brotli.decompress(raw),
+        marks=pytest.mark.skipif(brotli is None, reason="brotli not installed")
+    ),
+])
+def test_large_json_is_compressed(accept_encoding, encoding, decompress):
+    response, raw = get_raw(make_client(), "/large", accept_encoding)
+
+    assert response.headers["content-encoding"] == encoding
+    assert response.headers["content-length"] == str(len(raw))
+    assert "accept-encoding" in response.headers["vary"].lower()
+    assert decompress(raw) == JSONResponse(LARGE).body
+
+
+def test_streamed_body_drops_content_length():
+    response, raw = get_raw(make_client(), "/stream", "gzip")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert gzip.decompress(raw) == b"".join(f"line {i}\n".encode() * 100 for i in range(5))
+
+
+def test_event_stream_passes_through():
+    response, raw = get_raw(make_client(), "/events", "gzip, br")
+
+    assert "content-encoding" not in response.headers
+    assert raw == b"data: 1\n\ndata: 2\n\n"
+
+
+def test_pre_encoded_response_passes_through():
+    response, raw = get_raw(make_client(), "/encoded", "gzip, br")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(raw) == b"a,b\n" * 1000
+
+
+def test_not_modified_passes_through():
+    response, raw = get_raw(make_client(), "/not-modified", "gzip")
+
+    assert response.status_code == 304
+    assert "content-encoding" not in response.headers
+    assert raw == b""
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("br;q=0, gzip", "gzip"),
+    ("gzip;q=0", None),
+    ("*;q=0", None),
+    ("identity", None),
+])
+def test_accept_encoding_quality_is_respected(accept_encoding, expected):
+    response, _ = get_raw(make_client(), "/large", accept_encoding)
+
+    assert response.headers.get("content-encoding") == expected
@@ -0,0 +1,26 @@
+from app.core.etag import etag_matches, make_etag
+
+
+def test_make_etag_is_weak_and_stable():
+    etag = make_etag(1, "contacts", "succeeded@2024-01-01")
+    assert etag.startswith('W/"') and etag.endswith('"')
+    assert etag == make_etag(1, "contacts", "succeeded@2024-01-01")
+    assert etag != make_etag(1, "contacts", "succeeded@2024-01-02")
+
+
+def test_etag_matches_weak_comparison():
+    etag = make_etag("data")
+    opaque = etag.removeprefix("W/")
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(opaque, etag)
+    assert etag_matches(f'"other", {etag}', etag)
+    assert etag_matches("*", etag)
+
+
+def test_etag_does_not_match():
+    etag = make_etag("data")
+
+    assert not etag_matches(None, etag)
+    assert not etag_matches("", etag)
+    assert not etag_matches(make_etag("other"), etag)
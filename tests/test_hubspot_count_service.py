@@ -0,0 +1,94 @@
+import pytest
+
+from app.services.hubspot_count_service import HubspotCountService, count_cache, invalidate_tenant_counts
+
+THRESHOLD = 1000
+FILTER = ["properties_email = :email"]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    count_cache.clear()
+    yield
+    count_cache.clear()
+
+
+def make_service(table_rows, explain_rows=0, exact=42, schema_name="user_1_hubspot"):
+    """Service dont les requêtes au catalogue et aux tables sont simulées"""
+    service = HubspotCountService(db=None, schema_name=schema_name)
+    service.exact_threshold = THRESHOLD
+    service.calls = []
+
+    def record(name, value):
+        def query(*args):
+            service.calls.append(name)
+            return value
+        return query
+
+    service._estimated_table_rows = record("reltuples", table_rows)
+    service._explain_rows = record("explain", explain_rows)
+    service._exact_count = record("count", exact)
+    return service
+
+
+def test_small_table_is_counted_exactly():
+    service = make_service(table_rows=THRESHOLD - 1)
+
+    assert service.count("contacts", FILTER, {"email": "a@b.c"}) == (42, True)
+    assert service.calls == ["reltuples", "count"]
+
+
+def test_never_analyzed_table_is_counted_exactly():
+    service = make_service(table_rows=None)
+
+    assert service.count("contacts", [], {}) == (42, True)
+    assert service.calls == ["reltuples", "count"]
+
+
+def test_large_unfiltered_table_uses_reltuples():
+    service = make_service(table_rows=THRESHOLD * 10)
+
+    assert service.count("contacts", [], {}) == (THRESHOLD * 10, False)
+    assert service.calls == ["reltuples"]
+
+
+def test_large_filtered_table_uses_explain_estimate():
+    service = make_service(table_rows=THRESHOLD * 10, explain_rows=THRESHOLD * 2)
+
+    assert service.count("contacts", FILTER, {"email": "a@b.c"}) == (THRESHOLD * 2, False)
+    assert service.calls == ["reltuples", "explain"]
+
+
+def test_selective_filter_on_large_table_is_counted_exactly():
+    service = make_service(table_rows=THRESHOLD * 10, explain_rows=THRESHOLD - 1)
+
+    assert service.count("contacts", FILTER, {"email": "a@b.c"}) == (42, True)
+    assert service.calls == ["reltuples", "explain", "count"]
+
+
+def test_filter_hash_ignores_whitespace_and_param_order():
+    service = make_service(table_rows=0)
+    params = {"email": "a@b.c", "country": "FR"}
+    conditions = ["properties_email = :email", "properties_country = :country"]
+    spaced = ["properties_email  =\n :email", "properties_country = :country"]
+
+    assert service._filter_hash(conditions, params) == service._filter_hash(spaced, dict(reversed(params.items())))
+    assert service._filter_hash(conditions, params) != service._filter_hash(conditions, {**params, "email": "x"})
+    assert service._filter_hash(conditions, params) != service._filter_hash(conditions[:1], params)
+
+
+def test_count_is_cached_per_filter_and_invalidated_per_schema():
+    service = make_service(table_rows=0)
+    other_tenant = make_service(table_rows=0, schema_name="user_2_hubspot")
+
+    service.count("contacts", FILTER, {"email": "a@b.c"})
+    service.count("contacts", FILTER, {"email": "a@b.c"})
+    service.count("contacts", FILTER, {"email": "x@y.z"})
+    other_tenant.count("contacts", FILTER, {"email": "a@b.c"})
+    assert service.calls.count("count") == 2
+
+    assert invalidate_tenant_counts("user_1_hubspot") == 2
+    service.count("contacts", FILTER, {"email": "a@b.c"})
+    other_tenant.count("contacts", FILTER, {"email": "a@b.c"})
+    assert service.calls.count("count") == 3
+    assert other_tenant.calls.count("count") == 1
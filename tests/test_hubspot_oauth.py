@@ -0,0 +1,60 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.hubspot_oauth import HubspotOAuthClient, HubspotOAuthError
+
+TOKENS = {"access_token": "a", "refresh_token": "r", "expires_in": 1800}
+
+
+def run_with(failures, call):
+    """Exécute `call` avec un HubSpot simulé qui échoue d'abord avec `failures`"""
+    attempts = []
+
+    def handler(request):
+        attempts.append(request)
+        if len(attempts) <= len(failures):
+            failure = failures[len(attempts) - 1]
+            if isinstance(failure, int):
+                return httpx.Response(failure)
+            raise failure("simulated", request=request)
+        return httpx.Response(200, json=TOKENS)
+
+    async def main():
+        async with httpx.AsyncClient(base_url="https://hubspot.test", transport=httpx.MockTransport(handler)) as client:
+            return await call(HubspotOAuthClient(client=client, max_retries=2, backoff=0))
+
+    return asyncio.run(main()), len(attempts)
+
+
+@pytest.mark.parametrize("failure", [httpx.ReadTimeout, httpx.RemoteProtocolError, 503])
+def test_refresh_retries_transient_errors(failure):
+    result, attempts = run_with([failure], lambda client: client.refresh("r"))
+
+    assert result == TOKENS
+    assert attempts == 2
+
+
+@pytest.mark.parametrize("failure", [httpx.ConnectError, httpx.ConnectTimeout])
+def test_code_exchange_retries_when_request_not_sent(failure):
+    result, attempts = run_with([failure], lambda client: client.exchange_code("code"))
+
+    assert result == TOKENS
+    assert attempts == 2
+
+
+@pytest.mark.parametrize("failure", [httpx.ReadTimeout, httpx.RemoteProtocolError, 503])
+def test_code_exchange_is_not_replayed_after_sending(failure):
+    with pytest.raises(HubspotOAuthError) as error:
+        run_with([failure], lambda client: client.exchange_code("code"))
+
+    assert error.value.retryable
+
+
+def test_refused_refresh_is_not_retried():
+    with pytest.raises(HubspotOAuthError) as error:
+        run_with([400], lambda client: client.refresh("r"))
+
+    assert error.value.status_code == 400
+    assert not error.value.retryable
@@ -0,0 +1,24 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+from app.schemas.hubspot_data import AvailableColumns
+from app.services.hubspot_query_cache import dumps_value, loads_value
+
+
+def test_page_round_trip_keeps_types():
+    page = (
+        [{"id": "1", "createdate": datetime(2024, 5, 1, 12, 0), "closedate": date(2024, 6, 1),
+          "amount": Decimal("1200.50"), "properties": {"tags": ["a", "b"]}, "email": None}],
+        1,
+        True,
+        "cursor",
+    )
+    assert loads_value(dumps_value(page)) == page
+
+
+def test_model_round_trip():
+    columns = AvailableColumns(
+        object_type="contacts", default_columns=[], available_columns=[], custom_columns=[], total_columns=0
+    )
+    assert loads_value(dumps_value(columns)) == columns
+    assert loads_value(dumps_value(None)) is None
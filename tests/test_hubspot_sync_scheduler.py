@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.models.airbyte import AirbyteConnection
+from app.services.hubspot_sync_scheduler import _skip_reason
+
+NOW = datetime(2024, 5, 1, 12, 0)
+
+
+def make_connection(**fields):
+    fields.setdefault("status", "active")
+    return AirbyteConnection(user_id=1, **fields)
+
+
+def test_inactive_connection_is_skipped():
+    assert _skip_reason(make_connection(status="paused"), NOW) == "inactive"
+
+
+def test_never_synced_connection_is_synced():
+    assert _skip_reason(make_connection(), NOW) is None
+
+
+def test_running_sync_is_skipped_until_stale():
+    stale_after = timedelta(hours=settings.HUBSPOT_SYNC_STALE_RUNNING_HOURS)
+    running = make_connection(last_sync_status="running", last_sync_at=NOW - stale_after / 2)
+    stale = make_connection(last_sync_status="running", last_sync_at=NOW - stale_after * 2)
+
+    assert _skip_reason(running, NOW) == "running"
+    assert _skip_reason(stale, NOW) is None
+
+
+def test_recent_sync_is_skipped():
+    interval = timedelta(hours=settings.HUBSPOT_SYNC_INTERVAL_HOURS)
+    recent = make_connection(last_sync_status="succeeded", last_sync_at=NOW - interval / 4)
+    old = make_connection(last_sync_status="failed", last_sync_at=NOW - interval)
+
+    assert _skip_reason(recent, NOW) == "recent"
+    assert _skip_reason(old, NOW) is None
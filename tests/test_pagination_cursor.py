@@ -0,0 +1,79 @@
+from datetime import datetime
+
+import pytest
+
+from app.services.hubspot_data_service import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    extracted_at = datetime(2024, 5, 1, 12, 30, 15, 123456)
+    cursor = encode_cursor(extracted_at, 42)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (extracted_at, "42", None)
+
+
+def test_ranked_cursor_round_trip():
+    extracted_at = datetime(2024, 5, 1, 12, 30)
+    # Score real PostgreSQL lu en float
+    rank = 0.3333333432674408
+    cursor = encode_cursor(extracted_at, "abc", rank)
+
+    assert decode_cursor(cursor) == (extracted_at, "abc", rank)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "WzFd", "WyJ4IiwgIjEiXQ"])
+def test_invalid_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+@pytest.fixture
+def service(monkeypatch):
+    """Service sur une table contacts SQLite (schéma attaché), totaux simulés"""
+    import sqlite3
+
+    from sqlalchemy import create_engine, event, text
+    from sqlalchemy.orm import Session
+
+    from app.services.hubspot_count_service import HubspotCountService
+    from app.services.hubspot_data_service import HubspotDataService
+
+    engine = create_engine("sqlite://", connect_args={"detect_types": sqlite3.PARSE_DECLTYPES})
+
+    @event.listens_for(engine, "connect")
+    def attach(dbapi_connection, _):
+        dbapi_connection.execute("ATTACH ':memory:' AS user_1_hubspot")
+
+    monkeypatch.setattr(HubspotCountService, "count", lambda self, table, where, params: (7, True))
+    with Session(engine) as db:
+        db.execute(text(
+            "CREATE TABLE user_1_hubspot.contacts (id TEXT, properties_email TEXT, _airbyte_extracted_at TIMESTAMP)"
+        ))
+        for i in range(7):
+            # Deux lignes par date d'extraction : le tri départage par id
+            db.execute(text("INSERT INTO user_1_hubspot.contacts VALUES (:id, :email, :extracted_at)"), {
+                "id": str(i), "email": f"c{i}@example.com", "extracted_at": datetime(2024, 5, 1, i // 2)
+            })
+        yield HubspotDataService(db, user_id=1)
+
+
+def test_cursor_pages_follow_offset_pages(service):
+    def fetch(page=1, cursor=None):
+        return service._fetch_page("contacts", ["properties_email"], [], {}, page, 3, cursor)
+
+    offset_pages = [fetch(page)[0] for page in (1, 2, 3)]
+    cursor_pages, cursor = [], None
+    while True:
+        rows, total, total_exact, cursor = fetch(cursor=cursor)
+        cursor_pages.append(rows)
+        if cursor is None:
+            break
+
+    assert cursor_pages == offset_pages
+    assert [row["properties_email"] for page in cursor_pages for row in page] == [
+        f"c{i}@example.com" for i in (6, 5, 4, 3, 2, 1, 0)
+    ]
+    # Seules les colonnes demandées sont renvoyées
+    assert all(list(row) == ["properties_email"] for page in cursor_pages for row in page)
+    assert fetch(page=3)[3] is None
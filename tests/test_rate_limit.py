@@ -0,0 +1,32 @@
+import asyncio
+
+import pytest
+
+from app.core.rate_limit import TokenBucket
+
+
+def test_rate_must_be_positive():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_burst_then_wait(monkeypatch):
+    now = [0.0]
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+        now[0] += delay
+
+    monkeypatch.setattr("app.core.rate_limit.time.monotonic", lambda: now[0])
+    monkeypatch.setattr("app.core.rate_limit.asyncio.sleep", fake_sleep)
+
+    async def acquire_all():
+        bucket = TokenBucket(rate=2, capacity=3)
+        for _ in range(5):
+            await bucket.acquire()
+
+    asyncio.run(acquire_all())
+
+    # 3 acquisitions en rafale, puis une toutes les 1/rate secondes
+    assert sleeps == pytest.approx([0.5, 0.5])
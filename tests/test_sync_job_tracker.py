@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db_init import Base
+from app.models.airbyte import AirbyteConnection
+from app.models.sync_job import SyncJob
+from app.services import sync_job_tracker
+from app.services.sync_job_tracker import _parse_datetime, apply_job_data, next_poll_delay, normalize_status
+
+NOW = datetime(2024, 5, 1, 12, 0)
+
+
+@pytest.fixture
+def db():
+    from app.models import airbyte, audit, hubspot, hubspot_stats, reprovision, sync_job, user  # noqa: F401
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def events(monkeypatch):
+    """Événements publiés et actions post-sync, sans PostgreSQL"""
+    calls = {"notified": [], "succeeded": []}
+    monkeypatch.setattr(sync_job_tracker, "notify_job_event", lambda db, job: calls["notified"].append(job.status))
+    monkeypatch.setattr(
+        sync_job_tracker.sync_hooks, "on_sync_succeeded", lambda db, user_id: calls["succeeded"].append(user_id)
+    )
+    return calls
+
+
+@pytest.fixture
+def job(db):
+    db.add(AirbyteConnection(
+        user_id=1, workspace_id="w", source_id="s", destination_id="d",
+        connection_id="c", schema_name="user_1_hubspot"
+    ))
+    job = SyncJob(user_id=1, connection_id="c", job_id="100", status="running", poll_count=3, next_poll_at=NOW)
+    db.add(job)
+    db.commit()
+    return job
+
+
+@pytest.mark.parametrize("status, expected", [
+    (None, "pending"),
+    ("RUNNING", "running"),
+    ("incomplete", "running"),
+    ("succeeded", "succeeded"),
+])
+def test_normalize_status(status, expected):
+    assert normalize_status(status) == expected
+
+
+def test_next_poll_delay_doubles_then_caps():
+    minimum = settings.SYNC_TRACKER_MIN_INTERVAL_SECONDS
+    assert next_poll_delay(0) == timedelta(seconds=minimum)
+    assert next_poll_delay(1) == timedelta(seconds=min(minimum * 2, settings.SYNC_TRACKER_MAX_INTERVAL_SECONDS))
+    assert next_poll_delay(100) == timedelta(seconds=settings.SYNC_TRACKER_MAX_INTERVAL_SECONDS)
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, None),
+    ("2024-05-01T12:00:00Z", NOW),
+    ("2024-05-01T14:00:00+02:00", NOW),
+    ("2024-05-01T12:00:00", NOW),
+    (1714564800, NOW),
+    ("not a date", None),
+])
+def test_parse_datetime(value, expected):
+    assert _parse_datetime(value) == expected
+
+
+def test_apply_job_data_progress_keeps_polling(db, events, job):
+    job = apply_job_data(db, job, {"status": "running", "rowsSynced": 50}, now=NOW)
+
+    assert job.status == "running"
+    assert job.rows_synced == 50
+    assert job.poll_count == 4
+    assert job.next_poll_at == NOW + next_poll_delay(4)
+    assert job.completed_at is None
+    assert events == {"notified": ["running"], "succeeded": []}
+
+
+def test_apply_job_data_success_records_outcome(db, events, job):
+    job = apply_job_data(
+        db, job, {"status": "succeeded", "rowsSynced": 80, "updatedAt": "2024-05-01T11:59:00Z"}, now=NOW
+    )
+
+    assert job.status == "succeeded"
+    assert job.next_poll_at is None
+    assert job.completed_at == datetime(2024, 5, 1, 11, 59)
+    assert events == {"notified": ["succeeded"], "succeeded": [1]}
+
+    connection = db.query(AirbyteConnection).filter_by(connection_id="c").one()
+    assert connection.last_sync_status == "succeeded"
+    assert connection.last_sync_at == job.completed_at
+
+    # Un statut terminal déjà enregistré ne relance pas les actions post-sync
+    apply_job_data(db, job, {"status": "succeeded", "rowsSynced": 80}, now=NOW)
+    assert events["succeeded"] == [1]
@@ -0,0 +1,45 @@
+import pytest
+
+from app.core.config import settings
+from app.services import tenant_metadata_cache
+from app.services.tenant_metadata_cache import TenantMetadata, get_tenant_metadata, metadata_cache
+
+
+@pytest.fixture
+def catalog(monkeypatch):
+    """Catalogue simulé : schémas existants et nombre de lectures"""
+    state = {"schemas": {}, "loads": 0, "now": 1000.0}
+
+    def load(db, schema_name):
+        state["loads"] += 1
+        tables = state["schemas"].get(schema_name)
+        return TenantMetadata(exists=tables is not None, tables=tables or {})
+
+    monkeypatch.setattr(tenant_metadata_cache, "_load_tenant_metadata", load)
+    monkeypatch.setattr("app.core.cache.time.monotonic", lambda: state["now"])
+    metadata_cache.clear()
+    yield state
+    metadata_cache.clear()
+
+
+def test_existing_schema_is_cached_for_the_full_ttl(catalog):
+    catalog["schemas"]["user_1_hubspot"] = {"contacts": [("id", "text")]}
+
+    assert get_tenant_metadata(None, "user_1_hubspot").columns("contacts") == ["id"]
+    catalog["now"] += settings.TENANT_METADATA_MISSING_TTL_SECONDS + 1
+    get_tenant_metadata(None, "user_1_hubspot")
+
+    assert catalog["loads"] == 1
+
+
+def test_missing_schema_is_reloaded_after_a_short_ttl(catalog):
+    assert not get_tenant_metadata(None, "user_1_hubspot").exists
+    assert not get_tenant_metadata(None, "user_1_hubspot").exists
+    assert catalog["loads"] == 1
+
+    # La première sync crée le schéma
+    catalog["schemas"]["user_1_hubspot"] = {"contacts": [("id", "text")]}
+    catalog["now"] += settings.TENANT_METADATA_MISSING_TTL_SECONDS + 1
+
+    assert get_tenant_metadata(None, "user_1_hubspot").exists
+    assert catalog["loads"] == 2